@@ -49,7 +49,7 @@ lecturer = role_dep(["professor", "lecturer", "assistant"])
 # -----------------------
 from typing import Callable
 from fastapi import Request
-from app.utils.jwt_utils import decode_access_token
+from app.utils.jwt_utils import get_request_claims
 
 
 def require_roles_model(allowed: List[str], service_cls: Callable, id_claim: str = "user_id"):
@@ -63,16 +63,10 @@ def require_roles_model(allowed: List[str], service_cls: Callable, id_claim: str
     """
 
     async def _guard(request: Request, jwt_private: str = Depends(get_setting_from_cache("jwt_private")), db = Depends(get_session)):
-        auth = request.headers.get("Authorization")
-        if not auth:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Authorization header")
-        parts = auth.split()
-        if len(parts) != 2 or parts[0].lower() != "bearer":
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Authorization header")
-        token = parts[1]
-
         try:
-            payload = decode_access_token(token, jwt_private)
+            payload = get_request_claims(request, jwt_private)
+        except HTTPException:
+            raise
         except Exception:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
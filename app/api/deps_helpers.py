@@ -1,8 +1,9 @@
-from typing import Callable, Dict, Any, Mapping
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 from fastapi import Depends, Body, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.utils.fk_resolver import resolve_fk_ids
+from pydantic import ValidationError
+from app.utils.fk_resolver import resolve_fk_ids, resolve_fk_ids_many
 
 
 def resolve_body_and_fk(schema_cls, fk_mapping: Mapping[str, Any]) -> Callable:
@@ -34,3 +35,40 @@ def resolve_body_and_fk(schema_cls, fk_mapping: Mapping[str, Any]) -> Callable:
         return schema_cls(**data)
 
     return _dep
+
+
+def resolve_bulk_body_and_fk(schema_cls, fk_mapping: Mapping[str, Any], max_items: int = 500) -> Callable:
+    """Bulk variant of `resolve_body_and_fk` for `{"items": [...]}` bodies.
+
+    FK global_ids of all items are resolved together (one query per Model).
+    Returns a list with one `(schema instance, None)` or `(None, error)` entry
+    per item, in request order, so callers can report per-row results.
+    """
+
+    async def _dep(body: dict = Body(...), db: AsyncSession = Depends(get_db)) -> List[Tuple[Optional[Any], Optional[str]]]:
+        items = body.get("items") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not items:
+            raise HTTPException(status_code=422, detail="Request body must contain a non-empty 'items' list")
+        if len(items) > max_items:
+            raise HTTPException(status_code=422, detail=f"At most {max_items} items per request")
+
+        rows: List[Dict[str, Any]] = []
+        for item in items:
+            rows.append({k: v for k, v in item.items() if v is not None} if isinstance(item, dict) else {})
+
+        errors = await resolve_fk_ids_many(db, rows, fk_mapping)
+
+        out: List[Tuple[Optional[Any], Optional[str]]] = []
+        for item, row, error in zip(items, rows, errors):
+            if not isinstance(item, dict):
+                out.append((None, "Item must be a JSON object"))
+            elif error:
+                out.append((None, error))
+            else:
+                try:
+                    out.append((schema_cls(**row), None))
+                except ValidationError as exc:
+                    out.append((None, "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors())))
+        return out
+
+    return _dep
@@ -1,6 +1,90 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.encoders import jsonable_encoder
-from typing import Optional, Type
+from functools import lru_cache
+from typing import Any, List, Optional, Type, Union, get_args, get_origin
+import logging
+
+try:
+    from pydantic import TypeAdapter, ConfigDict, EmailStr, Field, create_model
+    from pydantic_core import to_json
+except Exception:  # pydantic v1
+    TypeAdapter = None
+    to_json = None
+
+logger = logging.getLogger(__name__)
+
+
+def is_enveloped(content: Any) -> bool:
+    """True when `content` already has the uniform {status, data, code} shape."""
+    return isinstance(content, dict) and "status" in content and "data" in content and "code" in content
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """JSONResponse that applies the uniform envelope while rendering.
+
+    Used as the app's default response class, so plain return values are
+    wrapped as `{"status": "success", "data": ..., "message": None, "code": ...}`
+    in the same pass that encodes them. Content that is already wrapped is
+    encoded unchanged.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if not is_enveloped(content):
+            content = {"status": "success", "data": content, "message": None, "code": self.status_code}
+        return super().render(content)
+
+
+class PreEncodedJSONResponse(Response):
+    """Response whose body is already complete JSON bytes (envelope included)."""
+
+    media_type = "application/json"
+
+
+def _relax(annotation):
+    """Swap input-only validators (EmailStr) for plain str, recursing into Optional/Union."""
+    if annotation is EmailStr:
+        return str
+    if get_origin(annotation) is Union:
+        return Union[tuple(_relax(a) for a in get_args(annotation))]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _schema_adapters(schema: Type):
+    """Return cached (single, list) TypeAdapters serializing like `schema`.
+
+    The adapters wrap an output-only copy of the schema that reads attributes
+    (so ORM rows validate directly) and does not re-run input validators such
+    as email syntax checks on data that already came from the database. The
+    compiled serializer then dumps straight to JSON bytes, skipping
+    jsonable_encoder and the field filtering done by the fallback path.
+    """
+    fields = {}
+    for name, field in schema.model_fields.items():
+        if field.default_factory is not None:
+            default = Field(default_factory=field.default_factory)
+        else:
+            default = ... if field.is_required() else field.default
+        fields[name] = (_relax(field.annotation), default)
+    # keep JSON serialization settings such as ser_json_bytes
+    config = {k: v for k, v in getattr(schema, "model_config", {}).items() if k.startswith("ser_json")}
+    out = create_model(f"{schema.__name__}Serializer", __config__=ConfigDict(from_attributes=True, **config), **fields)
+    return TypeAdapter(out), TypeAdapter(List[out])
+
+
+def _dump_fast(data, schema: Type) -> bytes:
+    """Encode model(s) or a pagination payload to JSON bytes using `schema`."""
+    single, many = _schema_adapters(schema)
+    if isinstance(data, dict) and "items" in data:
+        items = many.dump_json(many.validate_python(list(data.get("items") or []), from_attributes=True))
+        rest = {k: v for k, v in data.items() if k != "items"}
+        if not rest:
+            return b'{"items":' + items + b"}"
+        # splice the pre-encoded items into the remaining pagination keys
+        return b'{"items":' + items + b"," + to_json(rest)[1:]
+    if isinstance(data, (list, tuple)):
+        return many.dump_json(many.validate_python(list(data), from_attributes=True))
+    return single.dump_json(single.validate_python(data, from_attributes=True))
 
 
 def _to_schema(data, schema: Type):
@@ -66,9 +150,22 @@ def _to_schema(data, schema: Type):
 
 
 def success_response(data, message: Optional[str] = None, code: int = 200, schema: Optional[Type] = None):
-    """Return a JSONResponse with a uniform wrapper. If `schema` is provided,
+    """Return a JSON response with a uniform wrapper. If `schema` is provided,
     convert model(s) to the schema first, then JSON-encode the result.
+
+    The schema path goes straight from rows to JSON bytes through cached
+    pydantic-core serializers; anything that fails to validate falls back to
+    the per-item conversion below.
     """
+    if schema is not None and data is not None and TypeAdapter is not None:
+        try:
+            body = _dump_fast(data, schema)
+        except Exception:
+            logger.debug("fast serializer failed for %s; using fallback", getattr(schema, "__name__", schema), exc_info=True)
+        else:
+            envelope = b'{"status":"success","data":' + body + b',"message":' + to_json(message) + b',"code":' + str(int(code)).encode() + b"}"
+            return PreEncodedJSONResponse(content=envelope, status_code=code)
+
     if schema is not None and data is not None:
         try:
             converted = _to_schema(data, schema)
@@ -114,4 +211,4 @@ def success_response(data, message: Optional[str] = None, code: int = 200, schem
     else:
         encoded = jsonable_encoder(data)
 
-    return JSONResponse(status_code=code, content={"status": "success", "data": encoded, "message": message, "code": code})
\ No newline at end of file
+    return EnvelopeJSONResponse(status_code=code, content={"status": "success", "data": encoded, "message": message, "code": code})
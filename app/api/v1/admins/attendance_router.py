@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from app.controllers import attendance_controller as ctl
-from app.schemas.attendance import AttendanceCreate, AttendanceOut, AttendancesPage, AttendanceUpdate
+from app.schemas.attendance import AttendanceCreate, AttendanceOut, AttendancesPage, AttendanceUpdate, AttendanceBulkResult, AttendanceOfferingSummaryOut, AttendanceSessionSummaryOut
 from app.api import auth as api_auth
 
 router = APIRouter(
@@ -13,6 +14,29 @@ async def create_attendance(out=Depends(ctl.create_attendance)):
     return out
 
 
+@router.post("/bulk", response_model=list[AttendanceBulkResult], dependencies=[api_auth.admins])
+async def bulk_upsert_attendances(out=Depends(ctl.bulk_upsert_attendances)):
+    return out
+
+
+# Stream attendance for a term/offering/group as CSV or Parquet (admin only)
+@router.get("/export", response_class=StreamingResponse, dependencies=[api_auth.admins])
+async def export_attendances(out=Depends(ctl.export_attendances)):
+    return out
+
+
+# Attendance counts per student for an offering (admin only)
+@router.get("/summary/offerings/{offering_id}", response_model=list[AttendanceOfferingSummaryOut], dependencies=[api_auth.admins])
+async def get_offering_summary(offering_id: str, out=Depends(ctl.get_offering_summary)):
+    return out
+
+
+# Attendance counts for a session (admin only)
+@router.get("/summary/sessions/{session_id}", response_model=AttendanceSessionSummaryOut, dependencies=[api_auth.admins])
+async def get_session_summary(session_id: str, out=Depends(ctl.get_session_summary)):
+    return out
+
+
 @router.get("/", response_model=AttendancesPage, dependencies=[api_auth.admins])
 async def list_attendances(out=Depends(ctl.list_attendances)):
     return out
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, status
-from app.schemas.biometric_template import BiometricTemplateCreate, BiometricTemplateOut, BiometricTemplatesPage, BiometricTemplateUpdate
+from app.schemas.biometric_template import BiometricTemplateCreate, BiometricTemplateOut, BiometricTemplatesPage, BiometricTemplateUpdate, BiometricMatchOut
 from app.controllers import biometric_templates_controller as ctl
 from app.api import auth as api_auth
 
@@ -13,6 +13,11 @@ async def create_biometric_template(out=Depends(ctl.create_biometric_template)):
     return out
 
 
+@router.post("/match", response_model=list[BiometricMatchOut], dependencies=[api_auth.admins])
+async def match_biometric_templates(out=Depends(ctl.match_biometric_templates)):
+    return out
+
+
 @router.get("/", response_model=BiometricTemplatesPage, dependencies=[api_auth.admins])
 async def list_biometric_templates(out=Depends(ctl.list_biometric_templates)):
     return out
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, status
-from app.schemas.session import SessionCreate, SessionOut, SessionsPage, SessionUpdate
+from app.schemas.session import SessionCreate, SessionOut, SessionsPage, SessionUpdate, SessionGenerateOut
 from app.controllers import sessions_controller as ctl
 from app.api import auth as api_auth
 
@@ -13,6 +13,12 @@ async def create_session(out=Depends(ctl.create_session)):
     return out
 
 
+# Expand an offering's recurrence rule into sessions (bulk insert + conflict report)
+@router.post("/generate", response_model=SessionGenerateOut, dependencies=[api_auth.admins])
+async def generate_sessions(out=Depends(ctl.generate_sessions)):
+    return out
+
+
 @router.get("/", response_model=SessionsPage, dependencies=[api_auth.admins])
 async def list_sessions(out=Depends(ctl.list_sessions)):
     return out
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query, status
 from app.schemas.setting import SettingCreate, SettingUpdate, SettingOut
 from app.controllers import settings_controller as ctl
+from app.utils.settings_cache import settings_cache
 
 router = APIRouter(tags=["settings"])
 
@@ -27,11 +28,9 @@ async def update_setting(global_id: str, payload: SettingUpdate, out=Depends(ctl
 
 @router.post("/refresh", status_code=status.HTTP_200_OK)
 async def refresh_settings_cache():
-    # reload settings into app.state cache
+    # drop cached settings in every worker; they reload on next use
     try:
-        from app.main import _load_settings_into_cache
-
-        await _load_settings_into_cache()
+        await settings_cache.invalidate()
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -13,6 +13,11 @@ async def create_verification(out=Depends(ctl.create_verification)):
     return out
 
 
+@router.post("/verify", response_model=VerificationOut, dependencies=[api_auth.admins])
+async def verify_face(out=Depends(ctl.verify_face)):
+    return out
+
+
 @router.get("/", response_model=VerificationsPage, dependencies=[api_auth.admins])
 async def list_verifications(out=Depends(ctl.list_verifications)):
     return out
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
 from app.controllers import attendance_controller as ctl
-from app.schemas.attendance import AttendanceCreate, AttendanceOut, AttendancesPage, AttendanceUpdate
+from app.schemas.attendance import AttendanceCreate, AttendanceOut, AttendancesPage, AttendanceUpdate, AttendanceBulkResult, AttendanceOfferingSummaryOut, AttendanceSessionSummaryOut
 from app.api import auth as api_auth
 
 router = APIRouter(
@@ -12,6 +12,21 @@ router = APIRouter(
 async def create_attendance(out=Depends(ctl.create_attendance)):
     return out
 
+# Bulk check-in / upsert (lecturer only)
+@router.post("/bulk", response_model=list[AttendanceBulkResult], dependencies=[api_auth.lecturer])
+async def bulk_upsert_attendances(out=Depends(ctl.bulk_upsert_attendances)):
+    return out
+
+# Attendance counts per student for an offering (lecturer only)
+@router.get("/summary/offerings/{offering_id}", response_model=list[AttendanceOfferingSummaryOut], dependencies=[api_auth.lecturer])
+async def get_offering_summary(offering_id: str, out=Depends(ctl.get_offering_summary)):
+    return out
+
+# Attendance counts for a session (lecturer only)
+@router.get("/summary/sessions/{session_id}", response_model=AttendanceSessionSummaryOut, dependencies=[api_auth.lecturer])
+async def get_session_summary(session_id: str, out=Depends(ctl.get_session_summary)):
+    return out
+
 # List attendances (lecturer only)
 @router.get("/", response_model=AttendancesPage, dependencies=[api_auth.lecturer])
 async def list_attendances(out=Depends(ctl.list_attendances)):
@@ -1,59 +1,73 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response
+from fastapi.responses import FileResponse
 from typing import Any, Optional
-import cloudinary
-import cloudinary.uploader
 from app.core.config import settings
+from app.utils.blob_store import get_blob_storage, is_digest
+from app.utils.images import InvalidImage, prepare_image
+from app.utils.storage import get_storage, run_blocking
 
 router = APIRouter()
 
+_CHUNK_SIZE = 256 * 1024
 
-def _configure_cloudinary():
-    # Configure cloudinary from environment variables (.env already loaded by pydantic-settings)
-    # Prefer values from the pydantic Settings object (reads .env)
-    cloudinary.config(
-        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-        api_key=settings.CLOUDINARY_API_KEY,
-        api_secret=settings.CLOUDINARY_API_SECRET,
-        secure=True,
-    )
+
+async def _read_limited(file: UploadFile) -> bytes:
+    """Read the upload in chunks, rejecting it as soon as it exceeds UPLOAD_MAX_BYTES."""
+    try:
+        # Ensure file pointer is at start (some clients may have consumed it)
+        await file.seek(0)
+    except Exception:
+        pass
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > settings.UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Image larger than {settings.UPLOAD_MAX_BYTES} bytes")
+        chunks.append(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return b"".join(chunks)
 
 
 @router.post("/image", tags=["uploads"])
 async def upload_image(file: UploadFile = File(...)) -> Any:
-    """Public endpoint to upload an image to Cloudinary. No auth required.
+    """Public endpoint to upload an image to the configured storage. No auth required.
 
-    Returns Cloudinary upload result (url, public_id, etc.).
+    The image is downscaled/re-encoded off the event loop before it is stored.
+    Returns the storage result (url, public_id, etc.).
     """
-    _configure_cloudinary()
-
-    if not file.content_type.startswith("image/"):
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image uploads are allowed")
 
+    data = await _read_limited(file)
     try:
-        # cloudinary.uploader.upload accepts file-like objects; UploadFile.file is suitable
-        # Ensure file pointer is at start (some clients may have consumed it)
-        try:
-            file.file.seek(0)
-        except Exception:
-            pass
+        data, content_type = await run_blocking(prepare_image, data, file.content_type)
+    except InvalidImage as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-        result = cloudinary.uploader.upload(file.file, resource_type="image")
+    try:
+        stored = await get_storage().put(data, content_type)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Upload failed: {exc}")
 
-    return {"url": result.get("secure_url") or result.get("url"), "public_id": result.get("public_id"), "raw": result}
+    return {"url": stored.url, "public_id": stored.public_id, "raw": stored.raw}
 
 
 @router.delete("/image", tags=["uploads"])
 async def delete_image(public_id: Optional[str] = None, url: Optional[str] = None) -> Any:
-    """Delete an image from Cloudinary by `public_id` or by full `url`.
+    """Delete an image from the configured storage by `public_id` or by full `url`.
+
+    With the blob backend identical images share one blob; this drops one
+    upload's reference and the blob is removed with the last one.
 
     Examples:
     - DELETE /api/v1/uploads/image?public_id=abc123
     - DELETE /api/v1/uploads/image?url=https://res.cloudinary.com/.../v123/.../abc123.jpg
     """
-    _configure_cloudinary()
-
     if not public_id and not url:
         raise HTTPException(status_code=400, detail="Provide either `public_id` or `url` to delete")
 
@@ -66,8 +80,32 @@ async def delete_image(public_id: Optional[str] = None, url: Optional[str] = Non
             raise HTTPException(status_code=400, detail="Could not extract public_id from url")
 
     try:
-        result = cloudinary.uploader.destroy(public_id, resource_type="image", invalidate=True)
+        result = await get_storage().delete(public_id)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Delete failed: {exc}")
 
     return {"public_id": public_id, "raw": result}
+
+
+@router.get("/blobs/{digest}", tags=["uploads"], response_class=FileResponse)
+async def get_blob(digest: str, request: Request) -> Any:
+    """Serve a blob from the local content-addressed store.
+
+    Blobs never change, so the sha256 is a strong ETag and responses are
+    cacheable forever. FileResponse handles Range requests and uses the
+    server's sendfile/pathsend support when available.
+    """
+    if not is_digest(digest):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    store = get_blob_storage().store
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        if store.exists(digest):
+            return Response(status_code=304, headers=headers)
+    try:
+        content_type = await run_blocking(store.content_type, digest)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return FileResponse(store.path(digest), media_type=content_type, headers=headers)
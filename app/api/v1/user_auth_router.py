@@ -4,8 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.utils.jwt_utils import create_access_token, decode_access_token
 from app.schemas.auth import Login, TokenOut, RefreshRequest
 from app.services.admin_service import AdminService
-from app.services.instructor_service import InstructorService
-from app.services.student_service import StudentService
+from app.services.identity_service import IdentityService
 from app.db.session import get_session
 from app.api.deps import get_setting_from_cache
 from app.core.config import settings
@@ -17,12 +16,14 @@ router = APIRouter(tags=["auth"])
 
 @router.post("/login", response_model=dict)
 async def login(payload: Login, db=Depends(get_session), jwt_ttl: Optional[str] = Depends(get_setting_from_cache("jwt_ttl")), jwt_ttl_refresh: Optional[str] = Depends(get_setting_from_cache("jwt_ttl_refresh"))):
-    # Try instructor login first
-    inst_svc = InstructorService(db)
-    instructor = await inst_svc.authenticate(payload.email, payload.password)
-    if instructor:
+    # One query resolves whether the email belongs to an instructor or a
+    # student; only that row's password hash is verified
+    ident = await IdentityService(db).authenticate(payload.email, payload.password)
+    if not ident:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if ident.kind == "instructor":
         # map instructor position to role claim used across the app
-        pos = (instructor.position or "").lower()
+        pos = (ident.position or "").lower()
         role_map = {
             "professor": "professor",
             "lecturer": "lecturer",
@@ -30,26 +31,21 @@ async def login(payload: Login, db=Depends(get_session), jwt_ttl: Optional[str]
         }
         role = role_map.get(pos, "lecturer")
         safe_user = {
-            "user_id": instructor.id,
-            "email": instructor.email,
+            "user_id": ident.id,
+            "email": ident.email,
             "role": role,
-            "global_id": getattr(instructor, "global_id", None),
-            "first_name": instructor.first_name,
-            "last_name": instructor.last_name,
+            "global_id": ident.global_id,
+            "first_name": ident.first_name,
+            "last_name": ident.last_name,
         }
     else:
-        # Try student login
-        stu_svc = StudentService(db)
-        student = await stu_svc.authenticate(payload.email, payload.password)
-        if not student:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
         safe_user = {
-            "user_id": student.id,
-            "email": student.email,
+            "user_id": ident.id,
+            "email": ident.email,
             "role": "student",
-            "global_id": getattr(student, "global_id", None) or getattr(student, "student_code", None),
-            "first_name": student.first_name,
-            "last_name": student.last_name,
+            "global_id": ident.global_id or ident.student_code,
+            "first_name": ident.first_name,
+            "last_name": ident.last_name,
         }
     # Use the environment-configured secret only
     secret = settings.JWT_PRIVATE
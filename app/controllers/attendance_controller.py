@@ -1,6 +1,8 @@
-from fastapi import Depends, Request
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_db, replica_allowed, replica_reads
 from app.schemas.admin import ActiveUpdate
 from app.services.attendance_service import AttendanceService
 from app.schemas.attendance import (
@@ -8,9 +10,18 @@ from app.schemas.attendance import (
     AttendanceUpdate,
     AttendanceOut,
     AttendancesPage,
+    AttendanceBulkResult,
+    AttendanceOfferingSummaryOut,
+    AttendanceSessionSummaryOut,
 )
 from app.api.response import success_response
-from app.api.deps_helpers import resolve_body_and_fk
+from app.api.deps_helpers import resolve_body_and_fk, resolve_bulk_body_and_fk
+from app.core.errors import NotFound
+from app.utils.fk_resolver import resolve_fk_ids
+from app.models.course_offering import CourseOffering
+from app.models.group import Group
+from app.models.term import Term
+from app.services.attendance_export_service import AttendanceExportService
 from app.models.student import Student
 from app.models.session import Session
 from app.controllers.verification_controller import VerificationService
@@ -28,6 +39,67 @@ async def create_attendance(payload: AttendanceCreate = Depends(resolve_body_and
     return success_response(obj, message="Attendance created successfully", schema=AttendanceOut)
 
 
+async def bulk_upsert_attendances(entries=Depends(resolve_bulk_body_and_fk(AttendanceCreate, {"student_id": Student, "session_id": Session, "verification_id": Verification})), svc: AttendanceService = Depends(get_service)) -> list[AttendanceBulkResult]:
+    valid = [(i, payload) for i, (payload, error) in enumerate(entries) if error is None]
+    upserted = await svc.bulk_upsert([payload for _, payload in valid]) if valid else []
+    results = [{"index": i, "result": "error", "attendance": None, "error": error} for i, (_, error) in enumerate(entries)]
+    for (i, _), (obj, result, error) in zip(valid, upserted):
+        results[i] = {"index": i, "result": result, "attendance": obj, "error": error}
+    return success_response(results, message="Attendances upserted successfully", schema=AttendanceBulkResult)
+
+
+async def _resolve_id(svc: AttendanceService, key: str, value: str, Model) -> int:
+    """Accept a numeric id or a global_id in the path."""
+    try:
+        return (await resolve_fk_ids(svc.db, {key: value}, {key: Model}))[key]
+    except HTTPException:
+        raise NotFound(f"{Model.__name__} not found")
+
+
+async def get_offering_summary(offering_id: str, student_id: Optional[str] = None, svc: AttendanceService = Depends(get_service)) -> list[AttendanceOfferingSummaryOut]:
+    with replica_reads(svc.db, replica_allowed(svc.request)):
+        oid = await _resolve_id(svc, "offering_id", offering_id, CourseOffering)
+        if student_id is not None:
+            sid = await _resolve_id(svc, "student_id", student_id, Student)
+            row = await svc.summary.for_offering_student(oid, sid)
+            rows = [row] if row is not None else [{"offering_id": oid, "student_id": sid}]
+        else:
+            rows = await svc.summary.for_offering(oid)
+    return success_response(rows, message="Attendance summary retrieved successfully", schema=AttendanceOfferingSummaryOut)
+
+
+async def get_session_summary(session_id: str, svc: AttendanceService = Depends(get_service)) -> AttendanceSessionSummaryOut:
+    with replica_reads(svc.db, replica_allowed(svc.request)):
+        sid = await _resolve_id(svc, "session_id", session_id, Session)
+        row = await svc.summary.for_session(sid)
+    return success_response(row if row is not None else {"session_id": sid}, message="Attendance summary retrieved successfully", schema=AttendanceSessionSummaryOut)
+
+
+async def export_attendances(
+    term_id: Optional[str] = None,
+    offering_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    svc: AttendanceService = Depends(get_service),
+) -> StreamingResponse:
+    # streamed as-is: a file download, not the JSON envelope
+    scope = {k: v for k, v in (("term_id", term_id), ("offering_id", offering_id), ("group_id", group_id)) if v is not None}
+    if not scope:
+        raise HTTPException(status_code=400, detail="Provide term_id, offering_id or group_id")
+    replica = replica_allowed(svc.request)
+    with replica_reads(svc.db, replica):
+        scope = await resolve_fk_ids(svc.db, scope, {"term_id": Term, "offering_id": CourseOffering, "group_id": Group})
+    exporter = AttendanceExportService(svc.db, replica=replica)
+    exporter.check_format(format)
+    stmt = exporter.query(**scope)
+    filename = "attendance-" + "-".join(f"{k.split('_')[0]}{v}" for k, v in scope.items()) + "." + format
+    return StreamingResponse(
+        exporter.chunks(stmt, format),
+        media_type=exporter.formats[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 async def list_attendances(svc: AttendanceService = Depends(get_service)) -> list[AttendanceOut]:
     objs = await svc.list()
     return success_response(objs, message="Attendances retrieved successfully", schema=AttendanceOut)
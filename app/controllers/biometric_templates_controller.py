@@ -6,7 +6,10 @@ from app.schemas.biometric_template import (
     BiometricTemplateCreate,
     BiometricTemplateUpdate,
     BiometricTemplateOut,
+    BiometricTemplateSummaryOut,
     BiometricTemplatesPage,
+    BiometricMatchRequest,
+    BiometricMatchOut,
     ActiveUpdate,
 )
 from app.api.response import success_response
@@ -25,9 +28,15 @@ async def create_biometric_template(payload: BiometricTemplateCreate = Depends(r
     return success_response(obj, message="Biometric template created successfully", schema=BiometricTemplateOut)
 
 
+async def match_biometric_templates(payload: BiometricMatchRequest, svc: BiometricTemplateService = Depends(get_service)) -> list[BiometricMatchOut]:
+    matches = await svc.match(payload.embedding, payload.top_k, model=payload.model, min_similarity=payload.min_similarity)
+    return success_response([m._asdict() for m in matches], message="Biometric matches retrieved successfully", schema=BiometricMatchOut)
+
+
 async def list_biometric_templates(svc: BiometricTemplateService = Depends(get_service)) -> list[BiometricTemplateOut]:
     objs = await svc.list()
-    return success_response(objs, message="Biometric templates retrieved successfully", schema=BiometricTemplateOut)
+    schema = BiometricTemplateOut if svc.includes_embedding() else BiometricTemplateSummaryOut
+    return success_response(objs, message="Biometric templates retrieved successfully", schema=schema)
 
 
 async def get_biometric_template(global_id: str, svc: BiometricTemplateService = Depends(get_service)) -> BiometricTemplateOut:
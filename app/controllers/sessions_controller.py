@@ -8,6 +8,8 @@ from app.schemas.session import (
     SessionUpdate,
     SessionOut,
     SessionsPage,
+    SessionGenerateRequest,
+    SessionGenerateOut,
 )
 from app.api.response import success_response
 from app.api.deps_helpers import resolve_body_and_fk
@@ -26,6 +28,18 @@ async def create_session(payload: SessionCreate = Depends(resolve_body_and_fk(Se
     return success_response(obj, message="Session created successfully", schema=SessionOut)
 
 
+async def generate_sessions(payload: SessionGenerateRequest = Depends(resolve_body_and_fk(SessionGenerateRequest, {"offering_id": CourseOffering, "room_id": Room})), svc: SessionService = Depends(get_service)) -> SessionGenerateOut:
+    planned, created, conflicts = await svc.generate(payload)
+    if payload.dry_run:
+        message = f"{len(planned)} sessions planned, {len(conflicts)} conflicts"
+    elif conflicts and not created:
+        message = f"No sessions created: {len(conflicts)} conflicts"
+    else:
+        message = f"{len(created)} sessions created"
+    out = {"planned": len(planned), "created": created, "conflicts": conflicts, "dry_run": payload.dry_run}
+    return success_response(out, message=message, schema=SessionGenerateOut)
+
+
 async def list_sessions(svc: SessionService = Depends(get_service)) -> list[SessionOut]:
     objs = await svc.list()
     return success_response(objs, message="Sessions retrieved successfully", schema=SessionOut)
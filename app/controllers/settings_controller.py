@@ -5,6 +5,7 @@ from app.services.setting_service import SettingService
 from app.schemas.setting import SettingCreate, SettingUpdate, SettingOut
 from app.core.errors import NotFound
 from app.api.response import success_response
+from app.utils.settings_cache import settings_cache
 from uuid import uuid4
 
 
@@ -20,6 +21,7 @@ async def create_setting(payload: SettingCreate, svc: SettingService = Depends(g
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Setting with this key already exists")
     # Pydantic schema and DB model provide a default for global_id; just pass the mapping
     setting = await svc.create(payload.__dict__)
+    await settings_cache.invalidate()
     return success_response({"id": setting.id}, message="Setting created", code=201)
 
 async def list_settings(svc: SettingService = Depends(get_service)) -> list[SettingOut]:
@@ -43,4 +45,6 @@ async def update_setting(global_id: str, payload: SettingUpdate, svc: SettingSer
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="that key is already in use")
 
     setting = await svc.update_by_global_id(global_id, payload)
+    # push the change to every worker (e.g. jwt_ttl takes effect on the next login)
+    await settings_cache.invalidate()
     return success_response(setting, message="Setting updated successfully", schema=SettingOut)
@@ -7,6 +7,7 @@ from app.schemas.verification import (
     VerificationUpdate,
     VerificationOut,
     VerificationsPage,
+    VerificationVerifyRequest,
     ActiveUpdate,
 )
 from app.api.response import success_response
@@ -27,6 +28,11 @@ async def create_verification(payload: VerificationCreate = Depends(resolve_body
     return success_response(obj, message="Verification created successfully", schema=VerificationOut)
 
 
+async def verify_face(payload: VerificationVerifyRequest = Depends(resolve_body_and_fk(VerificationVerifyRequest, {"session_id": Session})), svc: VerificationService = Depends(get_service)) -> VerificationOut:
+    obj = await svc.verify(payload.session_id, payload.embedding, liveness_score=payload.liveness_score, captured_image_url=payload.captured_image_url)
+    return success_response(obj, message="Verification recorded successfully", schema=VerificationOut)
+
+
 async def list_verifications(svc: VerificationService = Depends(get_service)) -> list[VerificationOut]:
     objs = await svc.list()
     return success_response(objs, message="Verifications retrieved successfully", schema=VerificationOut)
@@ -14,10 +14,70 @@ class Settings(BaseSettings):
     DB_USER: str = "fastapi_user"
     DB_PASSWORD: str = "change-me"
     DB_NAME: str = "fastapipro"
+    # Connection pool, per worker process: kept-open connections, extra burst connections
+    # (a worker can hold DB_POOL_SIZE + DB_MAX_OVERFLOW), seconds to wait for a free one,
+    # and max connection age before it is replaced
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # Ping connections on checkout to detect stale ones; costs one round trip per checkout
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements cached per connection by asyncpg (0 disables)
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    # Set when connecting through PgBouncer in transaction mode: disables prepared statement caching
+    DB_PGBOUNCER: bool = False
+    # Seconds to establish a connection / optional per-statement timeout
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_COMMAND_TIMEOUT: Optional[float] = None
+    # Optional read replica for GET list/detail/report queries (same user, password and database)
+    DB_READ_HOST: Optional[str] = None
+    DB_READ_PORT: Optional[int] = None
+    # Log statements slower than this (milliseconds, 0 disables) with the route that ran them
+    DB_SLOW_QUERY_MS: float = 200.0
+    # Warn when one request runs the same statement shape this many times (likely N+1; 0 disables)
+    DB_REPEATED_QUERY_THRESHOLD: int = 10
+    # Prometheus /metrics (needs prometheus_client). Under gunicorn with several workers point
+    # METRICS_MULTIPROC_DIR at an empty directory shared by the workers
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    # How often (seconds) each worker copies pool/cache/hasher stats into the metrics
+    METRICS_REFRESH_SECONDS: float = 5.0
 
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:5000", "http://127.0.0.1:5000"]
     # JWT secret used to sign tokens. Prefer keeping this out of source control (.env or environment variable).
     JWT_PRIVATE: Optional[str] = None
+
+    # Settings table cache: "memory" (per worker, version-checked every TTL) or
+    # "redis" (shared copy + push invalidation via SETTINGS_CACHE_URL)
+    SETTINGS_CACHE_BACKEND: str = "memory"
+    SETTINGS_CACHE_URL: Optional[str] = None
+    SETTINGS_CACHE_TTL_SECONDS: float = 30.0
+
+    # Password hashing pool: concurrent pbkdf2 threads and max admitted (running + queued) calls
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 256
+
+    # Seconds a resolved FK global_id -> id mapping stays in the process-local cache (0 disables)
+    FK_CACHE_TTL_SECONDS: int = 600
+    # How often (seconds) the in-process face index pulls template changes made by other workers
+    FACE_INDEX_SYNC_SECONDS: float = 5.0
+    # How far (seconds) each pull re-reads behind the newest updated_at seen; updated_at is the
+    # writing transaction's start time, so this must cover how long template writes stay open
+    FACE_INDEX_SYNC_OVERLAP_SECONDS: float = 300.0
+    # How often (seconds) the face index is reloaded in full, catching writes older than the overlap
+    FACE_INDEX_FULL_RELOAD_SECONDS: float = 3600.0
+    # Storage precision for new/updated template embeddings: float32, float16 or int8
+    EMBEDDING_STORAGE_DTYPE: str = "float16"
+    # Minimum cosine similarity for a face verification to count as a match
+    FACE_MATCH_THRESHOLD: float = 0.6
+    # Optional minimum liveness score; verifications below it are recorded as fail_liveness
+    FACE_LIVENESS_THRESHOLD: Optional[float] = None
+    # Per-session candidate blocks: warm sessions starting within the lead window,
+    # re-check every interval, and rebuild blocks older than the TTL
+    SESSION_WARM_LEAD_SECONDS: int = 600
+    SESSION_WARM_INTERVAL_SECONDS: int = 60
+    SESSION_CANDIDATES_TTL_SECONDS: int = 300
     
     # Cloudinary credentials (optional)
     CLOUDINARY_CLOUD_NAME: Optional[str] = None
@@ -25,6 +85,35 @@ class Settings(BaseSettings):
     CLOUDINARY_API_SECRET: Optional[str] = None
     CLOUDINARY_URL: Optional[str] = None
 
+    # Image uploads: storage backend ("cloudinary", "blob" for the local content-addressed
+    # store replicated to Cloudinary, or "local" for offline runs),
+    # threads for re-encoding/SDK calls, and the max accepted upload size
+    UPLOAD_STORAGE_BACKEND: str = "cloudinary"
+    UPLOAD_WORKERS: int = 4
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    # Uploaded images are downscaled to this longest side and re-encoded as JPEG;
+    # JPEGs already within bounds and under the passthrough size are stored as-is
+    UPLOAD_IMAGE_MAX_SIDE: int = 1024
+    UPLOAD_IMAGE_QUALITY: int = 85
+    UPLOAD_IMAGE_PASSTHROUGH_BYTES: int = 512 * 1024
+    # Where the "local" backend writes files and the URL prefix they are served from
+    UPLOAD_LOCAL_DIR: str = "./uploads"
+    UPLOAD_LOCAL_BASE_URL: str = "/media"
+    # Content-addressed blob store ("blob" backend): root directory, where blobs are
+    # replicated ("cloudinary" or None to keep them local only), and replication limits
+    BLOB_STORE_DIR: str = "./blobs"
+    BLOB_REPLICA_BACKEND: Optional[str] = "cloudinary"
+    BLOB_REPLICATION_QUEUE_SIZE: int = 10000
+    BLOB_REPLICATION_MAX_BACKOFF_SECONDS: int = 300
+
+    # Time zone for class times given as wall-clock times (session generation)
+    SCHEDULE_TIMEZONE: str = "UTC"
+    # Upper bound on sessions created by one schedule generation request
+    SCHEDULE_MAX_SESSIONS: int = 500
+
+    # Rows fetched per server-side cursor batch (and per CSV chunk / Parquet row group) in exports
+    EXPORT_BATCH_ROWS: int = 5000
+
     # Load environment from .env and ignore extra keys so unknown env entries
     # (for deployment or docker-compose) don't cause validation failures.
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
@@ -36,5 +125,14 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def sqlalchemy_read_uri(self) -> Optional[str]:
+        if not self.DB_READ_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}"
+            f"@{self.DB_READ_HOST}:{self.DB_READ_PORT or self.DB_PORT}/{self.DB_NAME}"
+        )
+
 
 settings = Settings()
\ No newline at end of file
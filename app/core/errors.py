@@ -13,3 +13,18 @@ class NotFound(DomainError):
 
 class InvalidPasswordLength(DomainError):
     """Raised when a provided password exceeds allowed length for the hasher."""
+
+class InvalidCursor(DomainError):
+    """Raised when a pagination cursor cannot be decoded or does not fit the listing."""
+
+class InvalidEmbedding(DomainError):
+    """Raised when a biometric embedding cannot be decoded or is degenerate."""
+
+class FeatureUnavailable(DomainError):
+    """Raised when an optional dependency needed by a feature is not installed."""
+
+class InvalidSchedule(DomainError):
+    """Raised when a session schedule cannot be generated from the given rule."""
+
+class ScheduleConflict(DomainError):
+    """Raised when a session would double-book a room or instructor."""
@@ -0,0 +1,162 @@
+"""Per-request SQL accounting, slow-query log and N+1 detection.
+
+`before/after_cursor_execute` listeners on the engines time every statement.
+Statements run while a request is being served are added to that request's
+`QueryStats`, found through a context variable set by
+`QueryTrackingMiddleware`; statements outside a request (startup,
+background tasks) are only checked against the slow-query threshold.
+
+- Statements slower than `DB_SLOW_QUERY_MS` are logged with the route that
+  ran them.
+- Statements are also counted by shape (the SQL text with its bind
+  placeholders, so `get_one_by` with different values is one shape); a shape
+  run `DB_REPEATED_QUERY_THRESHOLD` times or more within one request is
+  logged as a likely N+1 once the request finishes.
+- With `DEBUG` on, responses carry X-DB-Queries, X-DB-Time-Ms and
+  X-DB-Repeated (most runs of a single shape).
+"""
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def route_label(scope) -> str:
+    """Route template of a matched request, e.g. /api/v1/admin/auth/rooms/{global_id}.
+
+    Rebuilt from the path and the matched path params: with included routers
+    `scope["route"]` carries the route's path without the router prefixes.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    params = scope.get("path_params")
+    if not params:
+        return path
+    names = {str(value): name for name, value in params.items()}
+    return "/".join("{%s}" % names[part] if part in names else part for part in path.split("/"))
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "shapes", "scope")
+
+    def __init__(self, scope=None) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        # statement text -> runs within this request
+        self.shapes: Dict[str, int] = {}
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "-"
+        return f"{self.scope.get('method', '')} {route_label(self.scope)}"
+
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        if not self.shapes:
+            return None, 0
+        statement = max(self.shapes, key=self.shapes.__getitem__)
+        return statement, self.shapes[statement]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_request(scope=None) -> Token:
+    """Start attributing queries to a fresh QueryStats; pass the token to `end_request`."""
+    return _current.set(QueryStats(scope))
+
+
+def end_request(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _one_line(statement: str, limit: int = 2000) -> str:
+    return " ".join(statement.split())[:limit]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s", elapsed * 1000, stats.route if stats is not None else "-", _one_line(statement)
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # a failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument(engine) -> None:
+    """Attach the listeners to `engine` (an AsyncEngine or Engine); idempotent."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def report_repeated(stats: QueryStats) -> None:
+    """Log statement shapes repeated often enough within one request to look like N+1."""
+    threshold = settings.DB_REPEATED_QUERY_THRESHOLD
+    if not threshold:
+        return
+    for statement, runs in stats.shapes.items():
+        if runs >= threshold:
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s", stats.route, runs, _one_line(statement, 500))
+
+
+class QueryTrackingMiddleware:
+    """Pure ASGI middleware scoping a QueryStats to each HTTP request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = begin_request(scope)
+        stats = _current.get()
+
+        async def _debug_send(message):
+            if message["type"] == "http.response.start":
+                _, repeated = stats.most_repeated()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                    (b"x-db-repeated", str(repeated).encode()),
+                ]
+            await send(message)
+
+        send_wrapper = _debug_send if settings.DEBUG else send
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            report_repeated(stats)
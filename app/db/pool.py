@@ -0,0 +1,138 @@
+"""Engine/pool options from Settings, and pool instrumentation.
+
+`engine_options()` turns the DB_* settings into `create_async_engine`
+keyword arguments, including asyncpg's prepared-statement caches and the
+PgBouncer (transaction pooling) switch, which turns those caches off
+because server-side prepared statements do not survive a change of
+backend connection between transactions.
+
+`InstrumentedQueuePool` is the default async pool plus counters: checkouts,
+new connections and the time spent opening them, invalidations, checkout
+timeouts and how long callers queued for a free connection. The wait
+excludes opening overflow connections, so it only grows when the pool is
+too small. `pool_stats(engine)` snapshots them together with
+current occupancy, for sizing workers against Postgres `max_connections`
+(each worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections).
+"""
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+# upper bounds (seconds) of the checkout wait histogram (time queued for a free
+# connection, not time connecting); the last bucket is +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs) -> None:
+        # recreate() passes the old pool's listeners in _dispatch; don't register twice
+        inherited = kwargs.get("_dispatch") is not None
+        super().__init__(*args, **kwargs)
+        self._init_stats(listen=not inherited)
+
+    def _init_stats(self, listen: bool) -> None:
+        self.stats: Dict[str, Any] = {
+            "checkouts": 0,
+            "connects": 0,
+            "invalidations": 0,
+            "timeouts": 0,
+            "connect_seconds_sum": 0.0,
+            "wait_seconds_sum": 0.0,
+            "wait_seconds_max": 0.0,
+            "wait_buckets": [0] * (len(WAIT_BUCKETS) + 1),
+        }
+        if listen:
+            event.listen(self, "connect", self._on_connect)
+            event.listen(self, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.stats["connects"] += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.stats["invalidations"] += 1
+
+    def recreate(self):
+        # carry the counters over when the engine recreates its pool (e.g. after dispose())
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        conn = super()._create_connection()
+        # _do_get opens overflow connections inline; this lets it leave that time out
+        conn._connect_seconds = time.perf_counter() - started
+        self.stats["connect_seconds_sum"] += conn._connect_seconds
+        return conn
+
+    def _do_get(self):
+        # _do_get is where QueuePool blocks for a free connection (up to `timeout`)
+        # or, while under max_overflow, opens a new one
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        connecting = getattr(conn, "_connect_seconds", 0.0)
+        conn._connect_seconds = 0.0
+        waited = max(0.0, time.perf_counter() - started - connecting)
+        stats = self.stats
+        stats["checkouts"] += 1
+        stats["wait_seconds_sum"] += waited
+        if waited > stats["wait_seconds_max"]:
+            stats["wait_seconds_max"] = waited
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if waited <= bound:
+                stats["wait_buckets"][i] += 1
+                break
+        else:
+            stats["wait_buckets"][-1] += 1
+        return conn
+
+
+def engine_options() -> Dict[str, Any]:
+    """Keyword arguments for `create_async_engine` built from the DB_* settings."""
+    connect_args: Dict[str, Any] = {"timeout": settings.DB_CONNECT_TIMEOUT}
+    if settings.DB_COMMAND_TIMEOUT is not None:
+        connect_args["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+    if settings.DB_PGBOUNCER:
+        # no named prepared statements may outlive a transaction under PgBouncer
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    else:
+        # asyncpg's own cache plus SQLAlchemy's adapter-level cache
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Occupancy and counters of `engine`'s pool (an AsyncEngine or Engine)."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    out: Dict[str, Any] = {"size": pool.size(), "max_overflow": getattr(pool, "_max_overflow", settings.DB_MAX_OVERFLOW)}
+    for name in ("checkedout", "checkedin", "overflow"):
+        fn = getattr(pool, name, None)
+        if fn is not None:
+            # QueuePool.overflow() is negative while the pool has unopened capacity
+            out[name] = max(0, fn()) if name == "overflow" else fn()
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        out.update({k: (list(v) if isinstance(v, list) else v) for k, v in stats.items()})
+        out["wait_seconds_avg"] = stats["wait_seconds_sum"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    return out
@@ -1,10 +1,75 @@
 # app/db/session.py
 
+from contextlib import contextmanager
+from typing import Optional
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from starlette.requests import Request
 from app.core.config import settings
+from app.db.instrumentation import instrument
+from app.db.pool import engine_options
+
+# pool size/timeouts and asyncpg statement caching come from DB_* settings (app/db/pool.py)
+engine = create_async_engine(settings.sqlalchemy_uri, **engine_options())
+
+# optional streaming replica (DB_READ_HOST); None when reads stay on the primary
+read_engine = create_async_engine(settings.sqlalchemy_read_uri, **engine_options()) if settings.sqlalchemy_read_uri else None
+for _engine in (engine, read_engine):
+    if _engine is not None:
+        # per-request query counts/time (app/db/instrumentation.py)
+        instrument(_engine)
+
+# clients send this header (any of 1/true/yes) to read their own writes right after making them
+READ_PRIMARY_HEADER = "x-read-primary"
+
+
+class RoutingSession(Session):
+    """Session that sends reads to `read_engine` while `info["replica"]` is set.
+
+    Flushes always go to the primary, so a session that reads on the replica
+    can still write; `replica_reads()` toggles the flag around read paths.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if read_engine is not None and self.info.get("replica") and not self._flushing:
+            return read_engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=RoutingSession)
+# standalone sessions on the replica (falls back to the primary), e.g. for streamed exports
+ReadSessionLocal = async_sessionmaker(read_engine or engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def replica_allowed(request: Optional[Request]) -> bool:
+    """True when `request` may be served from the replica.
+
+    Only GET/HEAD requests qualify, so reads that precede a write in the same
+    request stay on the primary. A request opts out with READ_PRIMARY_HEADER
+    or by setting `request.state.read_primary = True`.
+    """
+    if read_engine is None or request is None:
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if getattr(request.state, "read_primary", False):
+        return False
+    return request.headers.get(READ_PRIMARY_HEADER, "").lower() not in ("1", "true", "yes")
+
+
+@contextmanager
+def replica_reads(db: AsyncSession, enabled: bool = True):
+    """Route `db`'s queries to the replica inside the block (no-op without one)."""
+    if read_engine is None:
+        yield db
+        return
+    previous = db.info.get("replica", False)
+    db.info["replica"] = enabled
+    try:
+        yield db
+    finally:
+        db.info["replica"] = previous
 
-engine = create_async_engine(settings.sqlalchemy_uri, pool_pre_ping=True)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 async def get_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
@@ -1,5 +1,24 @@
+import os
+import shutil
+
 bind = "0.0.0.0:8000"
 workers = 2
 worker_class = "uvicorn.workers.UvicornWorker"
 timeout = 60
-keepalive = 5
\ No newline at end of file
+keepalive = 5
+
+
+def on_starting(server):
+    # start every run with an empty Prometheus multiprocess directory
+    from app.core.config import settings
+
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or settings.METRICS_MULTIPROC_DIR
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from app.utils.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
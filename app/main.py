@@ -1,24 +1,29 @@
 from typing import Optional
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.api.v1.router import api_router
-from app.services.setting_service import SettingService
+from app.api.response import EnvelopeJSONResponse
+from app.utils.settings_cache import settings_cache
 from app.db.session import AsyncSessionLocal
+from app.db.instrumentation import QueryTrackingMiddleware
+from app.utils.session_candidates import session_candidates
+import asyncio
 import os
 import time
-from app.core.errors import DomainError, NotFound, DuplicateEmail, InvalidPasswordLength
+from app.utils import metrics
+from app.core.errors import DomainError, NotFound, DuplicateEmail, InvalidPasswordLength, FeatureUnavailable, ScheduleConflict
 from app.core.errors import DuplicatePhone
-from fastapi.responses import JSONResponse
 from fastapi import Request
 
 setup_logging()
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+# Responses are wrapped into {status, data, message, code} by the response class
+# at render time, so no middleware needs to buffer and re-parse bodies.
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, default_response_class=EnvelopeJSONResponse)
 
 # Ensure the process timezone is set to UTC. This sets the TZ environment variable and calls
 # time.tzset() on Unix systems so that datetime.utcnow() and other time functions behave as UTC.
@@ -37,16 +42,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # let the browser frontend read the per-request SQL totals in debug mode
+    expose_headers=["X-DB-Queries", "X-DB-Time-Ms", "X-DB-Repeated"] if settings.DEBUG else [],
 )
 
 
 @app.middleware("http")
 async def attach_settings_to_request(request, call_next):
     # expose settings cache on each request similar to req.setting in Express
-    request.state.setting = getattr(request.app.state, "settings_cache", {})
+    request.state.setting = settings_cache.values()
     return await call_next(request)
 
 
+if settings.METRICS_ENABLED and metrics.prom is not None:
+    # added last so it wraps everything else, including error handling
+    app.add_middleware(metrics.MetricsMiddleware)
+# outermost: scopes per-request SQL stats (slow-query log, N+1 warnings, X-DB-* debug headers)
+app.add_middleware(QueryTrackingMiddleware)
+
+
 def _wrap_response(status: str, data=None, message: Optional[str] = None, code: int = 200):
     return {"status": status, "data": data, "message": message, "code": code}
 
@@ -55,12 +69,12 @@ def _wrap_response(status: str, data=None, message: Optional[str] = None, code:
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     # exc.detail may already be a dict from FastAPI validation, handle gracefully
     detail = exc.detail if not isinstance(exc.detail, (list, dict)) else exc.detail
-    return JSONResponse(status_code=exc.status_code, content=_wrap_response("error", data=None, message=str(detail), code=exc.status_code))
+    return EnvelopeJSONResponse(status_code=exc.status_code, content=_wrap_response("error", data=None, message=str(detail), code=exc.status_code))
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(status_code=422, content=_wrap_response("error", data=exc.errors(), message="Validation error", code=422))
+    return EnvelopeJSONResponse(status_code=422, content=_wrap_response("error", data=exc.errors(), message="Validation error", code=422))
 
 
 @app.exception_handler(Exception)
@@ -69,79 +83,56 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     import logging
 
     logging.exception("Unhandled exception: %s", exc)
-    return JSONResponse(status_code=HTTP_500_INTERNAL_SERVER_ERROR, content=_wrap_response("error", data=None, message="Internal server error", code=HTTP_500_INTERNAL_SERVER_ERROR))
+    return EnvelopeJSONResponse(status_code=HTTP_500_INTERNAL_SERVER_ERROR, content=_wrap_response("error", data=None, message="Internal server error", code=HTTP_500_INTERNAL_SERVER_ERROR))
 
 
 @app.exception_handler(DomainError)
 async def domain_error_handler(request: Request, exc: DomainError):
     # Map common domain errors to HTTP responses
     if isinstance(exc, NotFound):
-        return JSONResponse(status_code=404, content=_wrap_response("error", data=None, message=str(exc), code=404))
+        return EnvelopeJSONResponse(status_code=404, content=_wrap_response("error", data=None, message=str(exc), code=404))
     if isinstance(exc, DuplicateEmail):
-        return JSONResponse(status_code=409, content=_wrap_response("error", data=None, message=str(exc), code=409))
+        return EnvelopeJSONResponse(status_code=409, content=_wrap_response("error", data=None, message=str(exc), code=409))
     if isinstance(exc, DuplicatePhone):
-        return JSONResponse(status_code=409, content=_wrap_response("error", data=None, message=str(exc), code=409))
+        return EnvelopeJSONResponse(status_code=409, content=_wrap_response("error", data=None, message=str(exc), code=409))
     if isinstance(exc, InvalidPasswordLength):
-        return JSONResponse(status_code=400, content=_wrap_response("error", data=None, message=str(exc), code=400))
+        return EnvelopeJSONResponse(status_code=400, content=_wrap_response("error", data=None, message=str(exc), code=400))
+    if isinstance(exc, ScheduleConflict):
+        return EnvelopeJSONResponse(status_code=409, content=_wrap_response("error", data=None, message=str(exc), code=409))
+    if isinstance(exc, FeatureUnavailable):
+        return EnvelopeJSONResponse(status_code=503, content=_wrap_response("error", data=None, message=str(exc), code=503))
 
     # Generic domain error
-    return JSONResponse(status_code=400, content=_wrap_response("error", data=None, message=str(exc), code=400))
-
-
-@app.middleware("http")
-async def wrap_response_middleware(request: Request, call_next):
-    """Middleware to wrap successful responses into a uniform structure.
-
-    If the response is already a JSON with our structure, return it unchanged. Otherwise,
-    put the original response body under `data` and set status="success".
-    """
-    response: Response = await call_next(request)
-
-    # For non-JSON responses or streaming, return as-is
-    if response.media_type != "application/json":
-        return response
-
-    try:
-        raw_body = b""
-        async for chunk in response.body_iterator:
-            raw_body += chunk
-    except Exception:
-        # response.body_iterator not always available; fall back to returning response
-        return response
-
-    # Recreate response content
-    import json
-
-    try:
-        payload = json.loads(raw_body)
-    except Exception:
-        return response
-
-    # If already wrapped (has keys status and data), return as-is
-    if isinstance(payload, dict) and "status" in payload and "data" in payload and "code" in payload:
-        return JSONResponse(status_code=response.status_code, content=payload)
-
-    wrapped = _wrap_response("success", data=payload, message=None, code=response.status_code)
-    return JSONResponse(status_code=response.status_code, content=wrapped)
+    return EnvelopeJSONResponse(status_code=400, content=_wrap_response("error", data=None, message=str(exc), code=400))
 
 
 @app.get("/health", tags=["system"])
 def health():
-    # Return already-wrapped response so middleware returns it unchanged
-    from fastapi.responses import JSONResponse
+    # Public and unauthenticated: pool and hasher internals are only exported on /metrics.
+    # Return already-wrapped content; the response class passes it through unchanged
+    return EnvelopeJSONResponse(status_code=200, content=_wrap_response("success", data={"status": "ok"}, message=None, code=200))
+
 
-    return JSONResponse(status_code=200, content=_wrap_response("success", data={"status": "ok"}, message=None, code=200))
+@app.get("/metrics", tags=["system"], include_in_schema=False)
+def prometheus_metrics():
+    if not settings.METRICS_ENABLED or metrics.prom is None:
+        raise FeatureUnavailable("Metrics are disabled or the 'prometheus_client' package is missing")
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+if settings.UPLOAD_STORAGE_BACKEND == "local":
+    # Serve images written by the local upload backend (offline / load-test setups)
+    from fastapi.staticfiles import StaticFiles
+
+    os.makedirs(settings.UPLOAD_LOCAL_DIR, exist_ok=True)
+    app.mount(settings.UPLOAD_LOCAL_BASE_URL, StaticFiles(directory=settings.UPLOAD_LOCAL_DIR), name="media")
+
 
 async def _load_settings_into_cache():
     async with AsyncSessionLocal() as session:
-        svc = SettingService(session)
-        items = await svc.get_all_settings()
-        cache = {item.key: item.value for item in items}
-        app.state.settings_cache = cache
+        await settings_cache.refresh(session, force=True)
 
 
 @app.on_event("startup")
@@ -150,5 +141,38 @@ async def startup_load_settings():
     try:
         await _load_settings_into_cache()
     except Exception:
-        # don't crash the app if DB unavailable at startup; initialize empty cache
-        app.state.settings_cache = {}
+        # don't crash the app if DB unavailable at startup; the cache loads on first use
+        pass
+    # drop the snapshot when another worker changes settings (no-op for the memory backend)
+    app.state.settings_listener = asyncio.create_task(settings_cache.run_listener())
+
+
+@app.on_event("startup")
+async def startup_session_warmer():
+    # Preload face candidates for sessions about to start (see app.utils.session_candidates)
+    app.state.session_warmer = asyncio.create_task(session_candidates.run_warmer(AsyncSessionLocal))
+
+
+@app.on_event("startup")
+async def startup_blob_replicator():
+    # Copy locally stored uploads to the remote provider in the background;
+    # every worker runs one and per-blob locks keep them from uploading twice
+    if settings.UPLOAD_STORAGE_BACKEND == "blob":
+        from app.utils.blob_store import get_blob_storage
+
+        app.state.blob_replicator = asyncio.create_task(get_blob_storage().replicator.run())
+
+
+@app.on_event("startup")
+async def startup_metrics_refresher():
+    # Keep pool/cache/hasher gauges of this worker current between scrapes
+    if settings.METRICS_ENABLED and metrics.prom is not None:
+        app.state.metrics_refresher = asyncio.create_task(metrics.run_refresher())
+
+
+@app.on_event("shutdown")
+async def shutdown_session_warmer():
+    for name in ("session_warmer", "settings_listener", "blob_replicator", "metrics_refresher"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
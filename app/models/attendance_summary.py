@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AttendanceOfferingSummary(Base):
+    """Attendance counts per (offering, student); maintained by AttendanceService writes."""
+    __tablename__ = "attendance_offering_summary"
+
+    offering_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    student_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    excused: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unmarked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
+
+
+class AttendanceSessionSummary(Base):
+    """Attendance counts per session; maintained by AttendanceService writes."""
+    __tablename__ = "attendance_session_summary"
+
+    session_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    excused: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unmarked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
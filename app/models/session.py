@@ -14,6 +14,9 @@ class Session(Base):
     global_id: Mapped[str] = mapped_column(default=lambda: str(uuid4()), unique=True, index=True, nullable=False)
     offering_id: Mapped[int] = mapped_column(nullable=False)
     room_id: Mapped[int] = mapped_column(nullable=False)
+    # Copy of course_offerings.instructor_id kept in sync by triggers
+    # (db/sql/005_session_exclusion.sql) for the instructor exclusion constraint; never written by the app
+    instructor_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     start_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     end_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     # Map to the Postgres ENUM type `session_status` defined in db/uams-v1.sql
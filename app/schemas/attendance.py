@@ -51,3 +51,33 @@ class AttendancesPage(BaseModel):
     prev_page: Optional[int] = None
 
     model_config = {"from_attributes": True}
+
+
+class AttendanceBulkResult(BaseModel):
+    index: int
+    result: str  # 'created', 'updated' or 'error'
+    attendance: Optional[AttendanceOut] = None
+    error: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class AttendanceCounts(BaseModel):
+    present: int = 0
+    late: int = 0
+    absent: int = 0
+    excused: int = 0
+    unmarked: int = 0
+    total: int = 0
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class AttendanceOfferingSummaryOut(AttendanceCounts):
+    offering_id: int
+    student_id: int
+
+
+class AttendanceSessionSummaryOut(AttendanceCounts):
+    session_id: int
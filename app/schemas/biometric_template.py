@@ -1,31 +1,52 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+import base64
+import binascii
+from typing import Optional, Union
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
 
+def _decode_base64_embedding(value):
+    """Accept the base64 text BiometricTemplateOut sends back, as it arrives in JSON.
+
+    pydantic serializes bytes with the URL-safe alphabet; the standard one is
+    accepted too.
+    """
+    if isinstance(value, str):
+        try:
+            return base64.b64decode(value.replace("-", "+").replace("_", "/"), validate=True)
+        except binascii.Error:
+            raise ValueError("embedding must be a list of floats or a base64-encoded blob")
+    return value
+
+
 class BiometricTemplateCreate(BaseModel):
     global_id: Optional[str] = None
     student_id: Optional[int] = None
-    embedding: Optional[bytes] = None
+    # a list of floats, or an already-encoded blob (UEMB or legacy raw float32),
+    # base64-encoded in JSON like BiometricTemplateOut.embedding
+    embedding: Optional[Union[list[float], bytes]] = None
     model: Optional[str] = None
     dimension: Optional[int] = None
     active: Optional[bool] = True
 
+    _embedding_base64 = field_validator("embedding", mode="before")(_decode_base64_embedding)
+
 
 class BiometricTemplateUpdate(BaseModel):
     student_id: Optional[int] = None
-    embedding: Optional[bytes] = None
+    embedding: Optional[Union[list[float], bytes]] = None
     model: Optional[str] = None
     dimension: Optional[int] = None
     active: Optional[bool] = True
 
+    _embedding_base64 = field_validator("embedding", mode="before")(_decode_base64_embedding)
+
 
-class BiometricTemplateOut(BaseModel):
+class BiometricTemplateSummaryOut(BaseModel):
+    """Template without its embedding; used by list endpoints unless ?include=embedding."""
     id: int
     global_id: str
     student_id: Optional[int] = None
-    # embedding as bytes may be large; returning as-is. Consider returning a URL instead.
-    embedding: Optional[bytes] = None
     model: Optional[str] = None
     dimension: Optional[int] = None
     active: Optional[bool] = True
@@ -35,6 +56,13 @@ class BiometricTemplateOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BiometricTemplateOut(BiometricTemplateSummaryOut):
+    # stored blob (see app.utils.embedding), base64-encoded in JSON
+    embedding: Optional[bytes] = None
+
+    model_config = {"from_attributes": True, "ser_json_bytes": "base64"}
+
+
 class BiometricTemplatesPage(BaseModel):
     items: list[BiometricTemplateOut]
     total: int
@@ -46,6 +74,21 @@ class BiometricTemplatesPage(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class BiometricMatchRequest(BaseModel):
+    embedding: list[float] = Field(..., min_length=1)
+    model: Optional[str] = None
+    top_k: int = Field(1, ge=1, le=50)
+    min_similarity: Optional[float] = Field(None, ge=-1, le=1)
+
+
+class BiometricMatchOut(BaseModel):
+    student_id: Optional[int] = None
+    template_id: int
+    similarity: float
+
+    model_config = {"from_attributes": True}
+
+
 class ActiveUpdate(BaseModel):
     value: int = Field(..., ge=0, le=1, description="0=inactive,1=active")
     model_config = {"from_attributes": True}
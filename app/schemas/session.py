@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime, time
 
 
 class SessionCreate(BaseModel):
@@ -48,6 +48,51 @@ class SessionsPage(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class RecurrenceRule(BaseModel):
+    freq: Literal["daily", "weekly"] = "weekly"
+    interval: int = Field(1, ge=1, le=52, description="every N days/weeks")
+    # weekly only; defaults to the weekday of start_date
+    weekdays: list[int] = Field(default_factory=list, description="0=Monday..6=Sunday")
+    count: Optional[int] = Field(None, ge=1, description="stop after this many occurrences")
+    exclude_dates: list[date] = Field(default_factory=list, description="holidays / skipped days")
+
+
+class SessionGenerateRequest(BaseModel):
+    offering_id: int
+    # defaults to the offering's room
+    room_id: Optional[int] = None
+    # term date range (inclusive)
+    start_date: date
+    end_date: date
+    rule: RecurrenceRule = Field(default_factory=RecurrenceRule)
+    # wall-clock class times; default to the offering's start_time/end_time
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    # IANA zone the times are in; defaults to SCHEDULE_TIMEZONE
+    timezone: Optional[str] = None
+    status: Optional[str] = "planned"
+    # reject: create nothing if any session conflicts; skip: create the rest
+    on_conflict: Literal["reject", "skip"] = "reject"
+    dry_run: bool = False
+
+
+class SessionConflict(BaseModel):
+    index: int
+    start_datetime: datetime
+    end_datetime: datetime
+    kind: str  # 'room', 'instructor' or 'batch' (overlaps another generated session)
+    session_id: Optional[str] = None  # global_id of the existing session it clashes with
+
+
+class SessionGenerateOut(BaseModel):
+    planned: int
+    created: list[SessionOut]
+    conflicts: list[SessionConflict]
+    dry_run: bool = False
+
+    model_config = {"from_attributes": True}
+
+
 class ActiveUpdate(BaseModel):
     value: int = Field(..., ge=0, le=1, description="0=inactive,1=active")
     model_config = {"from_attributes": True}
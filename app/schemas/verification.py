@@ -53,6 +53,13 @@ class VerificationsPage(BaseModel):
 
     model_config = {"from_attributes": True}
 
+class VerificationVerifyRequest(BaseModel):
+    session_id: int
+    embedding: list[float] = Field(..., min_length=1)
+    liveness_score: Optional[float] = None
+    captured_image_url: Optional[str] = None
+
+
 class ActiveUpdate(BaseModel):
     value: int = Field(..., ge=0, le=1, description="0=inactive,1=active")
     model_config = {"from_attributes": True}
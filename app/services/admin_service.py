@@ -5,13 +5,11 @@ from app.models.admin import Admin
 from app.schemas.admin import AdminCreate, AdminUpdate
 from app.core.errors import DuplicateEmail, NotFound
 from app.core.errors import InvalidPasswordLength
-from passlib.context import CryptContext
+from app.utils.passwords import hash_password, verify_password
 from app.services.base_service import BaseService
 import logging
 from uuid import uuid4
 
-_pwd = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
-
 
 class AdminService(BaseService):
     """Business logic for admins. No FastAPI imports here."""
@@ -61,7 +59,7 @@ class AdminService(BaseService):
                 prefix,
             )
             try:
-                admin.hashed_password = _pwd.hash(payload.password)
+                admin.hashed_password = await hash_password(payload.password)
             except ValueError:
                 # passlib/bcrypt raised password-too-long or backend error
                 raise InvalidPasswordLength(
@@ -77,7 +75,7 @@ class AdminService(BaseService):
         if not admin:
             return None
         try:
-            if _pwd.verify(password, admin.hashed_password):
+            if await verify_password(password, admin.hashed_password):
                 return admin
         except ValueError:
             # treat hashing/verification errors as authentication failure
@@ -101,7 +99,7 @@ class AdminService(BaseService):
             if not (8 <= len(payload.password) <= 32):
                 raise InvalidPasswordLength("Password must be between 8 and 32 characters")
             try:
-                admin.hashed_password = _pwd.hash(payload.password)
+                admin.hashed_password = await hash_password(payload.password)
             except ValueError:
                 raise InvalidPasswordLength(
                     "Password too long or invalid for the hasher; must be <= 72 bytes when encoded in UTF-8"
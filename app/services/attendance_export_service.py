@@ -0,0 +1,154 @@
+import csv
+import io
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from sqlalchemy import and_, select
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.core.errors import FeatureUnavailable
+from app.db.session import AsyncSessionLocal, ReadSessionLocal
+from app.models.attendance import Attendance
+from app.models.course_offering import CourseOffering
+from app.models.enrollment import Enrollment
+from app.models.session import Session
+from app.models.student import Student
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+
+# (column name, SQL expression, parquet type name)
+_COLUMNS = (
+    ("attendance_id", Attendance.global_id, "string"),
+    ("session_id", Session.global_id, "string"),
+    ("session_start", Session.start_datetime, "timestamp"),
+    ("session_end", Session.end_datetime, "timestamp"),
+    ("offering_id", CourseOffering.global_id, "string"),
+    ("term_id", CourseOffering.term_id, "int"),
+    ("group_id", CourseOffering.group_id, "int"),
+    ("student_id", Student.global_id, "string"),
+    ("student_code", Student.student_code, "string"),
+    ("first_name", Student.first_name, "string"),
+    ("last_name", Student.last_name, "string"),
+    ("status", Attendance.status, "string"),
+    ("method", Attendance.method, "string"),
+    ("checkin_time", Attendance.checkin_time, "timestamp"),
+    ("remarks", Attendance.remarks, "string"),
+    ("active", Attendance.active, "int"),
+    ("enrollment_status", Enrollment.status, "int"),
+    ("dropped_at", Enrollment.dropped_at, "timestamp"),
+)
+COLUMN_NAMES = tuple(name for name, _, _ in _COLUMNS)
+
+
+class _ChunkSink:
+    """Write-only file object for ParquetWriter that hands out what was written so far.
+
+    `tell()` keeps counting across drains so the footer offsets stay correct.
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+class AttendanceExportService:
+    """Stream attendance for a term, offering or group as CSV or Parquet.
+
+    Rows come from a server-side cursor (`yield_per`) in batches of
+    `EXPORT_BATCH_ROWS` and each batch is encoded and yielded before the
+    next is fetched, so memory stays flat however large the export is. The
+    stream opens its own DB session because it outlives the request's
+    dependency-scoped one; with `replica` set that session is on the read
+    replica.
+    """
+
+    formats = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+    def __init__(self, db, replica: bool = False) -> None:
+        self.db = db
+        self.replica = replica
+
+    def query(self, term_id: Optional[int] = None, offering_id: Optional[int] = None, group_id: Optional[int] = None) -> Select:
+        stmt = (
+            select(*(expr.label(name) for name, expr, _ in _COLUMNS))
+            .select_from(Attendance)
+            .join(Session, Session.id == Attendance.session_id)
+            .join(CourseOffering, CourseOffering.id == Session.offering_id)
+            .outerjoin(Enrollment, and_(Enrollment.offering_id == Session.offering_id, Enrollment.student_id == Attendance.student_id))
+            .outerjoin(Student, Student.id == Attendance.student_id)
+            .where(Attendance.active != 2)
+        )
+        if term_id is not None:
+            stmt = stmt.where(CourseOffering.term_id == term_id)
+        if offering_id is not None:
+            stmt = stmt.where(Session.offering_id == offering_id)
+        if group_id is not None:
+            stmt = stmt.where(CourseOffering.group_id == group_id)
+        return stmt.order_by(Session.start_datetime, Session.id, Attendance.id)
+
+    def check_format(self, fmt: str) -> None:
+        if fmt == "parquet" and pa is None:
+            raise FeatureUnavailable("Parquet export requires the 'pyarrow' package")
+
+    async def _batches(self, stmt: Select) -> AsyncIterator[Sequence[Any]]:
+        batch = settings.EXPORT_BATCH_ROWS
+        async with (ReadSessionLocal if self.replica else AsyncSessionLocal)() as db:
+            result = await db.stream(stmt.execution_options(yield_per=batch))
+            async for rows in result.partitions(batch):
+                yield rows
+
+    async def csv_chunks(self, stmt: Select) -> AsyncIterator[bytes]:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(COLUMN_NAMES)
+        async for rows in self._batches(stmt):
+            writer.writerows(rows)
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+        if buf.tell():
+            yield buf.getvalue().encode("utf-8")
+
+    def _arrow_schema(self):
+        types = {"string": pa.string(), "int": pa.int64(), "timestamp": pa.timestamp("us", tz="UTC")}
+        return pa.schema([(name, types[kind]) for name, _, kind in _COLUMNS])
+
+    async def parquet_chunks(self, stmt: Select) -> AsyncIterator[bytes]:
+        schema = self._arrow_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        try:
+            async for rows in self._batches(stmt):
+                # one row group per batch
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays([pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def chunks(self, stmt: Select, fmt: str) -> AsyncIterator[bytes]:
+        return self.parquet_chunks(stmt) if fmt == "parquet" else self.csv_chunks(stmt)
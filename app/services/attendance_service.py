@@ -1,34 +1,161 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import func
 from app.services.base_service import BaseService
 from app.models.attendance import Attendance
 from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
+from app.services.attendance_summary_service import AttendanceState, AttendanceSummaryService
 
 
 class AttendanceService(BaseService):
     model = Attendance
+    # attendance is the largest table; admin grids page through it unfiltered
+    # (all statuses), so report the planner estimate there instead of an exact count
+    default_total_mode = "estimate"
 
     def __init__(self, db: AsyncSession) -> None:
         super().__init__(db)
+        self.summary = AttendanceSummaryService(db)
+
+    def write_snapshot(self, row: Attendance) -> AttendanceState:
+        return AttendanceState.of(row)
+
+    async def before_commit(self, row: Attendance, previous: Optional[AttendanceState]) -> None:
+        # keep the summary tables in the same transaction as the attendance write
+        await self.summary.apply([(previous, AttendanceState.of(row))])
+
+    async def _lock(self, global_id: str) -> None:
+        """Lock the row (and refresh it) so its summary delta is computed from the committed state."""
+        q = select(self.model).where(self.model.global_id == global_id).with_for_update().execution_options(populate_existing=True)
+        await self.db.scalar(q)
+
+    async def _locked_states(self, keys) -> Dict[Tuple[int, int], AttendanceState]:
+        """Lock the rows of the given (session_id, student_id) keys and return their states."""
+        Model = self.get_model()
+        q = select(Model.session_id, Model.student_id, Model.status, Model.active).where(
+            tuple_(Model.session_id, Model.student_id).in_(sorted(keys))
+        ).order_by(Model.id).with_for_update()
+        return {(row.session_id, row.student_id): AttendanceState(*row) for row in (await self.db.execute(q)).all()}
 
     async def create(self, payload: AttendanceCreate) -> Attendance:
-        data = payload.dict(exclude_unset=True)
+        data = payload.model_dump(exclude_unset=True)
         # require client to pass exact enum values ('face', 'qr', 'manual')
         session_id = data.get("session_id")
         student_id = data.get("student_id")
         if session_id and student_id:
             q = select(self.model).where((self.model.session_id == session_id) & (self.model.student_id == student_id) & (self.model.active == 1)).limit(1)
-            existing = await self.db.scalar(q)
+            existing = await self.db.scalar(q.with_for_update().execution_options(populate_existing=True))
             if existing:
-                return await super().update_by_global_id(existing.global_id, AttendanceUpdate(**data))
+                return await super().update_by_global_id(existing.global_id, data)
 
         return await super().create(data)
 
     async def update_by_global_id(self, global_id: str, payload: AttendanceUpdate) -> Attendance:
-        if hasattr(payload, "dict"):
-            data = payload.dict(exclude_unset=True)
+        if hasattr(payload, "model_dump"):
+            data = payload.model_dump(exclude_unset=True)
         else:
             data = dict(payload or {})
         # do not alter 'method' value; require exact enum strings
+        await self._lock(global_id)
         return await super().update_by_global_id(global_id, data)
+
+    async def set_status_by_global_id(self, global_id: str, value: int) -> Attendance:
+        await self._lock(global_id)
+        return await super().set_status_by_global_id(global_id, value)
+
+    async def bulk_upsert(self, payloads: Sequence[AttendanceCreate]) -> List[Tuple[Optional[Attendance], str, Optional[str]]]:
+        """Insert or update many check-ins with one or two statements per column set.
+
+        Uses `INSERT ... ON CONFLICT (session_id, student_id) DO UPDATE`
+        against `uq_att_unique`; only the fields an item actually sent are
+        overwritten on conflict. Deleted rows (active = 2) are left alone and
+        reported as errors. When the same (session_id, student_id) appears
+        more than once, the last item wins. Existing rows are locked first so
+        the summary tables get exact deltas in the same transaction; new keys
+        are inserted with DO NOTHING, and those a concurrent request inserted
+        meanwhile are locked and read before being updated.
+
+        Returns one `(row, result, error)` per payload, in order, where
+        result is 'created', 'updated' or 'error'.
+        """
+        Model = self.get_model()
+        results: List[Tuple[Optional[Attendance], str, Optional[str]]] = [(None, "error", None)] * len(payloads)
+        status_values = set(Model.status.type.enums)
+        method_values = set(Model.method.type.enums)
+
+        keys: List[Optional[Tuple[int, int]]] = [None] * len(payloads)
+        dumps: List[Dict[str, Any]] = [payload.model_dump(exclude_unset=True) for payload in payloads]
+        latest: Dict[Tuple[int, int], int] = {}
+        for i, data in enumerate(dumps):
+            if not data.get("session_id") or not data.get("student_id"):
+                results[i] = (None, "error", "session_id and student_id are required")
+            elif data.get("status") is not None and data["status"] not in status_values:
+                results[i] = (None, "error", f"invalid status '{data['status']}'")
+            elif data.get("method") is not None and data["method"] not in method_values:
+                results[i] = (None, "error", f"invalid method '{data['method']}'")
+            else:
+                keys[i] = (data["session_id"], data["student_id"])
+                latest[keys[i]] = i
+
+        # one statement per distinct set of provided columns (normally just one)
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for i in latest.values():
+            groups.setdefault(tuple(sorted(dumps[i])), []).append(dict(dumps[i], global_id=str(uuid4())))
+
+        by_key: Dict[Tuple[int, int], Tuple[Attendance, bool]] = {}
+        try:
+            previous = await self._locked_states(latest) if latest else {}
+            # Keys without a row are inserted with DO NOTHING first: a concurrent
+            # request may insert the same key after the read above, and that
+            # row's state must be read before this transaction overwrites it.
+            for values in groups.values():
+                fresh = [v for v in values if (v["session_id"], v["student_id"]) not in previous]
+                if not fresh:
+                    continue
+                stmt = pg_insert(Model).values(fresh).on_conflict_do_nothing(
+                    index_elements=[Model.session_id, Model.student_id]
+                ).returning(Model)
+                rows = await self.db.execute(stmt, execution_options={"populate_existing": True})
+                for obj in rows.scalars().all():
+                    by_key[(obj.session_id, obj.student_id)] = (obj, True)
+            raced = [key for key in latest if key not in previous and key not in by_key]
+            if raced:
+                previous.update(await self._locked_states(raced))
+            for cols, values in groups.items():
+                existing = [v for v in values if (v["session_id"], v["student_id"]) in previous]
+                if not existing:
+                    continue
+                stmt = pg_insert(Model).values(existing)
+                update_cols = {c: stmt.excluded[c] for c in cols if c not in ("session_id", "student_id")}
+                update_cols["updated_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Model.session_id, Model.student_id],
+                    set_=update_cols,
+                    where=Model.active != 2,
+                ).returning(Model, literal_column("xmax = 0").label("inserted"))
+                rows = await self.db.execute(stmt, execution_options={"populate_existing": True})
+                for obj, inserted in rows.all():
+                    by_key[(obj.session_id, obj.student_id)] = (obj, bool(inserted))
+            await self.summary.apply(
+                (None if inserted else previous[key], AttendanceState.of(obj)) for key, (obj, inserted) in by_key.items()
+            )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            hit = by_key.get(key)
+            if hit is None:
+                results[i] = (None, "error", "attendance record was deleted")
+            elif i != latest[key]:
+                # superseded by a later item for the same session/student
+                results[i] = (hit[0], "updated", None)
+            else:
+                results[i] = (hit[0], "created" if hit[1] else "updated", None)
+        return results
@@ -0,0 +1,141 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import func
+from app.models.attendance import Attendance
+from app.models.attendance_summary import AttendanceOfferingSummary, AttendanceSessionSummary
+from app.models.session import Session
+
+COUNTERS = ("present", "late", "absent", "excused", "unmarked", "total")
+
+
+class AttendanceState(NamedTuple):
+    """The columns of an attendance row that decide what it contributes to the summaries."""
+    session_id: Optional[int]
+    student_id: Optional[int]
+    status: Optional[str]
+    active: Optional[int]
+
+    @classmethod
+    def of(cls, row: Any) -> "AttendanceState":
+        return cls(row.session_id, row.student_id, row.status, row.active)
+
+    @property
+    def counted(self) -> bool:
+        # rows not yet flushed have active=None and get the default of 1
+        return bool(self.session_id and self.student_id) and (self.active is None or self.active == 1)
+
+
+def _bucket(status: Optional[str]) -> str:
+    return status if status in COUNTERS else "unmarked"
+
+
+class AttendanceSummaryService:
+    """Incrementally maintained attendance counts.
+
+    Callers pass (before, after) states for every attendance row they
+    write, inside their own transaction and before committing. Deltas are
+    applied with `INSERT ... ON CONFLICT DO UPDATE SET n = n + excluded.n`,
+    so concurrent writers for the same offering/session serialize on the
+    summary row rather than overwrite each other. The rebuild query lives
+    in db/sql/004_attendance_summary.sql.
+
+    Offering totals are keyed by the session's offering at write time, so
+    SessionService calls `move_session` when a session changes offering;
+    writers read that offering under FOR SHARE to serialize with the move.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def apply(self, changes: Iterable[Tuple[Optional[AttendanceState], Optional[AttendanceState]]]) -> None:
+        per_session: Dict[int, Dict[str, int]] = {}
+        per_student: Dict[Tuple[int, int], Dict[str, int]] = {}
+        for before, after in changes:
+            if before == after:
+                continue
+            for state, sign in ((before, -1), (after, 1)):
+                if state is None or not state.counted:
+                    continue
+                for key, target in ((state.session_id, per_session), ((state.session_id, state.student_id), per_student)):
+                    delta = target.setdefault(key, dict.fromkeys(COUNTERS, 0))
+                    delta[_bucket(state.status)] += sign
+                    delta["total"] += sign
+        per_session = {k: v for k, v in per_session.items() if any(v.values())}
+        per_student = {k: v for k, v in per_student.items() if any(v.values())}
+        if not per_session and not per_student:
+            return
+
+        offering_of = dict((await self.db.execute(
+            select(Session.id, Session.offering_id)
+            .where(Session.id.in_({sid for sid, _ in per_student}))
+            .with_for_update(read=True)
+        )).all()) if per_student else {}
+        per_offering: Dict[Tuple[int, int], Dict[str, int]] = {}
+        for (session_id, student_id), delta in per_student.items():
+            offering_id = offering_of.get(session_id)
+            if offering_id is None:
+                continue
+            total = per_offering.setdefault((offering_id, student_id), dict.fromkeys(COUNTERS, 0))
+            for name, n in delta.items():
+                total[name] += n
+
+        if per_session:
+            await self._upsert(AttendanceSessionSummary, ["session_id"], [dict(delta, session_id=k) for k, delta in sorted(per_session.items())])
+        if per_offering:
+            await self._upsert(
+                AttendanceOfferingSummary,
+                ["offering_id", "student_id"],
+                [dict(delta, offering_id=k[0], student_id=k[1]) for k, delta in sorted(per_offering.items())],
+            )
+
+    async def move_session(self, session_id: int, old_offering_id: Optional[int], new_offering_id: Optional[int]) -> None:
+        """Move a session's per-student counts from its old offering to its new one.
+
+        Call after the session's UPDATE is flushed: the row lock makes
+        concurrent attendance writers wait, so the counts read here are final.
+        """
+        if old_offering_id == new_offering_id:
+            return
+        A = Attendance
+        rows = (await self.db.execute(
+            select(A.student_id, A.status, func.count())
+            .where(A.session_id == session_id, A.active == 1, A.student_id.is_not(None))
+            .group_by(A.student_id, A.status)
+        )).all()
+        per_student: Dict[int, Dict[str, int]] = {}
+        for student_id, status, n in rows:
+            delta = per_student.setdefault(student_id, dict.fromkeys(COUNTERS, 0))
+            delta[_bucket(status)] += n
+            delta["total"] += n
+        values = []
+        for student_id, delta in per_student.items():
+            if old_offering_id is not None:
+                values.append(dict({k: -n for k, n in delta.items()}, offering_id=old_offering_id, student_id=student_id))
+            if new_offering_id is not None:
+                values.append(dict(delta, offering_id=new_offering_id, student_id=student_id))
+        if values:
+            values.sort(key=lambda v: (v["offering_id"], v["student_id"]))
+            await self._upsert(AttendanceOfferingSummary, ["offering_id", "student_id"], values)
+
+    async def _upsert(self, Model, keys: List[str], values: List[Dict[str, int]]) -> None:
+        # rows are sorted by key so concurrent writers lock summary rows in the same order
+        stmt = pg_insert(Model).values(values)
+        set_ = {name: getattr(Model, name) + stmt.excluded[name] for name in COUNTERS}
+        set_["updated_at"] = func.now()
+        await self.db.execute(stmt.on_conflict_do_update(index_elements=[getattr(Model, k) for k in keys], set_=set_))
+
+    async def for_offering(self, offering_id: int) -> List[AttendanceOfferingSummary]:
+        q = (
+            select(AttendanceOfferingSummary)
+            .where(AttendanceOfferingSummary.offering_id == offering_id, AttendanceOfferingSummary.total > 0)
+            .order_by(AttendanceOfferingSummary.student_id)
+        )
+        return list((await self.db.scalars(q)).all())
+
+    async def for_offering_student(self, offering_id: int, student_id: int) -> Optional[AttendanceOfferingSummary]:
+        return await self.db.get(AttendanceOfferingSummary, (offering_id, student_id))
+
+    async def for_session(self, session_id: int) -> Optional[AttendanceSessionSummary]:
+        return await self.db.get(AttendanceSessionSummary, session_id)
@@ -1,14 +1,203 @@
-from typing import Any, Dict, Optional, Sequence, List, Tuple
+from typing import Any, Dict, Optional, Sequence, List, Tuple, NamedTuple
 import re
+import json
+import base64
+from decimal import Decimal
+from functools import lru_cache, wraps
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, text, String, cast
+from sqlalchemy import select, func, or_, and_, text, String, Enum, cast, bindparam
 from sqlalchemy.orm import joinedload
-from app.core.errors import NotFound
-from datetime import datetime, timezone
+from app.core.errors import NotFound, InvalidCursor
+from datetime import date, datetime, timezone
 from typing import Iterable, Set
 from starlette.requests import Request
-from app.utils.jwt_utils import decode_access_token
+from app.utils.jwt_utils import get_request_claims
 from app.core.config import settings
+from app.db.session import replica_allowed, replica_reads
+
+
+# python types a keyset cursor can carry; datetime is covered by date
+_CURSOR_TYPES = (bool, int, float, str, Decimal, date)
+
+
+def _cursor_type(attr) -> Optional[type]:
+    """Python type of a column attribute `_encode_cursor` can round-trip, else None."""
+    try:
+        python_type = attr.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+    return python_type if issubclass(python_type, _CURSOR_TYPES) else None
+
+
+def _encode_cursor(sort_key: str, descending: bool, sort_value: Any, row_id: int) -> str:
+    """Encode the last row's (sort value, id) pair, and the ordering it came from, into an opaque url-safe token."""
+    if isinstance(sort_value, datetime):
+        val, kind = sort_value.isoformat(), "dt"
+    elif isinstance(sort_value, date):
+        val, kind = sort_value.isoformat(), "d"
+    elif isinstance(sort_value, Decimal):
+        val, kind = str(sort_value), "dec"
+    else:
+        val, kind = sort_value, None
+    data = {"k": sort_key, "d": "desc" if descending else "asc", "v": val, "t": kind, "id": row_id}
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(token: str, sort_key: str, descending: bool, value_type: Optional[type] = None) -> Tuple[Any, int]:
+    """Inverse of `_encode_cursor`.
+
+    Raises InvalidCursor on malformed input, or when the token was issued
+    for another sort key / direction or carries a value not of `value_type`.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, direction = data["k"], data["d"]
+        val, kind, row_id = data.get("v"), data.get("t"), int(data["id"])
+        if val is not None:
+            if kind == "dt":
+                val = datetime.fromisoformat(val)
+            elif kind == "d":
+                val = date.fromisoformat(val)
+            elif kind == "dec":
+                val = Decimal(val)
+    except Exception:
+        raise InvalidCursor("Invalid pagination cursor")
+    if key != sort_key or direction != ("desc" if descending else "asc"):
+        raise InvalidCursor("Pagination cursor was issued for a different sort_by/sort_dir")
+    if val is not None and value_type is not None and not isinstance(val, value_type):
+        raise InvalidCursor("Invalid pagination cursor")
+    return val, row_id
+
+
+_CSV_INT_RE = re.compile(r"\d+(,\d+)*")
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _normalize_filter_value(val: Any) -> Any:
+    """Turn numeric CSV strings into int / list[int] so they don't hit ILIKE."""
+    if isinstance(val, str):
+        s = val.strip()
+        if _CSV_INT_RE.fullmatch(s):
+            if "," in s:
+                return [int(p) for p in s.split(",")]
+            return int(s)
+    return val
+
+
+def _filter_kind(val: Any) -> str:
+    if isinstance(val, str):
+        return "ilike"
+    if isinstance(val, (list, tuple, set)):
+        return "in"
+    return "eq"
+
+
+def _text_match(col_attr, pattern):
+    """ILIKE on text columns; cast numeric/enum/date columns to text first."""
+    col_type = getattr(col_attr, "type", None)
+    if isinstance(col_type, String) and not isinstance(col_type, Enum):
+        return col_attr.ilike(pattern)
+    return cast(col_attr, String).ilike(pattern)
+
+
+def _replica_read(fn):
+    """Run a read-only service method on the replica when the request allows it."""
+
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        with replica_reads(self.db, replica_allowed(getattr(self, "request", None))):
+            return await fn(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _FilterPlan(NamedTuple):
+    """WHERE clauses compiled for one (model, filter shape), values left unbound."""
+
+    select_stmt: Any
+    count_stmt: Any
+    # (bind name, filter key, kind) for every filter that made it into the plan
+    binds: Tuple[Tuple[str, str, str], ...]
+
+
+@lru_cache(maxsize=1024)
+def _compile_filter_plan(
+    Model,
+    status_column: str,
+    filter_shape: Tuple[Tuple[str, str], ...],
+    q_columns: Tuple[str, ...],
+    date_col: Optional[str],
+    has_from: bool,
+    has_to: bool,
+) -> _FilterPlan:
+    """Build the SELECT / COUNT templates for a filter shape.
+
+    `filter_shape` is a tuple of (filter key, kind) pairs; only the shape is
+    part of the cache key, the actual values are supplied as bind parameters
+    at execution time. Unknown columns and relation filters whose names are
+    not plain identifiers are dropped here once instead of on every request.
+    """
+    where_clauses = []
+    binds = []
+    for i, (col, kind) in enumerate(filter_shape):
+        name = f"f_{i}"
+        if "." in col:
+            # relation filter
+            rel, rel_col = col.split(".", 1)
+            if not (_IDENT_RE.fullmatch(rel) and _IDENT_RE.fullmatch(rel_col)):
+                continue
+            # use exists/select via text to avoid complex generic joins here
+            if kind == "in":
+                clause = text(f"EXISTS(SELECT 1 FROM {rel} WHERE {rel}.id = {Model.__tablename__}.{rel}_id AND {rel}.{rel_col} IN :{name})")
+                clause = clause.bindparams(bindparam(name, expanding=True))
+            else:
+                clause = text(f"EXISTS(SELECT 1 FROM {rel} WHERE {rel}.id = {Model.__tablename__}.{rel}_id AND {rel}.{rel_col} = :{name})")
+                # the clause compares with "=", so strings are bound as-is, not as an ILIKE pattern
+                kind = "eq"
+            where_clauses.append(clause)
+        else:
+            if not hasattr(Model, col):
+                continue
+            col_attr = getattr(Model, col)
+            if kind == "ilike":
+                where_clauses.append(_text_match(col_attr, bindparam(name, type_=String)))
+            elif kind == "in":
+                where_clauses.append(col_attr.in_(bindparam(name, expanding=True)))
+            else:
+                where_clauses.append(col_attr == bindparam(name))
+        binds.append((name, col, kind))
+
+    # date range (apply to selectable date column, default created_at)
+    if date_col and hasattr(Model, date_col):
+        date_attr = getattr(Model, date_col)
+        if has_from:
+            where_clauses.append(date_attr >= bindparam("date_from"))
+        if has_to:
+            where_clauses.append(date_attr <= bindparam("date_to"))
+
+    or_exprs = []
+    for col in q_columns:
+        if "." in col:
+            # skip relation columns in free-text search for simplicity
+            continue
+        if not hasattr(Model, col):
+            continue
+        or_exprs.append(_text_match(getattr(Model, col), bindparam("q_term", type_=String)))
+    if or_exprs:
+        where_clauses.append(or_(*or_exprs))
+
+    # Always exclude deleted rows (status == 2).
+    if hasattr(Model, status_column):
+        where_clauses.append(getattr(Model, status_column) != 2)
+
+    select_stmt = select(Model)
+    count_stmt = select(func.count()).select_from(Model)
+    if where_clauses:
+        select_stmt = select_stmt.where(and_(*where_clauses))
+        count_stmt = count_stmt.where(and_(*where_clauses))
+    return _FilterPlan(select_stmt, count_stmt, tuple(binds))
 
 
 class BaseService:
@@ -20,6 +209,12 @@ class BaseService:
 
     model = None  # override in subclass
     status_column = "active"
+    # How list(page=...) computes `total`: "exact" (count(*) OVER() in the page
+    # query) or "estimate" (pg_class.reltuples when the listing is unfiltered).
+    # Overridable per request with ?total=exact|estimate.
+    default_total_mode = "exact"
+    # Estimates below this row count are replaced by an exact count.
+    estimate_total_min_rows = 100_000
 
     def __init__(self, db: AsyncSession, request: Optional[Request] = None) -> None:
         self.db = db
@@ -40,15 +235,9 @@ class BaseService:
         """
         if not hasattr(self, "request") or self.request is None:
             return False
-        auth = self.request.headers.get("Authorization")
-        if not auth:
-            return False
-        parts = auth.split()
-        if len(parts) != 2 or parts[0].lower() != "bearer":
-            return False
-        token = parts[1]
         try:
-            payload = decode_access_token(token, settings.JWT_PRIVATE)
+            # shares the claims verified by the route guard for this request
+            payload = get_request_claims(self.request, settings.JWT_PRIVATE)
         except Exception:
             return False
         role = payload.get("role") if isinstance(payload, dict) else None
@@ -103,6 +292,7 @@ class BaseService:
 
         instance = Model(**data)
         self.db.add(instance)
+        await self.before_commit(instance, None)
         await self.db.commit()
         await self.db.refresh(instance)
         return instance
@@ -127,13 +317,27 @@ class BaseService:
         else:
             data = dict(payload or {})
 
+        previous = self.write_snapshot(row)
         for k, v in data.items():
             if hasattr(row, k):
                 setattr(row, k, v)
+        await self.before_commit(row, previous)
         await self.db.commit()
         await self.db.refresh(row)
         return row
 
+    def write_snapshot(self, row) -> Any:
+        """State captured before an update/status change and passed to `before_commit`; none by default."""
+        return None
+
+    async def before_commit(self, row, previous: Any) -> None:
+        """Hook run after create/update/status changes are applied, in the same transaction.
+
+        `previous` is `write_snapshot(row)` from before the change (None on create).
+        """
+        return None
+
+    @_replica_read
     async def get_by_global_id(self, global_id: str):
         Model = self.get_model()
         q = select(Model).where(getattr(Model, "global_id") == global_id)
@@ -159,7 +363,9 @@ class BaseService:
         row = await self.db.scalar(q)
         if not row:
             raise NotFound(f"{Model.__name__} not found")
+        previous = self.write_snapshot(row)
         setattr(row, self.status_column, int(value))
+        await self.before_commit(row, previous)
         await self.db.commit()
         await self.db.refresh(row)
         return row
@@ -172,6 +378,10 @@ class BaseService:
         """
         return await self.set_status_by_global_id(global_id, 2)
 
+    def list_load_options(self) -> List[Any]:
+        """Loader options (e.g. `defer(...)`) applied to list queries; none by default."""
+        return []
+
     def _ms_to_dt(self, val: Optional[int]) -> Optional[datetime]:
         if val is None:
             return None
@@ -181,6 +391,60 @@ class BaseService:
         except Exception:
             return None
 
+    def _filter_plan(
+        self,
+        q: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        date_from_ms: Optional[int] = None,
+        date_to_ms: Optional[int] = None,
+        date_col: Optional[str] = "created_at",
+    ) -> Tuple[_FilterPlan, Dict[str, Any]]:
+        """Return the cached filter plan shared by list() and count() plus its bind values.
+
+        Filters with string values perform ILIKE partial match, numeric CSV
+        strings become equality / IN, and "rel.column" keys become EXISTS
+        subqueries comparing the raw value. Deleted rows (status == 2) are always excluded.
+        """
+        normalized = {col: _normalize_filter_value(val) for col, val in (filters or {}).items()}
+        shape = tuple((col, _filter_kind(val)) for col, val in normalized.items())
+        dt_from = self._ms_to_dt(date_from_ms)
+        dt_to = self._ms_to_dt(date_to_ms)
+        q_columns = tuple(columns) if q and columns else ()
+        plan = _compile_filter_plan(
+            self.get_model(), self.status_column, shape, q_columns, date_col, dt_from is not None, dt_to is not None
+        )
+
+        params: Dict[str, Any] = {}
+        for name, col, kind in plan.binds:
+            val = normalized[col]
+            if kind == "ilike":
+                params[name] = f"%{val}%"
+            elif kind == "in":
+                params[name] = list(val)
+            else:
+                params[name] = val
+        if dt_from is not None:
+            params["date_from"] = dt_from
+        if dt_to is not None:
+            params["date_to"] = dt_to
+        if q_columns:
+            params["q_term"] = f"%{q}%"
+        return plan, params
+
+    def _is_unfiltered(self, filters, q, columns, date_from_ms, date_to_ms) -> bool:
+        """True when the listing covers every status, so the table estimate is an upper bound of it.
+
+        A status filter (including the implicit active == 1 for non-admins)
+        disqualifies the estimate: inactive and deleted rows would be counted.
+        """
+        if q and columns:
+            return False
+        if date_from_ms is not None or date_to_ms is not None:
+            return False
+        return not filters
+
+    @_replica_read
     async def list(
         self,
         skip: int = 0,
@@ -196,12 +460,26 @@ class BaseService:
         with_relations: Optional[List[str]] = None,
         with_count: Optional[List[str]] = None,
         page: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: Optional[bool] = None,
+        total_mode: Optional[str] = None,
     ) -> Sequence[Any]:
         """Return rows matching filters and pagination.
 
         Supports simple q search, filters, dot-path relation filters
         (e.g. "rel.column"), sorting and date range on created_at.
         Filters with string values perform ILIKE partial match.
+
+        When `cursor` is given (an empty string requests the first page) keyset
+        pagination is used instead of OFFSET: rows are sought after the last
+        `(sort_col, id)` pair and the payload carries `next_cursor`. The total
+        is only counted when `with_total` is truthy.
+
+        Page payloads get their total from `count(*) OVER()` in the same query;
+        with `total_mode="estimate"` a listing filtered by nothing, not even
+        status, reports the planner estimate instead and sets
+        `total_is_estimate`. The estimate also counts deleted rows, so it is an
+        upper bound.
         """
         # If controller attached a Request to this service instance, prefer
         # reading pagination / filter args from it when the caller did not
@@ -222,6 +500,13 @@ class BaseService:
             q = qp.get("q") or q
             sort_by = qp.get("sort_by") or sort_by
             sort_dir = qp.get("sort_dir") or sort_dir
+            # keyset pagination
+            if qp.get("cursor") is not None:
+                cursor = qp.get("cursor")
+            if qp.get("with_total") is not None:
+                with_total = str(qp.get("with_total")).lower() in ("1", "true", "yes")
+            if qp.get("total") in ("exact", "estimate"):
+                total_mode = qp.get("total")
             # date range
             try:
                 date_from_ms = int(qp.get("date_from_ms")) if qp.get("date_from_ms") is not None else date_from_ms
@@ -241,35 +526,12 @@ class BaseService:
                     filters[key] = v
 
         Model = self.get_model()
-        stmt = select(Model)
 
         # By default return only active rows (active==1) when model has a status column.
         # If caller provided an explicit filter for the status column in `filters`, honor that
         # only for admin requests. Regular users will never see inactive (0) or deleted (2) rows.
-        def _request_is_admin() -> bool:
-            # Inspect Authorization header and decode token; be defensive — any error -> not admin
-            if not hasattr(self, "request") or self.request is None:
-                return False
-            auth = self.request.headers.get("Authorization")
-            if not auth:
-                return False
-            parts = auth.split()
-            if len(parts) != 2 or parts[0].lower() != "bearer":
-                return False
-            token = parts[1]
-            try:
-                payload = decode_access_token(token, settings.JWT_PRIVATE)
-            except Exception:
-                return False
-            role = payload.get("role") if isinstance(payload, dict) else None
-            if isinstance(role, str) and role.lower() in ("admin", "superadmin"):
-                return True
-            if isinstance(role, (list, tuple)) and any(str(r).lower() in ("admin", "superadmin") for r in role):
-                return True
-            return False
-
         if hasattr(Model, self.status_column):
-            is_admin = _request_is_admin()
+            is_admin = self._is_request_admin()
             # For non-admins, always enforce active==1 regardless of caller-supplied filters
             if not filters:
                 if not is_admin:
@@ -294,95 +556,42 @@ class BaseService:
                             filters = {**filters}
                         filters[self.status_column] = 1
 
-        where_clauses = []
-        if filters:
-            for col, val in filters.items():
-                # normalize numeric CSV strings to int or list[int] to avoid ILIKE on numeric columns
-                if isinstance(val, str):
-                    s = val.strip()
-                    if re.fullmatch(r"\d+(,\d+)*", s):
-                        if "," in s:
-                            parts = [p.strip() for p in s.split(",")]
-                            try:
-                                val = [int(p) for p in parts]
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                val = int(s)
-                            except Exception:
-                                pass
-                if "." in col:
-                    # relation filter
-                    rel, rel_col = col.split(".", 1)
-                    # use exists/select via text to avoid complex generic joins here
-                    clause = text(f"EXISTS(SELECT 1 FROM {rel} WHERE {rel}.id = {Model.__tablename__}.{rel}_id AND {rel}.{rel_col} = :val)")
-                    where_clauses.append(clause.bindparams(val=val))
-                else:
-                    if not hasattr(Model, col):
-                        continue
-                    col_attr = getattr(Model, col)
-                    if isinstance(val, str):
-                        # prefer ilike on the column if available, otherwise cast to text
-                        if hasattr(col_attr, "ilike"):
-                            where_clauses.append(col_attr.ilike(f"%{val}%"))
-                        else:
-                            where_clauses.append(cast(col_attr, String).ilike(f"%{val}%"))
-                    elif isinstance(val, (list, tuple, set)):
-                        where_clauses.append(col_attr.in_(list(val)))
-                    else:
-                        where_clauses.append(col_attr == val)
-
-        # date range (apply to selectable date column, default created_at)
-        dt_from = self._ms_to_dt(date_from_ms)
-        dt_to = self._ms_to_dt(date_to_ms)
-        if date_col and hasattr(Model, date_col):
-            date_attr = getattr(Model, date_col)
-            if dt_from and dt_to:
-                where_clauses.append(date_attr >= dt_from)
-                where_clauses.append(date_attr <= dt_to)
-            elif dt_from:
-                where_clauses.append(date_attr >= dt_from)
-            elif dt_to:
-                where_clauses.append(date_attr <= dt_to)
-
-        if q and columns:
-            q_term = f"%{q}%"
-            or_exprs = []
-            for col in columns:
-                if "." in col:
-                    # skip relation columns in free-text search for simplicity
-                    continue
-                if not hasattr(Model, col):
-                    continue
-                col_attr = getattr(Model, col)
-                if hasattr(col_attr, "ilike"):
-                    or_exprs.append(col_attr.ilike(q_term))
-                else:
-                    or_exprs.append(cast(col_attr, String).ilike(q_term))
-            if or_exprs:
-                where_clauses.append(or_(*or_exprs))
-
-        # Always exclude deleted rows (status == 2) from list results.
-        if hasattr(Model, self.status_column):
-            status_attr = getattr(Model, self.status_column)
-            where_clauses.append(status_attr != 2)
-
-        if where_clauses:
-            stmt = stmt.where(and_(*where_clauses))
+        plan, params = self._filter_plan(
+            q=q, filters=filters, columns=columns, date_from_ms=date_from_ms, date_to_ms=date_to_ms, date_col=date_col
+        )
+        stmt = plan.select_stmt
 
         # sorting
-        if sort_by and hasattr(Model, sort_by):
-            col = getattr(Model, sort_by)
-            if sort_dir and str(sort_dir).lower() == "desc":
-                stmt = stmt.order_by(col.desc())
-            else:
-                stmt = stmt.order_by(col.asc())
+        descending = bool(sort_dir and str(sort_dir).lower() == "desc")
+        sort_attr = getattr(Model, sort_by) if sort_by and hasattr(Model, sort_by) else None
+        if sort_attr is not None:
+            # Postgres' default NULL placement, spelled out so the keyset seek
+            # predicate below holds on any backend
+            stmt = stmt.order_by(sort_attr.desc().nulls_first() if descending else sort_attr.asc().nulls_last())
         else:
             # default
             if hasattr(Model, "id"):
                 stmt = stmt.order_by(getattr(Model, "id").asc())
 
+        load_options = self.list_load_options()
+        if load_options:
+            stmt = stmt.options(*load_options)
+
+        count_kwargs = dict(q=q, filters=filters, columns=columns, date_from_ms=date_from_ms, date_to_ms=date_to_ms, date_col=date_col)
+
+        if cursor is not None:
+            return await self._list_keyset(
+                stmt,
+                cursor=cursor,
+                limit=limit,
+                sort_attr=sort_attr,
+                descending=descending,
+                with_relations=with_relations,
+                with_total=with_total,
+                params=params,
+                count_kwargs=count_kwargs,
+            )
+
         # eager loads
         if with_relations:
             for r in with_relations:
@@ -395,39 +604,136 @@ class BaseService:
                 page = 1
             skip = (page - 1) * limit
 
-        stmt = stmt.offset(skip).limit(limit)
-
-        results = await self.db.scalars(stmt)
-        rows = results.all()
+        if page is None:
+            stmt = stmt.offset(skip).limit(limit)
+            results = await self.db.scalars(stmt, params)
+            return results.unique().all() if with_relations else results.all()
+
+        # Page requested: return a pagination payload. The total comes either
+        # from a planner estimate (large unfiltered tables, opt-in) or from
+        # `count(*) OVER()` evaluated in the same query as the rows.
+        total_mode = total_mode or self.default_total_mode
+        total = None
+        total_is_estimate = False
+        if total_mode == "estimate" and self._is_unfiltered(filters, q, columns, date_from_ms, date_to_ms):
+            estimate = await self.estimate_total()
+            if estimate is not None and estimate >= self.estimate_total_min_rows:
+                total, total_is_estimate = estimate, True
+
+        if total is not None:
+            results = await self.db.scalars(stmt.offset(skip).limit(limit), params)
+            rows = results.unique().all() if with_relations else results.all()
+        else:
+            windowed = stmt.add_columns(func.count().over().label("_total")).offset(skip).limit(limit)
+            result = await self.db.execute(windowed, params)
+            if with_relations:
+                result = result.unique()
+            fetched = result.all()
+            rows = [r[0] for r in fetched]
+            if fetched:
+                total = int(fetched[0][1])
+            elif skip:
+                # past the last page the window has nothing to report
+                total = await self.count(**count_kwargs)
+            else:
+                total = 0
+
+        per_page = limit
+        total_pages = (total + per_page - 1) // per_page if per_page else 0
+        next_page = page + 1 if page < total_pages else None
+        prev_page = page - 1 if page > 1 else None
+
+        payload = {
+            "items": rows,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": total_pages,
+            "next_page": next_page,
+            "prev_page": prev_page,
+        }
+        if total_is_estimate:
+            payload["total_is_estimate"] = True
+        return payload
+
+    async def _list_keyset(
+        self,
+        stmt,
+        *,
+        cursor: str,
+        limit: int,
+        sort_attr,
+        descending: bool,
+        with_relations: Optional[List[str]],
+        with_total: Optional[bool],
+        params: Dict[str, Any],
+        count_kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Seek-based page: `WHERE (sort_col, id) > (:v, :id) ORDER BY sort_col, id LIMIT n+1`.
+
+        `stmt` already carries the filters and the primary ORDER BY; this adds
+        the seek predicate and an `id` tiebreaker so the ordering is total.
+        Postgres sorts NULLs last for ASC and first for DESC, which the
+        predicate mirrors.
+        """
+        Model = self.get_model()
+        id_attr = getattr(Model, "id")
+        value_type = None
+        if sort_attr is None:
+            # no sort_by: the default ORDER BY is id ascending whatever sort_dir says
+            descending = False
+        elif sort_attr is not id_attr:
+            value_type = _cursor_type(sort_attr)
+            if value_type is None:
+                raise InvalidCursor(f"Cursor pagination is not supported when sorting by '{sort_attr.key}'")
+            stmt = stmt.order_by(id_attr.desc() if descending else id_attr.asc())
+        else:
+            # sorting by id alone: the ORDER BY already uses id
+            sort_attr = None
+        sort_key = sort_attr.key if sort_attr is not None else "id"
+
+        if cursor:
+            last_val, last_id = _decode_cursor(cursor, sort_key, descending, value_type)
+            id_after = id_attr < last_id if descending else id_attr > last_id
+            if sort_attr is None:
+                stmt = stmt.where(id_after)
+            elif descending:
+                if last_val is None:
+                    stmt = stmt.where(or_(sort_attr.is_not(None), and_(sort_attr.is_(None), id_after)))
+                else:
+                    stmt = stmt.where(or_(sort_attr < last_val, and_(sort_attr == last_val, id_after)))
+            else:
+                if last_val is None:
+                    stmt = stmt.where(and_(sort_attr.is_(None), id_after))
+                else:
+                    stmt = stmt.where(or_(sort_attr > last_val, sort_attr.is_(None), and_(sort_attr == last_val, id_after)))
 
-        # If page was requested, return pagination payload instead of raw rows
-        if page is not None:
-            # Attempt to get total using count(); fall back to len(rows)
-            try:
-                total = await self.count(q=q, filters=filters, columns=columns, date_from_ms=date_from_ms, date_to_ms=date_to_ms, date_col=date_col)
-            except TypeError:
-                try:
-                    total = len(rows)
-                except Exception:
-                    total = 0
-
-            per_page = limit
-            total_pages = (total + per_page - 1) // per_page if per_page else 0
-            next_page = page + 1 if page < total_pages else None
-            prev_page = page - 1 if page > 1 else None
-
-            return {
-                "items": rows,
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "next_page": next_page,
-                "prev_page": prev_page,
-            }
-
-        return rows
+        if with_relations:
+            for r in with_relations:
+                stmt = stmt.options(joinedload(r))
 
+        # fetch one extra row to learn whether another page exists
+        stmt = stmt.limit(limit + 1)
+        results = await self.db.scalars(stmt, params)
+        rows = results.unique().all() if with_relations else results.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(sort_key, descending, getattr(last, sort_key), getattr(last, "id"))
+
+        payload: Dict[str, Any] = {
+            "items": rows,
+            "per_page": limit,
+            "cursor": cursor or None,
+            "next_cursor": next_cursor,
+        }
+        if with_total:
+            payload["total"] = await self.count(**count_kwargs)
+        return payload
+
+    @_replica_read
     async def count(
         self,
         q: Optional[str] = None,
@@ -438,74 +744,27 @@ class BaseService:
         date_col: Optional[str] = "created_at",
     ) -> int:
         """Count rows matching the same filter/q/date logic used by list()."""
-        Model = self.get_model()
+        plan, params = self._filter_plan(
+            q=q, filters=filters, columns=columns, date_from_ms=date_from_ms, date_to_ms=date_to_ms, date_col=date_col
+        )
+        total = await self.db.scalar(plan.count_stmt, params)
+        return int(total or 0)
 
-        where_clauses = []
-        if filters:
-            for col, val in filters.items():
-                # normalize numeric CSV strings to int or list[int]
-                if isinstance(val, str):
-                    s = val.strip()
-                    if re.fullmatch(r"\d+(,\d+)*", s):
-                        if "," in s:
-                            parts = [p.strip() for p in s.split(",")]
-                            try:
-                                val = [int(p) for p in parts]
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                val = int(s)
-                            except Exception:
-                                pass
-                if "." in col:
-                    rel, rel_col = col.split(".", 1)
-                    clause = text(f"EXISTS(SELECT 1 FROM {rel} WHERE {rel}.id = {Model.__tablename__}.{rel}_id AND {rel}.{rel_col} = :val)")
-                    where_clauses.append(clause.bindparams(val=val))
-                else:
-                    if not hasattr(Model, col):
-                        continue
-                    col_attr = getattr(Model, col)
-                    if isinstance(val, str):
-                        where_clauses.append(col_attr.ilike(f"%{val}%"))
-                    elif isinstance(val, (list, tuple, set)):
-                        where_clauses.append(col_attr.in_(list(val)))
-                    else:
-                        where_clauses.append(col_attr == val)
-
-        # date range (apply to selectable date column, default created_at)
-        dt_from = self._ms_to_dt(date_from_ms)
-        dt_to = self._ms_to_dt(date_to_ms)
-        if date_col and hasattr(Model, date_col):
-            date_attr = getattr(Model, date_col)
-            if dt_from and dt_to:
-                where_clauses.append(date_attr >= dt_from)
-                where_clauses.append(date_attr <= dt_to)
-            elif dt_from:
-                where_clauses.append(date_attr >= dt_from)
-            elif dt_to:
-                where_clauses.append(date_attr <= dt_to)
+    async def estimate_total(self) -> Optional[int]:
+        """Return the planner's row estimate for the model's table, or None.
 
-        if q and columns:
-            q_term = f"%{q}%"
-            or_exprs = []
-            for col in columns:
-                if "." in col:
-                    continue
-                if hasattr(Model, col):
-                    or_exprs.append(getattr(Model, col).ilike(q_term))
-            if or_exprs:
-                where_clauses.append(or_(*or_exprs))
-
-        # Always exclude deleted rows (status == 2) from count results.
-        count_stmt = select(func.count()).select_from(Model)
-        if hasattr(Model, self.status_column):
-            status_attr = getattr(Model, self.status_column)
-            where_clauses.append(status_attr != 2)
-        if where_clauses:
-            count_stmt = count_stmt.where(and_(*where_clauses))
-        total = await self.db.scalar(count_stmt)
-        return int(total or 0)
+        Reads `pg_class.reltuples`, which VACUUM/ANALYZE keep roughly current.
+        Returns None when the table has never been analyzed (reltuples < 0).
+        """
+        Model = self.get_model()
+        q = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:tbl)")
+        try:
+            val = await self.db.scalar(q.bindparams(tbl=Model.__tablename__))
+        except Exception:
+            return None
+        if val is None or int(val) < 0:
+            return None
+        return int(val)
 
     # pagination is handled via list(page=...) which returns a pagination payload
 
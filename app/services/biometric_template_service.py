@@ -1,10 +1,15 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import defer
 from app.services.base_service import BaseService
 from app.models.biometric_template import BiometricTemplate
 from app.schemas.biometric_template import BiometricTemplateCreate, BiometricTemplateUpdate
-from app.core.errors import DuplicateEmail
+from app.core.config import settings
+from app.core.errors import DuplicateEmail, InvalidEmbedding
+from app.utils.embedding import decode_embedding, encode_embedding
+from app.utils.face_index import Match, face_index
+from app.utils.session_candidates import session_candidates
 
 
 class BiometricTemplateService(BaseService):
@@ -13,10 +18,34 @@ class BiometricTemplateService(BaseService):
     def __init__(self, db: AsyncSession) -> None:
         super().__init__(db)
 
+    def includes_embedding(self) -> bool:
+        """True when the request asked for `?include=embedding`."""
+        request = getattr(self, "request", None)
+        if request is None:
+            return False
+        include = request.query_params.get("include") or ""
+        return "embedding" in {part.strip() for part in include.split(",")}
+
+    def list_load_options(self) -> List[Any]:
+        # skip reading the blobs from the database when they won't be returned
+        return [] if self.includes_embedding() else [defer(self.model.embedding)]
+
+    def _encode_embedding(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Store `embedding` in the compact versioned format and fill in `dimension`."""
+        emb = data.get("embedding")
+        if emb is None:
+            return data
+        vec = decode_embedding(emb) if isinstance(emb, (bytes, bytearray)) else emb
+        if data.get("dimension") and len(vec) != data["dimension"]:
+            raise InvalidEmbedding(f"Embedding has {len(vec)} values, expected {data['dimension']}")
+        data["embedding"] = encode_embedding(vec, settings.EMBEDDING_STORAGE_DTYPE)
+        data["dimension"] = len(vec)
+        return data
+
     async def create(self, payload: BiometricTemplateCreate) -> BiometricTemplate:
         # Enforce one biometric template per student: if payload contains student_id,
         # attempt to find an existing active template for that student and replace it.
-        data = payload.dict(exclude_unset=True)
+        data = self._encode_embedding(payload.dict(exclude_unset=True))
         student_id = data.get("student_id")
         if student_id:
             # try to find existing active template for this student
@@ -24,10 +53,35 @@ class BiometricTemplateService(BaseService):
             existing = await self.db.scalar(q)
             if existing:
                 # update the existing template by its global_id
-                return await super().update_by_global_id(existing.global_id, BiometricTemplateUpdate(**data))
+                row = await super().update_by_global_id(existing.global_id, BiometricTemplateUpdate(**data))
+                face_index.apply(row)
+                session_candidates.evict_student(row.student_id)
+                return row
 
         # fallback: create new template
-        return await super().create(data)
+        row = await super().create(data)
+        face_index.apply(row)
+        session_candidates.evict_student(row.student_id)
+        return row
 
     async def update_by_global_id(self, global_id: str, payload: BiometricTemplateUpdate) -> BiometricTemplate:
-        return await super().update_by_global_id(global_id, payload)
+        data = payload.dict(exclude_unset=True) if hasattr(payload, "dict") else dict(payload or {})
+        row = await super().update_by_global_id(global_id, self._encode_embedding(data))
+        face_index.apply(row)
+        session_candidates.evict_student(row.student_id)
+        return row
+
+    async def set_status_by_global_id(self, global_id: str, value: int) -> BiometricTemplate:
+        # deactivating/deleting drops the template from the match index
+        row = await super().set_status_by_global_id(global_id, value)
+        face_index.apply(row)
+        session_candidates.evict_student(row.student_id)
+        return row
+
+    async def match(self, embedding: Sequence[float], top_k: int = 1, model: Optional[str] = None, min_similarity: Optional[float] = None) -> List[Match]:
+        """1:N search of active templates by cosine similarity."""
+        await face_index.ensure_current(self.db)
+        matches = face_index.search(embedding, top_k, model=model)
+        if min_similarity is not None:
+            matches = [m for m in matches if m.similarity >= min_similarity]
+        return matches
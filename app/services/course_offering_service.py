@@ -1,9 +1,11 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from app.services.base_service import BaseService
+from app.services.session_service import is_exclusion_violation
 from app.models.course_offering import CourseOffering
 from app.schemas.course_offering import CourseOfferingCreate, CourseOfferingUpdate
-from app.core.errors import DuplicateEmail
+from app.core.errors import DuplicateEmail, ScheduleConflict
 
 
 class CourseOfferingService(BaseService):
@@ -39,4 +41,12 @@ class CourseOfferingService(BaseService):
                     data[t] = self._ms_to_dt(int(data[t]))
                 except Exception:
                     pass
-        return await super().update_by_global_id(global_id, data)
+        try:
+            return await super().update_by_global_id(global_id, data)
+        except IntegrityError as exc:
+            # a new instructor_id is copied onto the offering's sessions by a
+            # trigger, which trips ex_sessions_instructor_time if they clash
+            await self.db.rollback()
+            if is_exclusion_violation(exc):
+                raise ScheduleConflict("The new instructor is already booked during one of this offering's sessions")
+            raise
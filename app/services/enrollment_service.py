@@ -3,6 +3,7 @@ from app.models.enrollment import Enrollment
 from sqlalchemy import select
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
+from app.utils.session_candidates import session_candidates
 
 
 class EnrollmentService(BaseService):
@@ -31,10 +32,13 @@ class EnrollmentService(BaseService):
 
         # fallback to BaseService.create but catch DB IntegrityError defensively
         try:
-            return await super().create(data)
+            row = await super().create(data)
         except IntegrityError as e:
             # if unique constraint still violated, return client-friendly error
             raise HTTPException(status_code=400, detail="Student already enrolled in this offering")
+        # roster changed: drop cached face candidates of this offering's sessions
+        session_candidates.evict_offering(row.offering_id)
+        return row
 
     async def update_by_global_id(self, global_id: str, payload):
         # normalize payload to dict
@@ -55,10 +59,14 @@ class EnrollmentService(BaseService):
         if exists:
             raise HTTPException(status_code=400, detail="Another enrollment with this student and offering already exists")
 
+        old_offering = getattr(current, "offering_id")
         try:
-            return await super().update_by_global_id(global_id, data)
+            row = await super().update_by_global_id(global_id, data)
         except IntegrityError:
             raise HTTPException(status_code=400, detail="Another enrollment with this student and offering already exists")
+        session_candidates.evict_offering(old_offering)
+        session_candidates.evict_offering(row.offering_id)
+        return row
 
     async def set_active_by_global_id(self, global_id: str, value: int):
         """Explicitly set the `active` column on an enrollment by global_id.
@@ -68,3 +76,8 @@ class EnrollmentService(BaseService):
         """
         # delegate to BaseService.set_status_by_global_id which uses self.status_column
         return await self.set_status_by_global_id(global_id, value)
+
+    async def set_status_by_global_id(self, global_id: str, value: int):
+        row = await super().set_status_by_global_id(global_id, value)
+        session_candidates.evict_offering(row.offering_id)
+        return row
@@ -0,0 +1,75 @@
+from typing import List, NamedTuple, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, cast, literal_column, null, select, union_all
+from app.models.instructor import Instructor
+from app.models.student import Student
+from app.utils.passwords import verify_password
+
+
+class Identity(NamedTuple):
+    kind: str  # 'instructor' or 'student'
+    id: int
+    global_id: Optional[str]
+    email: str
+    hashed_password: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    position: Optional[str]  # instructors only
+    student_code: Optional[str]  # students only
+
+
+class IdentityService:
+    """Resolve a login email across instructors and students in one query.
+
+    Both tables have a unique index on `email`, so the UNION ALL below is two
+    index lookups in a single round trip. Instructors sort first, matching
+    the order in which logins used to be attempted.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def find_by_email(self, email: str) -> List[Identity]:
+        instructors = select(
+            literal_column("'instructor'").label("kind"),
+            Instructor.id,
+            Instructor.global_id,
+            Instructor.email,
+            Instructor.hashed_password,
+            Instructor.first_name,
+            Instructor.last_name,
+            cast(Instructor.position, String).label("position"),
+            cast(null(), String).label("student_code"),
+        ).where(Instructor.email == email)
+        students = select(
+            literal_column("'student'").label("kind"),
+            Student.id,
+            Student.global_id,
+            Student.email,
+            Student.hashed_password,
+            Student.first_name,
+            Student.last_name,
+            cast(null(), String).label("position"),
+            Student.student_code,
+        ).where(Student.email == email)
+        rows = (await self.db.execute(union_all(instructors, students))).all()
+        found = [Identity(*row) for row in rows]
+        found.sort(key=lambda ident: ident.kind != "instructor")
+        return found
+
+    async def authenticate(self, email: str, password: str) -> Optional[Identity]:
+        """Return the identity whose password matches, verifying only the owning row's hash.
+
+        An email present in both tables (rare) falls back to the student row
+        when the instructor hash does not match, as before.
+        """
+        for ident in await self.find_by_email(email):
+            if not ident.hashed_password:
+                continue
+            try:
+                if await verify_password(password, ident.hashed_password):
+                    return ident
+            except Exception:
+                # treat hashing/verification errors as authentication failure
+                continue
+        return None
@@ -3,14 +3,12 @@ from sqlalchemy import select, func
 from app.models.instructor import Instructor
 from typing import Optional
 from app.core.errors import InvalidPasswordLength
-from passlib.context import CryptContext
+from app.utils.passwords import hash_password, verify_password
 
 from app.core.errors import DuplicateEmail, DuplicatePhone, NotFound
 from sqlalchemy import select
 from app.services.base_service import BaseService
 
-_pwd = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
-
 
 class InstructorService(BaseService):
     model = Instructor
@@ -34,7 +32,7 @@ class InstructorService(BaseService):
             if not (8 <= len(data["password"]) <= 32):
                 raise InvalidPasswordLength("Password must be between 8 and 32 characters")
             try:
-                data["hashed_password"] = _pwd.hash(data.pop("password"))
+                data["hashed_password"] = await hash_password(data.pop("password"))
             except ValueError:
                 raise InvalidPasswordLength(
                     "Password too long or invalid for the hasher; must be <= 72 bytes when encoded in UTF-8"
@@ -52,7 +50,7 @@ class InstructorService(BaseService):
                 if not (8 <= len(v) <= 32):
                     raise InvalidPasswordLength("Password must be between 8 and 32 characters")
                 try:
-                    obj.hashed_password = _pwd.hash(v)
+                    obj.hashed_password = await hash_password(v)
                 except ValueError:
                     raise InvalidPasswordLength(
                         "Password too long or invalid for the hasher; must be <= 72 bytes when encoded in UTF-8"
@@ -81,7 +79,7 @@ class InstructorService(BaseService):
         if not inst or not inst.hashed_password:
             return None
         try:
-            if _pwd.verify(password, inst.hashed_password):
+            if await verify_password(password, inst.hashed_password):
                 return inst
         except Exception:
             # treat hashing/verification errors as authentication failure
@@ -1,6 +1,34 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from app.services.base_service import BaseService
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, insert, literal_column, or_, select
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.errors import InvalidSchedule, NotFound, ScheduleConflict
+from app.models.course_offering import CourseOffering
 from app.models.session import Session
+from app.schemas.session import SessionGenerateRequest
+from app.services.attendance_summary_service import AttendanceSummaryService
+from app.utils.interval_tree import IntervalTree
+from app.utils.recurrence import expand_dates
+from app.utils.session_candidates import session_candidates
+
+
+_SCHEDULE_FIELDS = ("offering_id", "room_id", "start_datetime", "end_datetime", "status", "active")
+
+
+def is_exclusion_violation(exc: IntegrityError) -> bool:
+    # 23P01 = exclusion_violation (ex_sessions_room_time / ex_sessions_instructor_time)
+    orig = getattr(exc, "orig", None)
+    return getattr(orig, "sqlstate", None) == "23P01" or getattr(orig, "pgcode", None) == "23P01" or "ex_sessions_" in str(exc)
+
+
+def _utc(dt: datetime) -> datetime:
+    # TIMESTAMP columns come back naive; they hold UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
 
 
 class SessionService(BaseService):
@@ -8,3 +36,209 @@ class SessionService(BaseService):
 
     def __init__(self, db: AsyncSession) -> None:
         super().__init__(db)
+
+    async def _check_change(self, global_id: str, changes: Dict[str, Any]) -> None:
+        row = await self.db.scalar(select(Session).where(Session.global_id == global_id))
+        if row is None or not any(k in changes for k in _SCHEDULE_FIELDS):
+            return
+        values = {k: getattr(row, k) for k in _SCHEDULE_FIELDS}
+        values.update({k: v for k, v in changes.items() if k in _SCHEDULE_FIELDS})
+        values["active"] = int(values["active"]) if values["active"] is not None else None
+        was_live = row.active != 2 and row.status != "canceled"
+        moved = any(values[k] != getattr(row, k) for k in ("offering_id", "room_id", "start_datetime", "end_datetime"))
+        if moved or not was_live:
+            await self._assert_free(values, exclude_id=row.id)
+
+    def write_snapshot(self, row: Session) -> Optional[int]:
+        return row.offering_id
+
+    async def before_commit(self, row: Session, previous: Optional[int]) -> None:
+        if previous is not None and row.offering_id != previous:
+            # offering attendance totals follow the session to its new offering
+            await self.db.flush()
+            await AttendanceSummaryService(self.db).move_session(row.id, previous, row.offering_id)
+
+    async def update_by_global_id(self, global_id: str, payload):
+        changes = payload.dict(exclude_unset=True) if hasattr(payload, "dict") else dict(payload or {})
+        await self._check_change(global_id, changes)
+        row = await self._write(lambda: super(SessionService, self).update_by_global_id(global_id, payload))
+        # offering/time/status changes invalidate the session's face candidates
+        session_candidates.evict(row.id)
+        return row
+
+    async def set_status_by_global_id(self, global_id: str, value: int):
+        await self._check_change(global_id, {self.status_column: int(value)})
+        row = await self._write(lambda: super(SessionService, self).set_status_by_global_id(global_id, value))
+        session_candidates.evict(row.id)
+        return row
+
+    def _overlaps(self, lo: datetime, hi: datetime):
+        if self.db.bind is not None and self.db.bind.dialect.name == "postgresql":
+            # matches the ex_sessions_* GiST index expressions (db/sql/005_session_exclusion.sql)
+            bounds = literal_column("'[)'")  # a literal, not a bind, so the expression matches the index
+            return func.tstzrange(Session.start_datetime, Session.end_datetime, bounds).op("&&")(func.tstzrange(lo, hi, bounds))
+        return and_(Session.start_datetime < hi, Session.end_datetime > lo)
+
+    async def find_conflicts(
+        self,
+        room_id: int,
+        instructor_id: Optional[int],
+        planned: Sequence[Tuple[datetime, datetime]],
+        exclude_id: Optional[int] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Map index in `planned` -> first clash with a live session, from a single query.
+
+        Loads the live sessions of the room or the instructor inside the
+        planned window once, indexes them in interval trees per room and
+        per instructor, and checks each planned interval in O(log n).
+        Overlaps among the planned intervals themselves are reported as
+        'batch'. `exclude_id` leaves out the session being updated.
+        """
+        if not planned:
+            return {}
+        lo = min(start for start, _ in planned)
+        hi = max(end for _, end in planned)
+        q = (
+            # sessions.instructor_id is the trigger-maintained copy the exclusion
+            # constraint (and its GiST index) is defined on
+            select(Session.id, Session.global_id, Session.room_id, Session.instructor_id, Session.start_datetime, Session.end_datetime)
+            .where(
+                or_(Session.room_id == room_id, Session.instructor_id == instructor_id) if instructor_id else Session.room_id == room_id,
+                self._overlaps(lo, hi),
+                Session.active != 2,
+                or_(Session.status.is_(None), Session.status != "canceled"),
+            )
+        )
+        if exclude_id is not None:
+            q = q.where(Session.id != exclude_id)
+        rooms: List[Tuple[datetime, datetime, Any]] = []
+        instructors: List[Tuple[datetime, datetime, Any]] = []
+        for row in (await self.db.execute(q)).all():
+            interval = (_utc(row.start_datetime), _utc(row.end_datetime), row)
+            if row.room_id == room_id:
+                rooms.append(interval)
+            if instructor_id and row.instructor_id == instructor_id:
+                instructors.append(interval)
+        trees = (("room", IntervalTree(rooms)), ("instructor", IntervalTree(instructors)))
+
+        conflicts: Dict[int, Dict[str, Any]] = {}
+        for i, (start, end) in enumerate(planned):
+            for kind, tree in trees:
+                hit = tree.first_overlap(start, end)
+                if hit is not None:
+                    conflicts[i] = {"index": i, "start_datetime": start, "end_datetime": end, "kind": kind, "session_id": hit.global_id}
+                    break
+
+        reach = None  # latest end among the planned intervals seen so far, in start order
+        for i in sorted(range(len(planned)), key=lambda k: planned[k][0]):
+            start, end = planned[i]
+            if reach is not None and start < reach and i not in conflicts:
+                conflicts[i] = {"index": i, "start_datetime": start, "end_datetime": end, "kind": "batch", "session_id": None}
+            reach = end if reach is None else max(reach, end)
+        return conflicts
+
+    async def _assert_free(self, values: Dict[str, Any], exclude_id: Optional[int] = None) -> None:
+        """Raise ScheduleConflict if a session with `values` would double-book its room or instructor."""
+        if values.get("active") == 2 or values.get("status") == "canceled":
+            return
+        start, end = values.get("start_datetime"), values.get("end_datetime")
+        if start is None or end is None or not values.get("room_id"):
+            return
+        start, end = _utc(start), _utc(end)
+        if end <= start:
+            raise InvalidSchedule("end_datetime must be after start_datetime")
+        instructor_id = await self.db.scalar(select(CourseOffering.instructor_id).where(CourseOffering.id == values.get("offering_id")))
+        clash = (await self.find_conflicts(values["room_id"], instructor_id, [(start, end)], exclude_id)).get(0)
+        if clash:
+            raise ScheduleConflict(f"Session overlaps {clash['kind']} booking of session {clash['session_id']}")
+
+    async def _write(self, op):
+        # the exclusion constraints are authoritative when two writers race past _assert_free
+        try:
+            return await op()
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if is_exclusion_violation(exc):
+                raise ScheduleConflict("Session overlaps an existing booking of its room or instructor")
+            raise
+
+    async def create(self, payload):
+        data = payload.dict(exclude_unset=True, exclude_none=True) if hasattr(payload, "dict") else dict(payload or {})
+        await self._assert_free(data)
+        return await self._write(lambda: super(SessionService, self).create(payload))
+
+    async def generate(self, req: SessionGenerateRequest) -> Tuple[List[Tuple[datetime, datetime]], List[Session], List[Dict[str, Any]]]:
+        """Expand `req.rule` over the date range and bulk-insert the sessions.
+
+        Returns (planned intervals, created sessions, conflicts). Nothing is
+        written when `dry_run` is set, or when there are conflicts and
+        `on_conflict` is 'reject'.
+        """
+        offering = await self.db.get(CourseOffering, req.offering_id)
+        if offering is None or offering.active == 2:
+            raise NotFound("CourseOffering not found")
+        room_id = req.room_id or offering.room_id
+        if not room_id:
+            raise InvalidSchedule("room_id is required when the offering has no room")
+        try:
+            tz = ZoneInfo(req.timezone or settings.SCHEDULE_TIMEZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise InvalidSchedule(f"Unknown timezone '{req.timezone}'")
+
+        def wall_clock(value, fallback: Optional[datetime], name: str):
+            if value is not None:
+                return value.replace(tzinfo=None)
+            if fallback is None:
+                raise InvalidSchedule(f"{name} is required when the offering has no {name}")
+            # offering times are timestamps of which only the time of day is used
+            return (fallback.astimezone(tz) if fallback.tzinfo else fallback).time()
+
+        start_time = wall_clock(req.start_time, offering.start_time, "start_time")
+        end_time = wall_clock(req.end_time, offering.end_time, "end_time")
+        if end_time <= start_time:
+            raise InvalidSchedule("end_time must be after start_time")
+        if req.status is not None and req.status not in Session.status.type.enums:
+            raise InvalidSchedule(f"invalid status '{req.status}'")
+        if (req.end_date - req.start_date).days > 366:
+            raise InvalidSchedule("date range must not exceed one year")
+        try:
+            dates = expand_dates(
+                req.start_date, req.end_date, req.rule.freq, req.rule.interval, req.rule.weekdays, req.rule.count, req.rule.exclude_dates
+            )
+        except ValueError as exc:
+            raise InvalidSchedule(str(exc))
+        if len(dates) > settings.SCHEDULE_MAX_SESSIONS:
+            raise InvalidSchedule(f"rule yields {len(dates)} sessions; at most {settings.SCHEDULE_MAX_SESSIONS} per request")
+
+        planned = [
+            (_utc(datetime.combine(d, start_time, tz)), _utc(datetime.combine(d, end_time, tz)))
+            for d in dates
+        ]
+        conflicts = await self.find_conflicts(room_id, offering.instructor_id, planned)
+        if req.dry_run or (conflicts and req.on_conflict == "reject"):
+            return planned, [], sorted(conflicts.values(), key=lambda c: c["index"])
+
+        rows = [
+            {
+                "global_id": str(uuid4()),
+                "offering_id": offering.id,
+                "room_id": room_id,
+                "start_datetime": start,
+                "end_datetime": end,
+                "status": req.status,
+                "active": 1,
+            }
+            for i, (start, end) in enumerate(planned)
+            if i not in conflicts
+        ]
+        created: List[Session] = []
+        if rows:
+
+            async def _insert():
+                # one multi-row INSERT ... RETURNING
+                result = list(await self.db.scalars(insert(Session).returning(Session), rows))
+                await self.db.commit()
+                return result
+
+            created = await self._write(_insert)
+        return planned, created, sorted(conflicts.values(), key=lambda c: c["index"])
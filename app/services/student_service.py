@@ -5,11 +5,9 @@ from app.models.student import Student
 from sqlalchemy import text
 from fastapi import HTTPException, status
 from app.core.errors import InvalidPasswordLength
-from passlib.context import CryptContext
+from app.utils.passwords import hash_password, verify_password
 from app.services.base_service import BaseService, generic_list, generic_count
 
-_pwd = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
-
 
 class StudentService(BaseService):
     model = Student
@@ -45,7 +43,7 @@ class StudentService(BaseService):
             if not (8 <= len(data["password"]) <= 32):
                 raise InvalidPasswordLength("Password must be between 8 and 32 characters")
             try:
-                data["hashed_password"] = _pwd.hash(data.pop("password"))
+                data["hashed_password"] = await hash_password(data.pop("password"))
             except ValueError:
                 raise InvalidPasswordLength(
                     "Password too long or invalid for the hasher; must be <= 72 bytes when encoded in UTF-8"
@@ -64,7 +62,7 @@ class StudentService(BaseService):
                 if not (8 <= len(v) <= 32):
                     raise InvalidPasswordLength("Password must be between 8 and 32 characters")
                 try:
-                    obj.hashed_password = _pwd.hash(v)
+                    obj.hashed_password = await hash_password(v)
                 except ValueError:
                     raise InvalidPasswordLength(
                         "Password too long or invalid for the hasher; must be <= 72 bytes when encoded in UTF-8"
@@ -84,7 +82,7 @@ class StudentService(BaseService):
         if not stu or not stu.hashed_password:
             return None
         try:
-            if _pwd.verify(password, stu.hashed_password):
+            if await verify_password(password, stu.hashed_password):
                 return stu
         except Exception:
             return None
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.services.base_service import BaseService
 from app.models.verification import Verification
 from app.schemas.verification import VerificationCreate, VerificationUpdate
+from app.core.config import settings
+from app.utils.session_candidates import session_candidates
 
 
 class VerificationService(BaseService):
@@ -27,3 +29,28 @@ class VerificationService(BaseService):
 
     async def update_by_global_id(self, global_id: str, payload: VerificationUpdate) -> Verification:
         return await super().update_by_global_id(global_id, payload)
+
+    async def verify(self, session_id: int, embedding: Sequence[float], liveness_score: Optional[float] = None, captured_image_url: Optional[str] = None) -> Verification:
+        """Match `embedding` against the session's enrolled students and record the outcome.
+
+        Only a successful match is attributed to a student; failed attempts keep
+        the best template/similarity for auditing but leave student_id empty so
+        they never overwrite that student's verification for the session.
+        """
+        data = {"session_id": session_id, "liveness_score": liveness_score, "captured_image_url": captured_image_url}
+        liveness_min = settings.FACE_LIVENESS_THRESHOLD
+        if liveness_min is not None and liveness_score is not None and liveness_score < liveness_min:
+            data["result"] = "fail_liveness"
+        else:
+            match = await session_candidates.match(self.db, session_id, embedding)
+            if match is None:
+                data["result"] = "fail_match"
+            else:
+                data["template_id"] = match.template_id
+                data["similarity"] = round(match.similarity, 4)
+                if match.similarity >= settings.FACE_MATCH_THRESHOLD:
+                    data["student_id"] = match.student_id
+                    data["result"] = "success"
+                else:
+                    data["result"] = "fail_match"
+        return await self.create(VerificationCreate(**{k: v for k, v in data.items() if v is not None}))
@@ -0,0 +1,349 @@
+"""Local content-addressed store for uploaded images (verification captures).
+
+Blobs are keyed by the sha256 of their bytes and laid out in sharded
+directories (`<root>/ab/cd/abcd...`), so identical captures are stored once
+and a blob's key doubles as a strong ETag. Writes go to a temp file and are
+renamed into place, which keeps concurrent uploads of the same bytes safe.
+
+Identical captures uploaded for different records share one blob, so a
+`<digest>.refs` sidecar counts the uploads; deleting drops one reference and
+the blob goes away with the last one.
+
+`BlobReplicator` copies new blobs to the remote provider in the background;
+a `<digest>.remote` sidecar records the replica so a restart only resends
+blobs that never made it. Uploads therefore complete as soon as the local
+write does, whatever the remote provider's latency or availability. Every
+worker runs a replicator over the same directory, so each one holds an
+exclusive lock on `<digest>.lock` while copying a blob and skips blobs
+another worker has locked.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except Exception:  # Windows has no fcntl; it only runs the single-worker dev server
+    fcntl = None
+
+from app.core.config import settings
+from app.utils.storage import CloudinaryStorage, StoredObject, run_blocking
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+_MAGIC = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_content_type(head: bytes) -> str:
+    for magic, content_type in _MAGIC:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def is_digest(value: str) -> bool:
+    return bool(value) and _DIGEST_RE.fullmatch(value) is not None
+
+
+@contextmanager
+def _locked(path: str):
+    """Hold an exclusive flock on `path` (created if missing); yields the fd."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield fd
+    finally:
+        os.close(fd)
+
+
+class BlobStore:
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.isfile(self.path(digest))
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """Store `data` and add a reference to it; return (digest, created).
+
+        Blocking: run on the upload pool.
+        """
+        digest = sha256(data).hexdigest()
+        path = self.path(digest)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with _locked(path + ".refs") as refs:
+            created = not os.path.isfile(path)
+            if created:
+                self._write(directory, path, data)
+            self._add_reference(refs, 1, existed=not created)
+        return digest, created
+
+    def _write(self, directory: str, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _add_reference(fd: int, delta: int, existed: bool) -> int:
+        """Add `delta` to the count in the locked `.refs` file; return the new count.
+
+        Blobs stored before reference counting have no count yet and hold one.
+        """
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, 32).strip()
+        count = max(0, (int(raw) if raw else int(existed)) + delta)
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, str(count).encode("ascii"), 0)
+        return count
+
+    def read(self, digest: str) -> bytes:
+        with open(self.path(digest), "rb") as fh:
+            return fh.read()
+
+    def content_type(self, digest: str) -> str:
+        with open(self.path(digest), "rb") as fh:
+            return sniff_content_type(fh.read(16))
+
+    def release(self, digest: str) -> Tuple[bool, int]:
+        """Drop one reference; return (found, remaining) and remove the blob at zero."""
+        path = self.path(digest)
+        if not os.path.isfile(path):
+            return False, 0
+        with _locked(path + ".refs") as refs:
+            if not os.path.isfile(path):
+                return False, 0
+            remaining = self._add_reference(refs, -1, existed=True)
+            if not remaining:
+                self.delete(digest)
+        return True, remaining
+
+    def delete(self, digest: str) -> bool:
+        """Remove the blob and its replica sidecar whatever its references."""
+        removed = False
+        for path in (self.path(digest), self.path(digest) + ".remote"):
+            try:
+                os.unlink(path)
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def claim(self, digest: str) -> Optional[int]:
+        """Lock `digest` for replication without waiting; None when another worker holds it.
+
+        Release the returned fd with `unclaim`. The lock dies with the process,
+        so a crashed worker never leaves a blob claimed.
+        """
+        path = self.path(digest) + ".lock"
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        except FileNotFoundError:  # blob deleted meanwhile
+            return None
+        if fcntl is None:
+            return fd
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # the holder unlinks the file when done; a lock on an unlinked file guards nothing
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except OSError:
+            pass
+        os.close(fd)
+        return None
+
+    def unclaim(self, digest: str, fd: int) -> None:
+        try:
+            os.unlink(self.path(digest) + ".lock")
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+    def replica(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(digest) + ".remote", "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def mark_replicated(self, digest: str, url: str, public_id: str) -> None:
+        path = self.path(digest) + ".remote"
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"url": url, "public_id": public_id}, fh)
+        os.replace(tmp, path)
+
+    def unreplicated(self) -> Iterator[str]:
+        """Digests that have no `.remote` sidecar yet (walks the whole tree)."""
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            names = set(filenames)
+            for name in filenames:
+                if is_digest(name) and name + ".remote" not in names:
+                    yield name
+
+
+class BlobReplicator:
+    """Background copy of new blobs to the remote provider, with retry."""
+
+    def __init__(self, store: BlobStore, remote=None) -> None:
+        self.store = store
+        self.remote = remote
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set = set()
+        self._stats = {"replicated": 0, "failed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.remote is not None
+
+    def _get_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.BLOB_REPLICATION_QUEUE_SIZE)
+        return self._queue
+
+    def enqueue(self, digest: str) -> None:
+        if not self.enabled or digest in self._queued:
+            return
+        try:
+            self._get_queue().put_nowait(digest)
+            self._queued.add(digest)
+        except asyncio.QueueFull:
+            # picked up again by the startup scan of unreplicated blobs
+            logger.warning("Blob replication queue full; %s deferred", digest)
+
+    def _retry_later(self, digest: str, delay: float) -> None:
+        self._queued.discard(digest)
+        asyncio.get_running_loop().call_later(delay, self.enqueue, digest)
+
+    async def _replicate(self, digest: str) -> bool:
+        """Copy one blob; False when there was nothing to do or another worker has it."""
+        if self.store.replica(digest) is not None or not self.store.exists(digest):
+            return False
+        claim = await run_blocking(self.store.claim, digest)
+        if claim is None:
+            # another worker is copying it and retries on its own
+            return False
+        try:
+            # checked again under the lock: the previous holder may have just finished
+            if self.store.replica(digest) is not None or not self.store.exists(digest):
+                return False
+            data = await run_blocking(self.store.read, digest)
+            stored = await self.remote.put(data, sniff_content_type(data[:16]))
+            await run_blocking(self.store.mark_replicated, digest, stored.url, stored.public_id)
+            return True
+        finally:
+            await run_blocking(self.store.unclaim, digest, claim)
+
+    async def run(self) -> None:
+        """Replicate forever; meant to run as a startup task."""
+        if not self.enabled:
+            return
+        queue = self._get_queue()
+        for digest in await run_blocking(lambda: list(self.store.unreplicated())):
+            self.enqueue(digest)
+        failures: Dict[str, int] = {}
+        while True:
+            digest = await queue.get()
+            try:
+                copied = await self._replicate(digest)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                attempt = failures.get(digest, 0) + 1
+                failures[digest] = attempt
+                self._stats["failed"] += 1
+                delay = min(settings.BLOB_REPLICATION_MAX_BACKOFF_SECONDS, 2 ** attempt)
+                logger.exception("Replicating blob %s failed (attempt %d); retrying in %ss", digest, attempt, delay)
+                self._retry_later(digest, delay)
+                continue
+            failures.pop(digest, None)
+            self._queued.discard(digest)
+            self._stats["replicated"] += copied
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enabled": self.enabled,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "replicated": self._stats["replicated"],
+            "failed": self._stats["failed"],
+        }
+
+
+class BlobStorage:
+    """Upload backend that stores into the local blob store and replicates in the background."""
+
+    def __init__(self, store: BlobStore, replicator: BlobReplicator) -> None:
+        self.store = store
+        self.replicator = replicator
+
+    def url_for(self, digest: str) -> str:
+        return f"{settings.API_V1_PREFIX}/uploads/blobs/{digest}"
+
+    async def put(self, data: bytes, content_type: str) -> StoredObject:
+        digest, created = await run_blocking(self.store.put, data)
+        if created:
+            self.replicator.enqueue(digest)
+        url = self.url_for(digest)
+        return StoredObject(url, digest, {"public_id": digest, "url": url, "bytes": len(data), "sha256": digest, "deduplicated": not created})
+
+    async def delete(self, public_id: str) -> Dict[str, Any]:
+        # identical captures share one blob: drop this upload's reference and
+        # remove the blob (and its replica) only with the last one
+        if not is_digest(public_id):
+            return {"result": "not found"}
+        replica = await run_blocking(self.store.replica, public_id)
+        found, remaining = await run_blocking(self.store.release, public_id)
+        if found and not remaining and replica and self.replicator.enabled:
+            try:
+                await self.replicator.remote.delete(replica["public_id"])
+            except Exception:
+                logger.exception("Could not delete replica of blob %s", public_id)
+        return {"result": "ok" if found else "not found", "references": remaining}
+
+
+def _remote():
+    if settings.BLOB_REPLICA_BACKEND != "cloudinary":
+        return None
+    try:
+        return CloudinaryStorage()
+    except RuntimeError:
+        logger.warning("Blob replication disabled: cloudinary package not installed")
+        return None
+
+
+_blob_storage: Optional[BlobStorage] = None
+
+
+def get_blob_storage() -> BlobStorage:
+    global _blob_storage
+    if _blob_storage is None:
+        store = BlobStore(settings.BLOB_STORE_DIR)
+        _blob_storage = BlobStorage(store, BlobReplicator(store, _remote()))
+    return _blob_storage
@@ -0,0 +1,96 @@
+"""Binary format for biometric template embeddings.
+
+Stored blobs start with a 16-byte little-endian header followed by the
+vector, so the payload is 16-byte aligned and can be viewed in place with
+`numpy.frombuffer`:
+
+    offset  size  field
+    0       4     magic b"UEMB"
+    4       1     format version (1)
+    5       1     dtype code: 0 = float32, 1 = float16, 2 = int8
+    6       2     reserved (0)
+    8       4     dimension (uint32)
+    12      4     scale (float32; int8 value * scale = float, 1.0 otherwise)
+
+Blobs without the magic are legacy raw float32 vectors and still decode.
+float16 halves and int8 quarters the size of a float32 vector; both keep
+cosine similarity well within face-matching tolerance.
+"""
+import struct
+from typing import Optional, Sequence, Tuple
+
+from app.core.errors import FeatureUnavailable, InvalidEmbedding
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+MAGIC = b"UEMB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIf")
+
+_DTYPES = {0: "<f4", 1: "<f2", 2: "i1"}
+_CODES = {"float32": 0, "float16": 1, "int8": 2}
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise FeatureUnavailable("Face matching requires numpy to be installed")
+
+
+def encode_embedding(vec: Sequence[float], dtype: str = "float16") -> bytes:
+    """Pack a vector into the versioned format using `dtype` (float32/float16/int8)."""
+    require_numpy()
+    if dtype not in _CODES:
+        raise ValueError(f"unsupported embedding dtype {dtype!r}")
+    arr = np.asarray(vec, dtype=np.float32).reshape(-1)
+    if not arr.size or not np.all(np.isfinite(arr)):
+        raise InvalidEmbedding("Embedding must be a non-empty vector of finite values")
+    code = _CODES[dtype]
+    scale = 1.0
+    if code == 2:
+        peak = float(np.max(np.abs(arr)))
+        scale = peak / 127.0 if peak else 1.0
+        body = np.clip(np.rint(arr / scale), -127, 127).astype("i1")
+    else:
+        body = arr.astype(_DTYPES[code])
+    return HEADER.pack(MAGIC, VERSION, code, 0, arr.size, scale) + body.tobytes()
+
+
+def embedding_view(raw: Optional[bytes]) -> Tuple["np.ndarray", float]:
+    """Return a zero-copy `numpy.frombuffer` view of the stored vector and its scale."""
+    require_numpy()
+    if not raw:
+        raise InvalidEmbedding("Embedding is empty")
+    if raw[:4] != MAGIC:
+        # legacy blob: bare little-endian float32 values
+        if len(raw) % 4:
+            raise InvalidEmbedding("Embedding must be a float32 byte string or a UEMB blob")
+        return np.frombuffer(raw, dtype="<f4"), 1.0
+    if len(raw) < HEADER.size:
+        raise InvalidEmbedding("Embedding header is truncated")
+    _, version, code, _, dim, scale = HEADER.unpack_from(raw)
+    if version != VERSION or code not in _DTYPES:
+        raise InvalidEmbedding(f"Unsupported embedding format v{version}/dtype {code}")
+    if len(raw) < HEADER.size + dim * np.dtype(_DTYPES[code]).itemsize:
+        raise InvalidEmbedding("Embedding payload is truncated")
+    return np.frombuffer(raw, dtype=_DTYPES[code], count=dim, offset=HEADER.size), scale
+
+
+def decode_embedding(raw: Optional[bytes], dimension: Optional[int] = None):
+    """Decode a stored embedding to a float32 vector, checking `dimension` when given."""
+    view, scale = embedding_view(raw)
+    if dimension and view.shape[0] != dimension:
+        raise InvalidEmbedding(f"Embedding has {view.shape[0]} values, expected {dimension}")
+    if view.dtype == np.int8:
+        return view.astype(np.float32) * np.float32(scale)
+    return view.astype(np.float32, copy=False)
+
+
+def normalize_embedding(vec):
+    vec = np.asarray(vec, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vec))
+    if not norm or not np.isfinite(norm):
+        raise InvalidEmbedding("Embedding must be a finite, non-zero vector")
+    return vec / norm
@@ -0,0 +1,210 @@
+"""In-process vector index over active biometric templates for 1:N face matching.
+
+Each (model, dimension) pair gets its own index: a float32 matrix of
+L2-normalized embeddings, so cosine similarity against a probe is one
+matrix-vector product followed by a partial sort for the top-k.
+
+The index is process-local. It is loaded lazily from the database on first
+use, patched in place by BiometricTemplateService on create/update/status
+changes, and periodically caught up from `updated_at` so writes made by
+other workers show up within `FACE_INDEX_SYNC_SECONDS`.
+
+`updated_at` is `now()`, the start time of the writing transaction, so a
+row can commit after rows stamped later than it have already been pulled.
+Catch-up pulls therefore re-read `FACE_INDEX_SYNC_OVERLAP_SECONDS` behind
+the watermark, and every `FACE_INDEX_FULL_RELOAD_SECONDS` the index is
+reloaded in full (dropping templates no longer active) to cover
+transactions that ran longer than the overlap.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.errors import InvalidEmbedding
+from app.models.biometric_template import BiometricTemplate
+from app.utils.embedding import decode_embedding, normalize_embedding, require_numpy
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+
+class Match(NamedTuple):
+    student_id: Optional[int]
+    template_id: int
+    similarity: float
+
+
+class _Shard:
+    """Normalized vectors of one (model, dimension); rows are kept dense."""
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+        self.size = 0
+        self.matrix = np.empty((0, dimension), dtype=np.float32)
+        self.template_ids = np.empty(0, dtype=np.int64)
+        self.student_ids = np.empty(0, dtype=np.int64)  # -1 when unassigned
+        self.rows: Dict[int, int] = {}
+
+    def _grow(self) -> None:
+        cap = max(64, self.matrix.shape[0] * 2)
+        matrix = np.empty((cap, self.dimension), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        template_ids = np.empty(cap, dtype=np.int64)
+        template_ids[: self.size] = self.template_ids[: self.size]
+        student_ids = np.empty(cap, dtype=np.int64)
+        student_ids[: self.size] = self.student_ids[: self.size]
+        self.matrix, self.template_ids, self.student_ids = matrix, template_ids, student_ids
+
+    def upsert(self, template_id: int, student_id: Optional[int], vec) -> None:
+        row = self.rows.get(template_id)
+        if row is None:
+            if self.size == self.matrix.shape[0]:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[template_id] = row
+        self.matrix[row] = vec
+        self.template_ids[row] = template_id
+        self.student_ids[row] = -1 if student_id is None else student_id
+
+    def remove(self, template_id: int) -> None:
+        row = self.rows.pop(template_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            # move the last row into the hole to keep the matrix dense
+            self.matrix[row] = self.matrix[last]
+            self.template_ids[row] = self.template_ids[last]
+            self.student_ids[row] = self.student_ids[last]
+            self.rows[int(self.template_ids[row])] = row
+        self.size = last
+
+    def search(self, probe, k: int) -> List[Match]:
+        if not self.size:
+            return []
+        scores = self.matrix[: self.size] @ probe
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k] if k < self.size else np.arange(self.size)
+        top = top[np.argsort(-scores[top])]
+        return [
+            Match(None if self.student_ids[i] < 0 else int(self.student_ids[i]), int(self.template_ids[i]), min(1.0, float(scores[i])))
+            for i in top
+        ]
+
+
+class FaceIndex:
+    def __init__(self) -> None:
+        self._shards: Dict[Tuple[Optional[str], int], _Shard] = {}
+        self._where: Dict[int, Tuple[Optional[str], int]] = {}  # template id -> shard key
+        self._lock = threading.Lock()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._watermark: Optional[datetime] = None
+        self._synced_at = 0.0
+        self._reloaded_at = 0.0
+
+    def _apply(self, template_id: int, student_id: Optional[int], raw: Optional[bytes], model: Optional[str], dimension: Optional[int], active: int) -> None:
+        vec = None
+        if active == 1 and raw:
+            try:
+                vec = normalize_embedding(decode_embedding(raw, dimension))
+            except InvalidEmbedding:
+                vec = None
+        with self._lock:
+            old = self._where.pop(template_id, None)
+            if old is not None:
+                self._shards[old].remove(template_id)
+            if vec is None:
+                return
+            key = (model, vec.shape[0])
+            shard = self._shards.get(key)
+            if shard is None:
+                shard = self._shards[key] = _Shard(vec.shape[0])
+            shard.upsert(template_id, student_id, vec)
+            self._where[template_id] = key
+
+    def apply(self, row: BiometricTemplate) -> None:
+        """Reflect one template row (after create/update/status change)."""
+        if np is None or not self._loaded:
+            return
+        # the watermark is left alone: only a pull may advance it, otherwise
+        # older commits from other workers could be skipped
+        self._apply(row.id, row.student_id, row.embedding, row.model, row.dimension, row.active)
+
+    async def _pull(self, db: AsyncSession, since: Optional[datetime]) -> None:
+        """Apply rows changed since `since`, or reload every active row when it is None."""
+        M = BiometricTemplate
+        stmt = select(M.id, M.student_id, M.embedding, M.model, M.dimension, M.active, M.updated_at)
+        if since is None:
+            stmt = stmt.where(M.active == 1)
+        else:
+            # rows inside the overlap are re-read every pull; applying is idempotent
+            stmt = stmt.where(M.updated_at >= since)
+        seen = set()
+        result = await db.stream(stmt.execution_options(yield_per=2000))
+        async for tid, sid, raw, model, dim, active, updated_at in result:
+            self._apply(tid, sid, raw, model, dim, active)
+            seen.add(tid)
+            if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+        if since is None:
+            # a full reload only sees active rows: drop whatever was deactivated unseen
+            with self._lock:
+                stale = [tid for tid in self._where if tid not in seen]
+            for tid in stale:
+                self._apply(tid, None, None, None, None, 0)
+
+    def _due(self, now: float) -> bool:
+        return not self._loaded or now - self._synced_at >= settings.FACE_INDEX_SYNC_SECONDS
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        """Load the index on first use; afterwards pull changed rows at most every sync interval."""
+        require_numpy()
+        if not self._due(time.monotonic()):
+            return
+        async with self._load_lock:
+            now = time.monotonic()
+            if not self._due(now):
+                return
+            full = (
+                not self._loaded
+                or self._watermark is None
+                or now - self._reloaded_at >= settings.FACE_INDEX_FULL_RELOAD_SECONDS
+            )
+            if full:
+                await self._pull(db, None)
+                self._reloaded_at = now
+            else:
+                await self._pull(db, self._watermark - timedelta(seconds=settings.FACE_INDEX_SYNC_OVERLAP_SECONDS))
+            self._loaded = True
+            self._synced_at = now
+
+    def search(self, embedding: Sequence[float], k: int = 1, model: Optional[str] = None) -> List[Match]:
+        """Top-k active templates by cosine similarity to `embedding`."""
+        require_numpy()
+        probe = normalize_embedding(embedding)
+        with self._lock:
+            shards = [s for (m, dim), s in self._shards.items() if dim == probe.shape[0] and (model is None or m == model)]
+            matches = [m for s in shards for m in s.search(probe, k)]
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches[:k]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shards.clear()
+            self._where.clear()
+            self._loaded = False
+            self._watermark = None
+            self._reloaded_at = 0.0
+
+
+face_index = FaceIndex()
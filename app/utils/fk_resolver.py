@@ -1,18 +1,88 @@
-from typing import Any, Dict, Mapping
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Integer, literal_column, or_, select, union_all
 from fastapi import HTTPException
+from app.core.config import settings
+
+# Process-local cache of (table, global_id) -> id. global_ids never change once
+# assigned, so entries only need a TTL to bound staleness after hard deletes.
+_FK_CACHE: "OrderedDict[Tuple[str, str], Tuple[int, float]]" = OrderedDict()
+_FK_CACHE_MAX = 50_000
+_fk_cache_lock = threading.Lock()
+
+
+def _cache_get(table: str, global_id: str, now: float) -> Optional[int]:
+    with _fk_cache_lock:
+        hit = _FK_CACHE.get((table, global_id))
+        if hit is None:
+            return None
+        if hit[1] <= now:
+            del _FK_CACHE[(table, global_id)]
+            return None
+        _FK_CACHE.move_to_end((table, global_id))
+        return hit[0]
+
+
+def _cache_put(table: str, global_id: str, pk: int, now: float) -> None:
+    ttl = settings.FK_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    with _fk_cache_lock:
+        _FK_CACHE[(table, global_id)] = (pk, now + ttl)
+        _FK_CACHE.move_to_end((table, global_id))
+        while len(_FK_CACHE) > _FK_CACHE_MAX:
+            _FK_CACHE.popitem(last=False)
+
+
+def clear_fk_cache() -> None:
+    """Drop all cached global_id -> id mappings (e.g. after a hard delete)."""
+    with _fk_cache_lock:
+        _FK_CACHE.clear()
+
+
+async def _lookup_global_ids(db: AsyncSession, wanted: Iterable[Tuple[Any, str]]) -> Dict[Tuple[str, str], int]:
+    """Look up `(Model, global_id)` pairs in one round trip.
+
+    Builds one `global_id IN (...)` select per Model and joins them with
+    UNION ALL, tagging each branch with its position so rows map back to
+    their table. Found mappings are added to the cache.
+    """
+    by_model: Dict[Any, Set[str]] = {}
+    for Model, gid in wanted:
+        by_model.setdefault(Model, set()).add(gid)
+    if not by_model:
+        return {}
+    models = list(by_model)
+    selects = [
+        select(literal_column(str(i), Integer).label("m"), Model.id, getattr(Model, "global_id")).where(getattr(Model, "global_id").in_(by_model[Model]))
+        for i, Model in enumerate(models)
+    ]
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    result = await db.execute(stmt)
+    now = time.monotonic()
+    found: Dict[Tuple[str, str], int] = {}
+    for m, pk, gid in result.all():
+        table = models[m].__tablename__
+        found[(table, gid)] = int(pk)
+        _cache_put(table, gid, int(pk), now)
+    return found
 
 
 async def resolve_fk_ids(db: AsyncSession, data: Dict[str, Any], mapping: Mapping[str, Any]) -> Dict[str, Any]:
     """Resolve fields in `data` using `mapping` where mapping maps field -> Model.
 
     If a value is an int or numeric string it will be used as-is. If it's a
-    non-numeric string it will be treated as a `global_id` and the corresponding
-    Model will be queried for the numeric `id`.
+    non-numeric string it will be treated as a `global_id` and looked up for
+    the numeric `id`: first in the process-local cache, then all remaining
+    fields together in a single query.
 
     Raises HTTPException(400) if referenced resource not found.
     """
+    now = time.monotonic()
+    pending: Dict[str, Tuple[Any, str]] = {}
     for key, Model in mapping.items():
         if key not in data:
             continue
@@ -26,9 +96,81 @@ async def resolve_fk_ids(db: AsyncSession, data: Dict[str, Any], mapping: Mappin
             if s.isdigit():
                 data[key] = int(s)
                 continue
-            q = select(Model.id).where(getattr(Model, "global_id") == s)
-            result = await db.scalar(q)
-            if not result:
+            pk = _cache_get(Model.__tablename__, s, now)
+            if pk is not None:
+                data[key] = pk
+                continue
+            pending[key] = (Model, s)
+
+    if pending:
+        found = await _lookup_global_ids(db, pending.values())
+        for key, (Model, s) in pending.items():
+            pk = found.get((Model.__tablename__, s))
+            if pk is None:
                 raise HTTPException(status_code=400, detail=f"{key} with global_id '{s}' not found")
-            data[key] = int(result)
+            data[key] = pk
     return data
+
+
+async def resolve_fk_ids_many(db: AsyncSession, rows: List[Dict[str, Any]], mapping: Mapping[str, Any]) -> List[Optional[str]]:
+    """Resolve FK fields for many rows with one query per referenced Model.
+
+    Values are collected across all rows (numeric ids and global_ids alike)
+    and looked up with a single `WHERE global_id IN (...) OR id IN (...)` per
+    Model, so numeric ids are checked for existence too. Rows are updated in
+    place; the returned list holds an error message (or None) per row instead
+    of raising, so one bad row does not fail the whole batch.
+    """
+    errors: List[Optional[str]] = [None] * len(rows)
+    wanted: Dict[Any, Tuple[Set[str], Set[int]]] = {}
+    for row in rows:
+        for key, Model in mapping.items():
+            val = row.get(key)
+            if val is None:
+                continue
+            gids, ids = wanted.setdefault(Model, (set(), set()))
+            if isinstance(val, int):
+                ids.add(val)
+            elif isinstance(val, str):
+                s = val.strip()
+                if s.isdigit():
+                    ids.add(int(s))
+                else:
+                    gids.add(s)
+
+    by_gid: Dict[Any, Dict[str, int]] = {}
+    known_ids: Dict[Any, Set[int]] = {}
+    for Model, (gids, ids) in wanted.items():
+        conds = []
+        if gids:
+            conds.append(getattr(Model, "global_id").in_(gids))
+        if ids:
+            conds.append(Model.id.in_(ids))
+        result = await db.execute(select(Model.id, getattr(Model, "global_id")).where(or_(*conds)))
+        found = result.all()
+        by_gid[Model] = {gid: int(pk) for pk, gid in found}
+        known_ids[Model] = {int(pk) for pk, _ in found}
+        now = time.monotonic()
+        for gid, pk in by_gid[Model].items():
+            _cache_put(Model.__tablename__, gid, pk, now)
+
+    for i, row in enumerate(rows):
+        for key, Model in mapping.items():
+            val = row.get(key)
+            if val is None:
+                continue
+            if isinstance(val, str) and not val.strip().isdigit():
+                s = val.strip()
+                pk = by_gid.get(Model, {}).get(s)
+                if pk is None:
+                    errors[i] = errors[i] or f"{key} with global_id '{s}' not found"
+                    continue
+                row[key] = pk
+                continue
+            if isinstance(val, (int, str)):
+                pk = int(val)
+                if pk not in known_ids.get(Model, set()):
+                    errors[i] = errors[i] or f"{key} {pk} not found"
+                    continue
+                row[key] = pk
+    return errors
@@ -0,0 +1,51 @@
+"""Downscale and re-encode uploaded images before they are stored.
+
+Captured face images arrive at full camera resolution; storing them at a
+bounded size (`UPLOAD_IMAGE_MAX_SIDE`, JPEG at `UPLOAD_IMAGE_QUALITY`) cuts
+upload time and storage. Pillow is optional: without it images are stored
+unchanged.
+"""
+import io
+import logging
+from typing import Tuple
+
+from app.core.config import settings
+
+try:
+    from PIL import Image, ImageOps
+except Exception:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidImage(ValueError):
+    """Raised when the upload cannot be decoded as an image."""
+
+
+def prepare_image(data: bytes, content_type: str) -> Tuple[bytes, str]:
+    """Return (bytes, content_type) bounded to UPLOAD_IMAGE_MAX_SIDE. CPU-bound; run off the loop."""
+    if Image is None:
+        return data, content_type
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception as exc:
+        raise InvalidImage(f"Could not decode image: {exc}") from exc
+    if getattr(img, "is_animated", False):
+        # keep animations as-is rather than flattening them to one frame
+        return data, content_type
+    max_side = settings.UPLOAD_IMAGE_MAX_SIDE
+    if max(img.size) <= max_side and content_type == "image/jpeg" and len(data) <= settings.UPLOAD_IMAGE_PASSTHROUGH_BYTES:
+        return data, content_type
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=settings.UPLOAD_IMAGE_QUALITY, optimize=True)
+    encoded = out.getvalue()
+    if len(encoded) >= len(data) and max(img.size) <= max_side:
+        # re-encoding did not help; keep the original
+        return data, content_type
+    return encoded, "image/jpeg"
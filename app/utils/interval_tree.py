@@ -0,0 +1,63 @@
+"""Static interval tree for half-open [start, end) intervals.
+
+Intervals are sorted by start and laid out as an implicit balanced binary
+tree over that array (each node is the midpoint of its range), with every
+node holding the largest end in its subtree. An overlap query skips any
+subtree whose largest end is <= the query start and anything right of a
+node starting at or after the query end, so it costs O(log n + k) for k hits.
+
+Used to validate session schedules in memory; the database enforces the
+same rule with exclusion constraints (db/sql/005_session_exclusion.sql).
+"""
+from typing import Any, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalTree(Generic[T]):
+    def __init__(self, items: Iterable[Tuple[Any, Any, T]]) -> None:
+        self._items: List[Tuple[Any, Any, T]] = sorted(items, key=lambda item: item[0])
+        self._max_end: List[Any] = [None] * len(self._items)
+        if self._items:
+            self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int) -> Any:
+        mid = (lo + hi) // 2
+        best = self._items[mid][1]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self._max_end[mid] = best
+        return best
+
+    def overlapping(self, start: Any, end: Any) -> List[T]:
+        """Payloads of intervals overlapping [start, end), in start order."""
+        out: List[T] = []
+        # explicit in-order walk over (lo, hi, left_done) ranges so results come out sorted
+        stack = [(0, len(self._items), False)]
+        while stack:
+            lo, hi, left_done = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if not left_done:
+                if self._max_end[mid] > start:
+                    stack.append((lo, hi, True))
+                    stack.append((lo, mid, False))
+                continue
+            s, e, payload = self._items[mid]
+            if s >= end:
+                # this node and everything to its right start too late
+                continue
+            if e > start:
+                out.append(payload)
+            stack.append((mid + 1, hi, False))
+        return out
+
+    def first_overlap(self, start: Any, end: Any):
+        hits = self.overlapping(start, end)
+        return hits[0] if hits else None
@@ -1,4 +1,7 @@
+import hashlib
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 import jwt
@@ -28,3 +31,84 @@ def decode_access_token(token: str, secret: str):
         raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
+
+
+# Recently verified tokens: (sha256(token), secret) -> (exp, claims).
+# Only successful verifications are cached; entries are dropped once their
+# `exp` passes so an expired token always goes back through jwt.decode.
+_VERIFIED_TOKENS_MAX = 4096
+_verified_tokens: "OrderedDict[tuple, Tuple[Optional[float], dict]]" = OrderedDict()
+# sync dependencies run in the threadpool, so guard the OrderedDict
+_verified_lock = threading.Lock()
+
+
+def _evict_verified(now: float) -> None:
+    """Drop expired entries, then least-recently-used ones, until under the cap."""
+    expired = [k for k, (exp, _) in _verified_tokens.items() if exp is not None and exp <= now]
+    for k in expired:
+        del _verified_tokens[k]
+    while len(_verified_tokens) >= _VERIFIED_TOKENS_MAX:
+        _verified_tokens.popitem(last=False)
+
+
+def decode_access_token_cached(token: str, secret: str):
+    """Like `decode_access_token`, but reuses recent successful verifications.
+
+    Returns a fresh copy of the claims dict so callers may mutate it.
+    """
+    if not token:
+        return None
+    key = (hashlib.sha256(token.encode("utf-8")).digest(), secret)
+    now = time.time()
+    with _verified_lock:
+        hit = _verified_tokens.get(key)
+        if hit is not None:
+            exp, claims = hit
+            if exp is None or exp > now:
+                _verified_tokens.move_to_end(key)
+                return dict(claims)
+            del _verified_tokens[key]
+
+    payload = decode_access_token(token, secret)
+    if isinstance(payload, dict):
+        exp = payload.get("exp")
+        with _verified_lock:
+            if len(_verified_tokens) >= _VERIFIED_TOKENS_MAX:
+                _evict_verified(now)
+            _verified_tokens[key] = (float(exp) if isinstance(exp, (int, float)) else None, dict(payload))
+    return payload
+
+
+def get_request_claims(request, secret: str) -> dict:
+    """Verify the request's Bearer token once and memoize the outcome on `request.state`.
+
+    Guards and services that need the claims within the same request call
+    this instead of decoding the header themselves. Raises HTTPException(401)
+    for a missing/malformed header or an invalid/expired token; failures are
+    memoized as well so later callers see the same error without re-verifying.
+    """
+    memo = getattr(request.state, "jwt_claims", None)
+    if memo is None:
+        memo = {}
+        request.state.jwt_claims = memo
+    if secret in memo:
+        outcome = memo[secret]
+        if isinstance(outcome, HTTPException):
+            raise outcome
+        return outcome
+
+    try:
+        auth = request.headers.get("Authorization")
+        if not auth:
+            raise HTTPException(status_code=401, detail="Missing Authorization header")
+        parts = auth.split()
+        if len(parts) != 2 or parts[0].lower() != "bearer":
+            raise HTTPException(status_code=401, detail="Invalid Authorization header")
+        payload = decode_access_token_cached(parts[1], secret)
+        if not payload:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+    except HTTPException as exc:
+        memo[secret] = exc
+        raise
+    memo[secret] = payload
+    return payload
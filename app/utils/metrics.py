@@ -0,0 +1,193 @@
+"""Prometheus metrics for the /metrics endpoint.
+
+`MetricsMiddleware` records, per matched route template (never the raw
+path, to keep label cardinality bounded): request counts by status,
+latency histograms, in-flight requests and the number/time of SQL
+statements each request ran (counted by app.db.instrumentation).
+
+Process-level state that already has its own counters (DB pools, settings
+cache, password hasher, blob replicator) is copied into gauges and
+counters by `refresh()`, which a background task runs every
+`METRICS_REFRESH_SECONDS` and /metrics runs before rendering, so the
+request path never touches it.
+
+With several gunicorn workers set `METRICS_MULTIPROC_DIR` (or
+PROMETHEUS_MULTIPROC_DIR) to an empty directory shared by the workers:
+each worker writes its samples to mmap files there and /metrics, served by
+whichever worker, aggregates all of them. app/gunicorn_conf.py clears the
+directory on start and drops dead workers' gauges. Requires the
+`prometheus_client` package; without it the middleware is not installed
+and /metrics answers 503.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Tuple
+
+from app.core.config import settings
+from app.db.instrumentation import current_stats, route_label
+
+# must be in the environment before prometheus_client is imported
+if settings.METRICS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+try:
+    import prometheus_client as prom
+    from prometheus_client import multiprocess
+except Exception:
+    prom = None
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+CONTENT_TYPE = prom.CONTENT_TYPE_LATEST if prom is not None else "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+if prom is not None:
+    REQUESTS = prom.Counter("uams_http_requests_total", "HTTP requests", ["method", "route", "status"])
+    LATENCY = prom.Histogram("uams_http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS)
+    IN_FLIGHT = prom.Gauge("uams_http_requests_in_flight", "HTTP requests being served", multiprocess_mode="livesum")
+    DB_QUERIES = prom.Histogram("uams_db_queries_per_request", "SQL statements run by one request", ["route"], buckets=QUERY_COUNT_BUCKETS)
+    DB_TIME = prom.Histogram("uams_db_query_seconds_per_request", "Time one request spent in SQL statements", ["route"], buckets=QUERY_TIME_BUCKETS)
+
+    POOL_GAUGES = {
+        name: prom.Gauge(f"uams_db_pool_{name}", f"DB pool {name.replace('_', ' ')}", ["pool"], multiprocess_mode="livesum")
+        for name in ("size", "checkedout", "checkedin", "overflow")
+    }
+    POOL_COUNTERS = {
+        name: prom.Counter(f"uams_db_pool_{name}", f"DB pool {name.replace('_', ' ')}", ["pool"])
+        for name in ("checkouts", "connects", "invalidations", "timeouts", "connect_seconds", "wait_seconds")
+    }
+    POOL_WAIT_MAX = prom.Gauge(
+        "uams_db_pool_wait_seconds_max", "Longest DB pool checkout wait for a free connection (excludes connecting)", ["pool"],
+        multiprocess_mode="max",
+    )
+    SETTINGS_CACHE = prom.Counter("uams_settings_cache_lookups", "Settings cache lookups", ["result"])
+    SETTINGS_CACHE_RELOADS = prom.Counter("uams_settings_cache_reloads", "Settings cache full reloads")
+    HASHER_IN_FLIGHT = prom.Gauge("uams_password_hash_in_flight", "Password hash/verify calls running or queued", multiprocess_mode="livesum")
+    HASHER_COMPLETED = prom.Counter("uams_password_hash_completed", "Password hash/verify calls completed")
+    BLOB_PENDING = prom.Gauge("uams_blob_replication_pending", "Blobs waiting for replication", multiprocess_mode="livesum")
+    BLOB_RESULTS = prom.Counter("uams_blob_replication", "Blob replication attempts", ["result"])
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no body buffering) recording per-route request metrics."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            # scoped by QueryTrackingMiddleware, which wraps this one
+            stats = current_stats()
+            method, route = scope["method"], route_label(scope)
+            REQUESTS.labels(method, route, str(status["code"])).inc()
+            LATENCY.labels(method, route).observe(elapsed)
+            if stats is not None:
+                DB_QUERIES.labels(route).observe(stats.count)
+                DB_TIME.labels(route).observe(stats.seconds)
+
+
+class _Deltas:
+    """Turns cumulative per-process totals into Counter increments."""
+
+    def __init__(self) -> None:
+        self._last: Dict[Tuple, float] = {}
+
+    def inc(self, counter, key: Tuple, total: float) -> None:
+        last = self._last.get(key, 0)
+        # a total that went down was reset and counts from zero again
+        delta = total - last if total >= last else total
+        if delta > 0:
+            counter.inc(delta)
+        self._last[key] = total
+
+
+_deltas = _Deltas()
+
+
+def refresh() -> None:
+    """Copy process-level stats into the gauges/counters."""
+    if prom is None:
+        return
+    from app.db.pool import pool_stats
+    from app.db.session import engine, read_engine
+    from app.utils.passwords import hasher_stats
+    from app.utils.settings_cache import settings_cache
+
+    for name, eng in (("primary", engine), ("replica", read_engine)):
+        if eng is None:
+            continue
+        stats = pool_stats(eng)
+        for key, gauge in POOL_GAUGES.items():
+            if key in stats:
+                gauge.labels(name).set(stats[key])
+        for key, counter in POOL_COUNTERS.items():
+            total = stats.get(f"{key}_sum" if key.endswith("_seconds") else key)
+            if total is not None:
+                _deltas.inc(counter.labels(name), ("pool", name, key), total)
+        if "wait_seconds_max" in stats:
+            POOL_WAIT_MAX.labels(name).set(stats["wait_seconds_max"])
+
+    cache = settings_cache.stats()
+    _deltas.inc(SETTINGS_CACHE.labels("hit"), ("settings", "hit"), cache["hits"])
+    _deltas.inc(SETTINGS_CACHE.labels("miss"), ("settings", "miss"), cache["misses"])
+    _deltas.inc(SETTINGS_CACHE_RELOADS, ("settings", "reloads"), cache["reloads"])
+
+    hasher = hasher_stats()
+    HASHER_IN_FLIGHT.set(hasher["in_flight"])
+    _deltas.inc(HASHER_COMPLETED, ("hasher", "completed"), hasher["completed"])
+
+    if settings.UPLOAD_STORAGE_BACKEND == "blob":
+        from app.utils.blob_store import get_blob_storage
+
+        blob = get_blob_storage().replicator.stats()
+        BLOB_PENDING.set(blob["pending"])
+        _deltas.inc(BLOB_RESULTS.labels("replicated"), ("blob", "replicated"), blob["replicated"])
+        _deltas.inc(BLOB_RESULTS.labels("failed"), ("blob", "failed"), blob["failed"])
+
+
+async def run_refresher() -> None:
+    """Background task: keep the process-level metrics of this worker current."""
+    while True:
+        try:
+            refresh()
+        except Exception:
+            logger.warning("metrics refresh failed", exc_info=True)
+        await asyncio.sleep(settings.METRICS_REFRESH_SECONDS)
+
+
+def render() -> bytes:
+    """Exposition text for all workers (multiprocess) or this process."""
+    refresh()
+    if MULTIPROCESS:
+        registry = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return prom.generate_latest(registry)
+    return prom.generate_latest()
+
+
+def mark_process_dead(pid: int) -> None:
+    """gunicorn child_exit hook: drop a dead worker's live gauges."""
+    if prom is not None and MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,81 @@
+"""Password hashing/verification off the event loop.
+
+pbkdf2_sha256 costs tens of milliseconds of CPU per call. Running it inline
+in a coroutine stalls every other request in the worker, so all hashing goes
+through a dedicated, size-limited thread pool (hashlib's PBKDF2 releases the
+GIL, so the threads really run in parallel).
+
+At most `PASSWORD_HASH_WORKERS` hashes run at once and at most
+`PASSWORD_HASH_MAX_PENDING` are admitted in total; further callers wait on
+a semaphore without holding a pool slot. `hasher_stats()` reports the
+current queue depth for monitoring.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_admission: Dict[int, asyncio.Semaphore] = {}  # one per event loop
+# only touched from the event loop thread
+_stats = {"in_flight": 0, "max_queue_depth": 0, "completed": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwd-hash")
+    return _executor
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop_id = id(asyncio.get_running_loop())
+    sem = _admission.get(loop_id)
+    if sem is None:
+        sem = _admission[loop_id] = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+    return sem
+
+
+async def _run(fn, *args):
+    _stats["in_flight"] += 1
+    depth = _stats["in_flight"] - settings.PASSWORD_HASH_WORKERS
+    if depth > _stats["max_queue_depth"]:
+        _stats["max_queue_depth"] = depth
+    try:
+        async with _semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["completed"] += 1
+
+
+async def hash_password(password: str) -> str:
+    """Hash `password` on the hashing pool. Raises ValueError like passlib."""
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    """Verify `password` against `hashed` on the hashing pool. Raises ValueError like passlib."""
+    return await _run(pwd_context.verify, password, hashed)
+
+
+def hasher_stats() -> Dict[str, int]:
+    """Snapshot of pool usage; `queue_depth` is calls waiting for a hashing thread."""
+    in_flight = _stats["in_flight"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "in_flight": in_flight,
+        "queue_depth": max(0, in_flight - settings.PASSWORD_HASH_WORKERS),
+        "max_queue_depth": _stats["max_queue_depth"],
+        "completed": _stats["completed"],
+    }
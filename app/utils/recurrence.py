@@ -0,0 +1,56 @@
+"""Expand a recurrence rule into the dates it occurs on.
+
+A small subset of RFC 5545 RRULE, enough for class timetables: daily or
+weekly frequency, an interval (every N days/weeks), weekdays for weekly
+rules, an optional occurrence count and excluded dates (holidays). Weeks
+are counted from the Monday of the range's first week, so "every 2 weeks
+on Mon/Thu" keeps both days in the same week.
+"""
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+DAILY = "daily"
+WEEKLY = "weekly"
+
+
+def expand_dates(
+    start: date,
+    end: date,
+    freq: str = WEEKLY,
+    interval: int = 1,
+    weekdays: Optional[Iterable[int]] = None,
+    count: Optional[int] = None,
+    exclude: Iterable[date] = (),
+) -> List[date]:
+    """Dates in [start, end] matching the rule; weekdays are 0=Monday..6=Sunday.
+
+    A weekly rule without weekdays repeats on `start`'s weekday. `count`
+    limits generated occurrences before exclusions are removed, as EXDATE
+    does in RFC 5545.
+    """
+    if end < start:
+        return []
+    if interval < 1:
+        raise ValueError("interval must be >= 1")
+    if freq not in (DAILY, WEEKLY):
+        raise ValueError(f"unsupported frequency '{freq}'")
+    days = set(weekdays) if weekdays else {start.weekday()}
+    if not days <= set(range(7)):
+        raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+
+    week0 = start - timedelta(days=start.weekday())
+    out: List[date] = []
+    day = start
+    while day <= end:
+        if freq == DAILY:
+            hit = (day - start).days % interval == 0
+        else:
+            hit = day.weekday() in days and ((day - week0).days // 7) % interval == 0
+        if hit:
+            out.append(day)
+            if count is not None and len(out) >= count:
+                break
+        day += timedelta(days=1)
+
+    skip = set(exclude)
+    return [d for d in out if d not in skip]
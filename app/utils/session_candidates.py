@@ -0,0 +1,178 @@
+"""Per-session candidate embeddings for 1:K face verification at check-in.
+
+The only plausible matches for a session are students enrolled in its
+offering (sessions.offering_id -> enrollments.student_id ->
+biometric_templates), so each session gets a small memory-resident block of
+their normalized embeddings. Verification is then a dot product against
+K = class size rows instead of a search over every template.
+
+Blocks are warmed shortly before a session starts by `run_warmer`, built
+lazily on first use otherwise, and evicted once the session ends, is
+canceled/completed, or when a template or enrollment that feeds it changes.
+Like the global face index, the cache is process-local; `SESSION_CANDIDATES_TTL_SECONDS`
+bounds how long a block can miss changes made by another worker.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.errors import InvalidEmbedding, NotFound
+from app.models.biometric_template import BiometricTemplate
+from app.models.enrollment import Enrollment
+from app.models.session import Session
+from app.utils.embedding import decode_embedding, normalize_embedding, require_numpy
+from app.utils.face_index import Match
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Block(NamedTuple):
+    offering_id: int
+    ends_at: datetime
+    built_at: float
+    student_ids: Set[int]
+    # dimension -> (matrix, template ids, student ids)
+    by_dim: Dict[int, tuple]
+
+
+class SessionCandidates:
+    def __init__(self) -> None:
+        self._blocks: Dict[int, _Block] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[int, asyncio.Lock] = {}
+
+    async def _build(self, db: AsyncSession, session_id: int) -> _Block:
+        sess = (await db.execute(
+            select(Session.offering_id, Session.end_datetime).where(Session.id == session_id, Session.active == 1)
+        )).first()
+        if sess is None:
+            raise NotFound("Session not found")
+        offering_id, ends_at = sess
+        BT = BiometricTemplate
+        rows = (await db.execute(
+            select(BT.id, BT.student_id, BT.embedding, BT.dimension)
+            .join(Enrollment, Enrollment.student_id == BT.student_id)
+            .where(Enrollment.offering_id == offering_id, Enrollment.active == 1, BT.active == 1)
+        )).all()
+        grouped: Dict[int, List[tuple]] = {}
+        for tid, sid, raw, dim in rows:
+            try:
+                vec = normalize_embedding(decode_embedding(raw, dim))
+            except InvalidEmbedding:
+                continue
+            grouped.setdefault(vec.shape[0], []).append((tid, sid, vec))
+        by_dim = {
+            dim: (
+                np.stack([v for _, _, v in items]),
+                np.array([t for t, _, _ in items], dtype=np.int64),
+                np.array([s for _, s, _ in items], dtype=np.int64),
+            )
+            for dim, items in grouped.items()
+        }
+        if ends_at is not None and ends_at.tzinfo is None:
+            ends_at = ends_at.replace(tzinfo=timezone.utc)
+        return _Block(offering_id, ends_at, time.monotonic(), {sid for _, sid, _, _ in rows}, by_dim)
+
+    def _fresh(self, block: Optional[_Block]) -> bool:
+        return (
+            block is not None
+            and time.monotonic() - block.built_at < settings.SESSION_CANDIDATES_TTL_SECONDS
+            and (block.ends_at is None or block.ends_at > datetime.now(timezone.utc))
+        )
+
+    async def warm(self, db: AsyncSession, session_id: int) -> _Block:
+        """Return the session's block, building it if missing or stale."""
+        require_numpy()
+        block = self._blocks.get(session_id)
+        if self._fresh(block):
+            return block
+        lock = self._build_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            block = self._blocks.get(session_id)
+            if not self._fresh(block):
+                block = await self._build(db, session_id)
+                with self._lock:
+                    self._blocks[session_id] = block
+        self._build_locks.pop(session_id, None)
+        return block
+
+    async def match(self, db: AsyncSession, session_id: int, embedding: Sequence[float]) -> Optional[Match]:
+        """Best enrolled candidate for `embedding`, or None if the session has no usable templates."""
+        block = await self.warm(db, session_id)
+        probe = normalize_embedding(embedding)
+        entry = block.by_dim.get(probe.shape[0])
+        if entry is None:
+            return None
+        matrix, template_ids, student_ids = entry
+        scores = matrix @ probe
+        best = int(np.argmax(scores))
+        return Match(int(student_ids[best]), int(template_ids[best]), min(1.0, float(scores[best])))
+
+    def evict(self, session_id: int) -> None:
+        with self._lock:
+            self._blocks.pop(session_id, None)
+
+    def evict_offering(self, offering_id: int) -> None:
+        with self._lock:
+            for sid in [s for s, b in self._blocks.items() if b.offering_id == offering_id]:
+                del self._blocks[sid]
+
+    def evict_student(self, student_id: Optional[int]) -> None:
+        if student_id is None:
+            return
+        with self._lock:
+            for sid in [s for s, b in self._blocks.items() if student_id in b.student_ids]:
+                del self._blocks[sid]
+
+    def evict_ended(self) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for sid in [s for s, b in self._blocks.items() if b.ends_at is not None and b.ends_at <= now]:
+                del self._blocks[sid]
+
+    async def warm_upcoming(self, db: AsyncSession) -> int:
+        """Warm every active session starting within the lead window; drop ended ones."""
+        self.evict_ended()
+        now = datetime.now(timezone.utc)
+        lead = timedelta(seconds=settings.SESSION_WARM_LEAD_SECONDS)
+        ids = (await db.scalars(
+            select(Session.id).where(
+                Session.active == 1,
+                Session.status.notin_(("canceled", "completed")) | Session.status.is_(None),
+                Session.start_datetime <= now + lead,
+                Session.end_datetime > now,
+            )
+        )).all()
+        for session_id in ids:
+            if session_id not in self._blocks:
+                await self.warm(db, session_id)
+        return len(ids)
+
+    async def run_warmer(self, session_factory) -> None:
+        """Background loop: warm upcoming sessions every SESSION_WARM_INTERVAL_SECONDS."""
+        if np is None:
+            return
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.warm_upcoming(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("session candidate warm-up failed", exc_info=True)
+            await asyncio.sleep(settings.SESSION_WARM_INTERVAL_SECONDS)
+
+
+session_candidates = SessionCandidates()
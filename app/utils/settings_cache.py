@@ -0,0 +1,192 @@
+"""Process-wide cache of rows from the `settings` table.
+
+Every reader (auth dependencies, login TTLs, `request.state.setting`) goes
+through `settings_cache`. Each worker keeps an immutable snapshot of all
+settings tagged with a version stamp and an expiry:
+
+- within `SETTINGS_CACHE_TTL_SECONDS` the snapshot is served without I/O;
+- after that only the version stamp is checked, and the full table is
+  reloaded when the stamp has moved;
+- `invalidate()` (called after settings are written) drops the local
+  snapshot at once and, with the Redis backend, bumps the shared version
+  and publishes an invalidation so every worker drops its snapshot too.
+
+Backends (`SETTINGS_CACHE_BACKEND`):
+
+- "memory": the version stamp is `count(*)` + `max(updated_at)` of the
+  settings table, so other workers notice a change within one TTL.
+- "redis": version counter, a shared copy of the table and pub/sub live in
+  any Redis-protocol server at `SETTINGS_CACHE_URL` (Redis, Valkey, KeyDB,
+  ...), so a reload costs one HGETALL instead of a table scan and updates
+  are pushed immediately. Requires the `redis` package.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.setting import Setting
+
+try:
+    import redis.asyncio as aioredis
+except Exception:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot(NamedTuple):
+    version: str
+    values: Dict[str, Optional[str]]
+    expires_at: float
+
+
+async def _load_table(db: AsyncSession) -> Dict[str, Optional[str]]:
+    rows = await db.execute(select(Setting.key, Setting.value))
+    return {key: value for key, value in rows.all()}
+
+
+class MemoryBackend:
+    """No shared state; the settings table itself provides the version stamp."""
+
+    async def version(self, db: AsyncSession) -> str:
+        count, updated = (await db.execute(select(func.count(), func.max(Setting.updated_at)))).one()
+        return f"{count}:{updated.isoformat() if updated else ''}"
+
+    async def load(self, db: AsyncSession, version: str) -> Dict[str, Optional[str]]:
+        return await _load_table(db)
+
+    async def invalidate(self) -> None:
+        return None
+
+    async def listen(self, on_invalidate) -> None:
+        return None
+
+
+class RedisBackend:
+    """Shared version counter + hash copy of the table + invalidation channel."""
+
+    VERSION_KEY = "uams:settings:version"
+    DATA_KEY = "uams:settings:data"
+    CHANNEL = "uams:settings:invalidate"
+    _STAMP_FIELD = "\x00version"
+
+    def __init__(self, url: str, client=None) -> None:
+        if client is None and aioredis is None:
+            raise RuntimeError("SETTINGS_CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = client if client is not None else aioredis.from_url(url, decode_responses=True)
+
+    async def version(self, db: AsyncSession) -> str:
+        return str(await self.client.get(self.VERSION_KEY) or 0)
+
+    async def load(self, db: AsyncSession, version: str) -> Dict[str, Optional[str]]:
+        data = await self.client.hgetall(self.DATA_KEY)
+        if data.get(self._STAMP_FIELD) == version:
+            data.pop(self._STAMP_FIELD)
+            return data
+        values = await _load_table(db)
+        # NULL values are not representable in a hash; they read back as missing keys
+        mapping = {k: v for k, v in values.items() if v is not None}
+        mapping[self._STAMP_FIELD] = version
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.DATA_KEY)
+            pipe.hset(self.DATA_KEY, mapping=mapping)
+            await pipe.execute()
+        return values
+
+    async def invalidate(self) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(self.VERSION_KEY)
+            pipe.delete(self.DATA_KEY)
+            pipe.publish(self.CHANNEL, "1")
+            await pipe.execute()
+
+    async def listen(self, on_invalidate) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    on_invalidate()
+        finally:
+            await pubsub.aclose()
+
+
+def _make_backend():
+    if settings.SETTINGS_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.SETTINGS_CACHE_URL or "redis://localhost:6379/0")
+    return MemoryBackend()
+
+
+class SettingsCache:
+    def __init__(self, backend=None) -> None:
+        self._backend = backend
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = asyncio.Lock()
+        # hits: served from a fresh snapshot; misses: needed a version check; reloads: full loads
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _make_backend()
+        return self._backend
+
+    def values(self) -> Dict[str, Optional[str]]:
+        """Current snapshot without any I/O (may be empty before the first load)."""
+        snap = self._snapshot
+        return snap.values if snap is not None else {}
+
+    def _drop(self) -> None:
+        self._snapshot = None
+
+    async def refresh(self, db: AsyncSession, force: bool = False) -> Dict[str, Optional[str]]:
+        async with self._lock:
+            snap = self._snapshot
+            now = time.monotonic()
+            if snap is not None and not force and now < snap.expires_at:
+                return snap.values
+            version = await self.backend.version(db)
+            expires_at = now + settings.SETTINGS_CACHE_TTL_SECONDS
+            if snap is not None and not force and snap.version == version:
+                self._snapshot = snap._replace(expires_at=expires_at)
+            else:
+                self._snapshot = _Snapshot(version, await self.backend.load(db, version), expires_at)
+                self._stats["reloads"] += 1
+            return self._snapshot.values
+
+    async def get(self, key: str, db: AsyncSession) -> Optional[str]:
+        snap = self._snapshot
+        if snap is not None and time.monotonic() < snap.expires_at:
+            self._stats["hits"] += 1
+            return snap.values.get(key)
+        self._stats["misses"] += 1
+        return (await self.refresh(db)).get(key)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    async def invalidate(self) -> None:
+        """Call after writing settings: drop this worker's snapshot and notify the others."""
+        self._drop()
+        await self.backend.invalidate()
+
+    async def run_listener(self) -> None:
+        """Background task: drop the snapshot whenever another worker invalidates."""
+        while True:
+            try:
+                await self.backend.listen(self._drop)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("settings invalidation listener failed; retrying", exc_info=True)
+                self._drop()
+                await asyncio.sleep(5)
+
+
+settings_cache = SettingsCache()
@@ -0,0 +1,125 @@
+"""Pluggable storage for uploaded images.
+
+`get_storage()` returns the backend selected by `UPLOAD_STORAGE_BACKEND`:
+
+- "cloudinary": configured once, uploads run on the upload thread pool so
+  the blocking SDK never holds up the event loop;
+- "local": writes files under `UPLOAD_LOCAL_DIR` and serves them from
+  `UPLOAD_LOCAL_BASE_URL`; lets the upload path be exercised offline;
+- "blob": content-addressed local store replicated to Cloudinary in the
+  background (see app.utils.blob_store).
+
+Backends take already-prepared bytes (see app.utils.images) and return a
+`StoredObject`; they raise on failure and leave HTTP mapping to the caller.
+"""
+import asyncio
+import io
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+try:
+    import cloudinary
+    import cloudinary.uploader
+except Exception:
+    cloudinary = None
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def upload_executor() -> ThreadPoolExecutor:
+    """Shared pool for blocking upload work (image re-encoding, SDK calls, file I/O)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.UPLOAD_WORKERS, thread_name_prefix="upload")
+    return _executor
+
+
+async def run_blocking(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(upload_executor(), fn, *args)
+
+
+class StoredObject(NamedTuple):
+    url: str
+    public_id: str
+    raw: Dict[str, Any]
+
+
+class CloudinaryStorage:
+    def __init__(self) -> None:
+        if cloudinary is None:
+            raise RuntimeError("UPLOAD_STORAGE_BACKEND=cloudinary requires the 'cloudinary' package")
+        # Configure from the pydantic Settings object (reads .env) once per process
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET,
+            secure=True,
+        )
+
+    async def put(self, data: bytes, content_type: str) -> StoredObject:
+        result = await run_blocking(lambda: cloudinary.uploader.upload(io.BytesIO(data), resource_type="image"))
+        return StoredObject(result.get("secure_url") or result.get("url"), result.get("public_id"), result)
+
+    async def delete(self, public_id: str) -> Dict[str, Any]:
+        return await run_blocking(lambda: cloudinary.uploader.destroy(public_id, resource_type="image", invalidate=True))
+
+
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+
+class LocalStorage:
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None) -> None:
+        self.root = os.path.abspath(root or settings.UPLOAD_LOCAL_DIR)
+        self.base_url = (base_url or settings.UPLOAD_LOCAL_BASE_URL).rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _write(self, name: str, data: bytes) -> None:
+        tmp = os.path.join(self.root, f".{name}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, os.path.join(self.root, name))
+
+    async def put(self, data: bytes, content_type: str) -> StoredObject:
+        public_id = uuid.uuid4().hex
+        name = public_id + _EXTENSIONS.get(content_type, "")
+        await run_blocking(self._write, name, data)
+        url = f"{self.base_url}/{name}"
+        return StoredObject(url, public_id, {"public_id": public_id, "url": url, "bytes": len(data), "format": name.rsplit(".", 1)[-1] if "." in name else None})
+
+    async def delete(self, public_id: str) -> Dict[str, Any]:
+        def _remove() -> bool:
+            removed = False
+            for name in os.listdir(self.root):
+                if name.split(".", 1)[0] == public_id:
+                    os.remove(os.path.join(self.root, name))
+                    removed = True
+            return removed
+
+        if not public_id or os.sep in public_id or public_id.startswith("."):
+            return {"result": "not found"}
+        return {"result": "ok" if await run_blocking(_remove) else "not found"}
+
+
+_storage = None
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        if settings.UPLOAD_STORAGE_BACKEND == "blob":
+            from app.utils.blob_store import get_blob_storage
+
+            _storage = get_blob_storage()
+        elif settings.UPLOAD_STORAGE_BACKEND == "local":
+            _storage = LocalStorage()
+        else:
+            _storage = CloudinaryStorage()
+    return _storage
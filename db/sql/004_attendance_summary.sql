@@ -0,0 +1,69 @@
+-- Materialized attendance counts, maintained incrementally by the API
+-- (AttendanceService) in the same transaction as each attendance write.
+-- Only active rows (active = 1) are counted; status NULL counts as "unmarked".
+-- Re-running this file rebuilds both tables from the attendance table.
+
+CREATE TABLE IF NOT EXISTS attendance_offering_summary (
+  offering_id     INT NOT NULL,
+  student_id      INT NOT NULL,
+  present         INT NOT NULL DEFAULT 0,
+  late            INT NOT NULL DEFAULT 0,
+  absent          INT NOT NULL DEFAULT 0,
+  excused         INT NOT NULL DEFAULT 0,
+  unmarked        INT NOT NULL DEFAULT 0,
+  total           INT NOT NULL DEFAULT 0,
+  updated_at      TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (offering_id, student_id),
+  CONSTRAINT fk_att_sum_offering FOREIGN KEY (offering_id) REFERENCES course_offerings(id),
+  CONSTRAINT fk_att_sum_student  FOREIGN KEY (student_id)  REFERENCES students(id)
+);
+
+CREATE TABLE IF NOT EXISTS attendance_session_summary (
+  session_id      INT PRIMARY KEY,
+  present         INT NOT NULL DEFAULT 0,
+  late            INT NOT NULL DEFAULT 0,
+  absent          INT NOT NULL DEFAULT 0,
+  excused         INT NOT NULL DEFAULT 0,
+  unmarked        INT NOT NULL DEFAULT 0,
+  total           INT NOT NULL DEFAULT 0,
+  updated_at      TIMESTAMPTZ DEFAULT NOW(),
+  CONSTRAINT fk_att_sum_session FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+
+BEGIN;
+
+-- block attendance writes while rebuilding so no delta is lost
+LOCK TABLE attendance IN SHARE MODE;
+
+TRUNCATE attendance_offering_summary, attendance_session_summary;
+
+-- tables created by earlier versions of this file used TIMESTAMP; a no-op otherwise
+ALTER TABLE attendance_offering_summary ALTER COLUMN updated_at TYPE TIMESTAMPTZ;
+ALTER TABLE attendance_session_summary ALTER COLUMN updated_at TYPE TIMESTAMPTZ;
+
+INSERT INTO attendance_offering_summary (offering_id, student_id, present, late, absent, excused, unmarked, total)
+SELECT s.offering_id, a.student_id,
+       COUNT(*) FILTER (WHERE a.status = 'present'),
+       COUNT(*) FILTER (WHERE a.status = 'late'),
+       COUNT(*) FILTER (WHERE a.status = 'absent'),
+       COUNT(*) FILTER (WHERE a.status = 'excused'),
+       COUNT(*) FILTER (WHERE a.status IS NULL),
+       COUNT(*)
+FROM attendance a
+JOIN sessions s ON s.id = a.session_id
+WHERE a.active = 1
+GROUP BY s.offering_id, a.student_id;
+
+INSERT INTO attendance_session_summary (session_id, present, late, absent, excused, unmarked, total)
+SELECT a.session_id,
+       COUNT(*) FILTER (WHERE a.status = 'present'),
+       COUNT(*) FILTER (WHERE a.status = 'late'),
+       COUNT(*) FILTER (WHERE a.status = 'absent'),
+       COUNT(*) FILTER (WHERE a.status = 'excused'),
+       COUNT(*) FILTER (WHERE a.status IS NULL),
+       COUNT(*)
+FROM attendance a
+WHERE a.active = 1
+GROUP BY a.session_id;
+
+COMMIT;
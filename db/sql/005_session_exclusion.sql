@@ -0,0 +1,78 @@
+-- Reject double-booked rooms and instructors at write time.
+--
+-- Two GiST exclusion constraints over tstzrange(start_datetime, end_datetime):
+-- no two live sessions (not deleted, not canceled) may overlap in the same
+-- room or for the same instructor. The same GiST indexes serve the API's
+-- overlap lookups (SessionService), so conflict checks are index range scans
+-- instead of pairwise scans of `sessions`.
+--
+-- Requires btree_gist for the `room_id WITH =` / `instructor_id WITH =` parts.
+-- Adding the constraints fails if existing rows already overlap; list them with
+-- the query at the bottom of this file and fix them first.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+BEGIN;
+
+-- The ORM maps these columns as timezone-aware and the API writes UTC;
+-- tstzrange over timestamptz is immutable and can back an index.
+ALTER TABLE sessions
+  ALTER COLUMN start_datetime TYPE TIMESTAMPTZ USING start_datetime AT TIME ZONE 'UTC',
+  ALTER COLUMN end_datetime   TYPE TIMESTAMPTZ USING end_datetime AT TIME ZONE 'UTC';
+
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS ck_sessions_time_order;
+ALTER TABLE sessions ADD CONSTRAINT ck_sessions_time_order CHECK (end_datetime > start_datetime);
+
+-- The instructor lives on course_offerings; exclusion constraints cannot span
+-- tables, so keep a copy on sessions in sync with triggers.
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS instructor_id INT;
+
+UPDATE sessions s
+SET instructor_id = o.instructor_id
+FROM course_offerings o
+WHERE o.id = s.offering_id AND s.instructor_id IS DISTINCT FROM o.instructor_id;
+
+CREATE OR REPLACE FUNCTION sessions_set_instructor() RETURNS trigger AS $$
+BEGIN
+  SELECT instructor_id INTO NEW.instructor_id FROM course_offerings WHERE id = NEW.offering_id;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_sessions_set_instructor ON sessions;
+CREATE TRIGGER trg_sessions_set_instructor
+  BEFORE INSERT OR UPDATE OF offering_id ON sessions
+  FOR EACH ROW EXECUTE FUNCTION sessions_set_instructor();
+
+CREATE OR REPLACE FUNCTION course_offerings_sync_session_instructor() RETURNS trigger AS $$
+BEGIN
+  UPDATE sessions SET instructor_id = NEW.instructor_id WHERE offering_id = NEW.id;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_course_offerings_sync_instructor ON course_offerings;
+CREATE TRIGGER trg_course_offerings_sync_instructor
+  AFTER UPDATE OF instructor_id ON course_offerings
+  FOR EACH ROW WHEN (OLD.instructor_id IS DISTINCT FROM NEW.instructor_id)
+  EXECUTE FUNCTION course_offerings_sync_session_instructor();
+
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS ex_sessions_room_time;
+ALTER TABLE sessions ADD CONSTRAINT ex_sessions_room_time
+  EXCLUDE USING gist (room_id WITH =, tstzrange(start_datetime, end_datetime, '[)') WITH &&)
+  WHERE (active IS DISTINCT FROM 2 AND status IS DISTINCT FROM 'canceled');
+
+ALTER TABLE sessions DROP CONSTRAINT IF EXISTS ex_sessions_instructor_time;
+ALTER TABLE sessions ADD CONSTRAINT ex_sessions_instructor_time
+  EXCLUDE USING gist (instructor_id WITH =, tstzrange(start_datetime, end_datetime, '[)') WITH &&)
+  WHERE (active IS DISTINCT FROM 2 AND status IS DISTINCT FROM 'canceled');
+
+COMMIT;
+
+-- Existing overlaps that block the constraints:
+-- SELECT a.id, b.id, a.room_id, a.instructor_id, a.start_datetime, a.end_datetime
+-- FROM sessions a JOIN sessions b ON a.id < b.id
+--  AND (a.room_id = b.room_id OR a.instructor_id = b.instructor_id)
+--  AND tstzrange(a.start_datetime, a.end_datetime, '[)') && tstzrange(b.start_datetime, b.end_datetime, '[)')
+-- WHERE a.active IS DISTINCT FROM 2 AND b.active IS DISTINCT FROM 2
+--  AND a.status IS DISTINCT FROM 'canceled' AND b.status IS DISTINCT FROM 'canceled';
@@ -0,0 +1,166 @@
+"""Benchmark: response envelope applied at render time vs. the old buffering middleware.
+
+Both apps serve the same 200-row students page through `success_response`.
+The "legacy" app adds the former `wrap_response_middleware` (buffer body,
+json.loads, re-serialize); the "current" app relies on EnvelopeJSONResponse.
+Requests are driven straight through the ASGI interface, so no network or
+database is involved.
+
+    python scripts/bench_envelope.py [requests]
+"""
+import asyncio
+import json
+import os
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.api.response import EnvelopeJSONResponse, success_response
+from app.schemas.student import StudentOut
+
+ROWS = 200
+
+
+def _rows():
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            global_id=f"00000000-0000-0000-0000-{i:012d}",
+            student_code=f"S{i:05d}",
+            first_name="Sok",
+            last_name=f"Dara{i}",
+            gender="female" if i % 2 else "male",
+            dob=None,
+            email=f"student{i}@example.edu",
+            phone_number=f"0123{i:05d}",
+            address="Phnom Penh",
+            profile_image=None,
+            generation_id=3,
+            active=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, ROWS + 1)
+    ]
+
+
+PAGE = {"items": _rows(), "total": 5000, "page": 1, "per_page": ROWS, "total_pages": 25, "next_page": 2, "prev_page": None}
+
+
+def _legacy_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def wrap_response_middleware(request: Request, call_next):
+        response: Response = await call_next(request)
+        if response.media_type != "application/json":
+            return response
+        raw_body = b""
+        async for chunk in response.body_iterator:
+            raw_body += chunk
+        payload = json.loads(raw_body)
+        if isinstance(payload, dict) and "status" in payload and "data" in payload and "code" in payload:
+            return JSONResponse(status_code=response.status_code, content=payload)
+        wrapped = {"status": "success", "data": payload, "message": None, "code": response.status_code}
+        return JSONResponse(status_code=response.status_code, content=wrapped)
+
+    @app.get("/students")
+    async def students():
+        return success_response(PAGE, message="Students retrieved successfully", schema=StudentOut)
+
+    return app
+
+
+def _current_app() -> FastAPI:
+    app = FastAPI(default_response_class=EnvelopeJSONResponse)
+
+    @app.get("/students")
+    async def students():
+        return success_response(PAGE, message="Students retrieved successfully", schema=StudentOut)
+
+    return app
+
+
+async def _request(app) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/students",
+        "raw_path": b"/students",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    body_len = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal body_len
+        if message["type"] == "http.response.body":
+            body_len += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return body_len
+
+
+async def _latencies(app, n: int):
+    for _ in range(20):
+        await _request(app)
+    out = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await _request(app)
+        out.append(time.perf_counter() - start)
+    return out
+
+
+async def _peak_alloc(app, n: int) -> float:
+    tracemalloc.start()
+    peaks = []
+    for _ in range(n):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await _request(app)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return statistics.mean(peaks)
+
+
+def _pct(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p * (len(values) - 1))))]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    body_len = asyncio.run(_request(_current_app()))
+    print(f"{ROWS}-row page, {body_len} bytes, {n} requests per app\n")
+    print(f"{'app':10} {'p50 ms':>8} {'p99 ms':>8} {'peak alloc KiB':>15}")
+    for name, factory in (("legacy", _legacy_app), ("current", _current_app)):
+        app = factory()
+        lat = asyncio.run(_latencies(app, n))
+        peak = asyncio.run(_peak_alloc(app, max(50, n // 10)))
+        print(f"{name:10} {_pct(lat, 0.50) * 1e3:8.2f} {_pct(lat, 0.99) * 1e3:8.2f} {peak / 1024:15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: 1:N face match latency of the in-process index.
+
+Fills the index with random normalized embeddings (no database) and times
+`FaceIndex.search` for a probe close to one enrolled template, plus the cost
+of incremental upserts/removals.
+
+    python scripts/bench_face_index.py [students] [dimension]
+"""
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+import numpy as np
+
+from app.utils.face_index import FaceIndex
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((students, dim), dtype=np.float32)
+
+    index = FaceIndex()
+    index._loaded = True
+    start = time.perf_counter()
+    for i, vec in enumerate(vectors, start=1):
+        index._apply(i, i, vec.astype("<f4").tobytes(), "arcface", dim, 1)
+    load = time.perf_counter() - start
+
+    target = students // 2
+    probe = vectors[target - 1] + rng.standard_normal(dim, dtype=np.float32) * 0.3
+    index.search(probe, 5)
+    lat = []
+    for _ in range(200):
+        t = time.perf_counter()
+        best = index.search(probe, 5)[0]
+        lat.append(time.perf_counter() - t)
+    assert best.student_id == target, best
+
+    t = time.perf_counter()
+    for i in range(1, 1001):
+        index._apply(i, i, vectors[-i].astype("<f4").tobytes(), "arcface", dim, 1)
+        index._apply(students - i, students - i, None, "arcface", dim, 2)
+    churn = (time.perf_counter() - t) / 2000
+
+    print(f"{students} templates x {dim} dims")
+    print(f"initial load:      {load:8.2f} s")
+    print(f"search p50:        {statistics.median(lat) * 1e3:8.2f} ms")
+    print(f"search p99:        {sorted(lat)[int(len(lat) * 0.99) - 1] * 1e3:8.2f} ms")
+    print(f"upsert/remove:     {churn * 1e6:8.1f} us/op")
+    print(f"best match:        student {best.student_id} similarity {best.similarity:.3f}")
+
+
+if __name__ == "__main__":
+    main()
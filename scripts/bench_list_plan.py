@@ -0,0 +1,89 @@
+"""Micro-benchmark: per-request CPU of BaseService.list with and without the filter plan cache.
+
+Simulates the `/admin/auth/students` list path (query-string parsing, filter
+normalization, statement construction) against a stub session, so only the
+Python-side cost is measured — no database is needed.
+
+    python scripts/bench_list_plan.py [iterations]
+"""
+import asyncio
+import os
+import pathlib
+import sys
+import time
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from starlette.requests import Request
+
+from app.services import base_service
+from app.services.student_service import StudentService
+
+QUERY = (
+    b"page=3&limit=50&sort_by=created_at&sort_dir=desc"
+    b"&filter[generation_id]=3,4&filter[first_name]=so&filter[gender]=female"
+)
+
+
+class _Result:
+    def all(self):
+        return []
+
+    def unique(self):
+        return self
+
+
+class _StubSession:
+    """Accepts statements without executing them."""
+
+    async def execute(self, stmt, params=None):
+        return _Result()
+
+    async def scalars(self, stmt, params=None):
+        return _Result()
+
+    async def scalar(self, stmt, params=None):
+        return 0
+
+
+def _request() -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/admin/auth/students/",
+        "query_string": QUERY,
+        "headers": [],
+    }
+    return Request(scope)
+
+
+async def _run(n: int, cached: bool) -> float:
+    db = _StubSession()
+    start = time.perf_counter()
+    for _ in range(n):
+        if not cached:
+            base_service._compile_filter_plan.cache_clear()
+        svc = StudentService(db)
+        svc.request = _request()
+        await svc.list()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    # warm up imports / SQLAlchemy internals
+    asyncio.run(_run(200, cached=True))
+    uncached = asyncio.run(_run(n, cached=False))
+    cached = asyncio.run(_run(n, cached=True))
+    print(f"iterations:           {n}")
+    print(f"without plan cache:   {uncached * 1e6:8.1f} us/request")
+    print(f"with plan cache:      {cached * 1e6:8.1f} us/request")
+    print(f"saved:                {(uncached - cached) * 1e6:8.1f} us/request ({(1 - cached / uncached) * 100:.0f}%)")
+    print(f"plan cache:           {base_service._compile_filter_plan.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
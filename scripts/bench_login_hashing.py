@@ -0,0 +1,76 @@
+"""Benchmark: concurrent logins with password verification inline vs. on the hashing pool.
+
+Simulates a login storm: N coroutines each verify a pbkdf2_sha256 password
+(what `*Service.authenticate` does after loading the user). "inline" calls
+passlib directly in the coroutine, as the services used to; "pool" awaits
+`verify_password`. Alongside throughput, a ticker coroutine measures event
+loop lag, i.e. how long any other request in the worker would be stalled.
+
+    python scripts/bench_login_hashing.py [logins] [concurrency]
+"""
+import asyncio
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from app.utils.passwords import hasher_stats, pwd_context, verify_password
+
+PASSWORD = "correct-horse-1"
+HASHED = pwd_context.hash(PASSWORD)
+
+
+async def _inline_verify(password, hashed):
+    return pwd_context.verify(password, hashed)
+
+
+async def _storm(verify, logins: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def login():
+        async with sem:
+            assert await verify(PASSWORD, HASHED)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return elapsed, lags
+
+
+def _report(name, logins, elapsed, lags):
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(f"{name:8} {logins / elapsed:10.1f} {statistics.median(lags) * 1e3:12.2f} {p99 * 1e3:12.2f} {lags[-1] * 1e3:12.2f}")
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"{logins} logins, concurrency {concurrency}, cpus {os.cpu_count()}\n")
+    print(f"{'mode':8} {'logins/s':>10} {'lag p50 ms':>12} {'lag p99 ms':>12} {'lag max ms':>12}")
+    for name, verify in (("inline", _inline_verify), ("pool", verify_password)):
+        elapsed, lags = asyncio.run(_storm(verify, logins, concurrency))
+        _report(name, logins, elapsed, lags)
+    print(f"\npool stats: {hasher_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark: success_response encoding of a 200-student page, fast path vs. fallback.
+
+The fast path validates rows by attribute and dumps JSON bytes with cached
+pydantic-core serializers; the fallback is the per-item model_validate +
+jsonable_encoder + field filtering used when no TypeAdapter is available.
+
+    python scripts/bench_serializer.py [iterations]
+"""
+import os
+import pathlib
+import sys
+import time
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from app.api import response
+from app.schemas.student import StudentOut
+from scripts.bench_envelope import PAGE, ROWS
+
+
+def _time(n: int) -> float:
+    response.success_response(PAGE, message="warmup", schema=StudentOut)
+    start = time.perf_counter()
+    for _ in range(n):
+        response.success_response(PAGE, message="Students retrieved successfully", schema=StudentOut)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    fast = _time(n)
+    adapter = response.TypeAdapter
+    response.TypeAdapter = None
+    try:
+        slow = _time(n)
+    finally:
+        response.TypeAdapter = adapter
+    print(f"{ROWS}-row page, {n} iterations")
+    print(f"fallback path:  {slow * 1e3:7.2f} ms/response")
+    print(f"fast path:      {fast * 1e3:7.2f} ms/response")
+    print(f"speedup:        {slow / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: concurrent image uploads through the upload pipeline, offline.
+
+Runs the same steps as POST /uploads/image (prepare_image + storage.put)
+against the local storage backend in a temp dir. "inline" resizes in the
+coroutine and writes synchronously, the way a blocking SDK call behaved;
+"pool" uses the executor-backed pipeline. A ticker coroutine measures event
+loop lag, i.e. how long any other request in the worker would be stalled.
+
+    python scripts/bench_uploads.py [uploads] [concurrency] [width]
+"""
+import asyncio
+import io
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from PIL import Image
+
+from app.utils.images import prepare_image
+from app.utils.storage import LocalStorage, run_blocking
+
+
+def _sample(width: int) -> bytes:
+    height = width * 3 // 4
+    img = Image.effect_noise((width, height), 64).convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=95)
+    return buf.getvalue()
+
+
+async def _storm(mode: str, storage: LocalStorage, data: bytes, uploads: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    lags, sizes = [], []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def upload():
+        async with sem:
+            if mode == "inline":
+                out, _ = prepare_image(data, "image/jpeg")
+                storage._write(f"inline-{len(sizes)}.jpg", out)
+            else:
+                out, content_type = await run_blocking(prepare_image, data, "image/jpeg")
+                await storage.put(out, content_type)
+            sizes.append(len(out))
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(upload() for _ in range(uploads)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return elapsed, lags, sizes
+
+
+def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    width = int(sys.argv[3]) if len(sys.argv) > 3 else 4000
+    data = _sample(width)
+    print(f"{uploads} uploads of {len(data) / 1024:.0f} KiB ({width}px wide), concurrency {concurrency}\n")
+    print(f"{'mode':8} {'uploads/s':>10} {'lag p50 ms':>12} {'lag max ms':>12} {'stored KiB':>12}")
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(root=root, base_url="/media")
+        for mode in ("inline", "pool"):
+            elapsed, lags, sizes = asyncio.run(_storm(mode, storage, data, uploads, concurrency))
+            lags = sorted(lags) or [0.0]
+            print(f"{mode:8} {uploads / elapsed:10.1f} {statistics.median(lags) * 1e3:12.2f} {lags[-1] * 1e3:12.2f} {statistics.mean(sizes) / 1024:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
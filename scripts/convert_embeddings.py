@@ -0,0 +1,61 @@
+"""Re-encode legacy biometric template embeddings into the compact UEMB format.
+
+Rows whose `embedding` does not start with the UEMB magic (raw float32 blobs
+written before the format existed) are decoded and stored again using
+EMBEDDING_STORAGE_DTYPE (or the dtype given on the command line). Already
+converted rows are skipped, so the script can be re-run safely.
+
+    python scripts/convert_embeddings.py [float32|float16|int8] [batch_size]
+"""
+import asyncio
+import pathlib
+import sys
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.core.errors import InvalidEmbedding
+from app.db.session import AsyncSessionLocal
+from app.models.biometric_template import BiometricTemplate as BT
+from app.utils.embedding import MAGIC, decode_embedding, encode_embedding
+
+
+async def main():
+    dtype = sys.argv[1] if len(sys.argv) > 1 else settings.EMBEDDING_STORAGE_DTYPE
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    converted = skipped = before = after = 0
+    last_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            rows = (await db.execute(
+                select(BT.id, BT.embedding, BT.dimension)
+                .where(BT.id > last_id, BT.embedding.is_not(None), func.substr(BT.embedding, 1, 4) != MAGIC)
+                .order_by(BT.id)
+                .limit(batch)
+            )).all()
+            if not rows:
+                break
+            for tid, raw, dim in rows:
+                last_id = tid
+                try:
+                    vec = decode_embedding(raw, dim)
+                except InvalidEmbedding:
+                    skipped += 1
+                    continue
+                blob = encode_embedding(vec, dtype)
+                await db.execute(update(BT).where(BT.id == tid).values(embedding=blob, dimension=vec.shape[0]))
+                converted += 1
+                before += len(raw)
+                after += len(blob)
+            await db.commit()
+    print(f"converted {converted} templates to {dtype}, skipped {skipped} undecodable")
+    if converted:
+        print(f"bytes: {before} -> {after} ({before / after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+"""Seeded load-test suite; see `python -m scripts.loadtest --help`."""
@@ -0,0 +1,142 @@
+"""Seed a local Postgres with synthetic data and load-test a running API.
+
+    python -m scripts.loadtest seed [--scale 1.0] [--seed 42] [--reset] [--dsn postgresql://...]
+    python -m scripts.loadtest run [--base-url http://localhost:8000] [--scenario login_storm ...]
+                                   [--requests N] [--concurrency C] [--json out.json]
+                                   [--baseline base.json] [--max-regression 0.2]
+
+`seed` TRUNCATEs the benchmark tables (admins, catalog, students,
+offerings, sessions, attendance, ...) of the target database, so point it
+at a throwaway database. The DSN defaults to the app's DB_* settings.
+
+`run` prints throughput and p50/p95/p99 per scenario. With `--baseline`
+(a previous `--json` output) it exits with status 1 when a scenario's p95
+grows, or its throughput drops, by more than `--max-regression`.
+
+Needs asyncpg and httpx. Every account's password is `BENCH_PASSWORD`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import random
+import sys
+
+# Ensure project root is on sys.path so `app` package can be imported when running from scripts/
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JWT_PRIVATE", "bench-secret")
+
+from scripts.loadtest.datagen import Scale
+from scripts.loadtest.scenarios import SCENARIOS, Context
+
+
+def _default_dsn() -> str:
+    from app.core.config import settings
+
+    return settings.sqlalchemy_uri.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def _seed(args) -> None:
+    from app.utils.passwords import pwd_context
+    from scripts.loadtest.datagen import BENCH_PASSWORD
+    from scripts.loadtest.seed import load
+
+    scale = Scale().scaled(args.scale)
+    print(f"scale {args.scale}: {scale.groups} groups, {scale.students} students, seed {args.seed}\n")
+    # one hash shared by every account; hashing per row would dominate the load
+    counts = asyncio.run(load(args.dsn, scale, args.seed, pwd_context.hash(BENCH_PASSWORD), reset=args.reset))
+    print(f"\n{sum(counts.values())} rows")
+
+
+async def _run_scenarios(args):
+    import asyncpg
+    import httpx
+
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    db = await asyncpg.connect(args.dsn)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+            ctx = Context(client, db, random.Random(args.seed))
+            for name in names:
+                scenario, requests, concurrency = SCENARIOS[name]
+                result = await scenario(ctx, args.requests or requests, args.concurrency or concurrency)
+                results[name] = result.summary()
+                _print_row(name, results[name])
+                for sample in result.error_samples:
+                    print(f"    error: {sample}")
+    finally:
+        await db.close()
+    return results
+
+
+def _print_row(name, s) -> None:
+    print(
+        f"{name:14} {s['requests']:>8} {s['errors']:>7} {s['throughput']:>9.1f} "
+        f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f} {s['mb']:>8.1f}"
+    )
+
+
+def _regressions(results, baseline, tolerance: float):
+    out = []
+    for name, now in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            out.append(f"{name}: p95 {before['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+        if before["throughput"] and now["throughput"] < before["throughput"] * (1 - tolerance):
+            out.append(f"{name}: throughput {before['throughput']:.1f} -> {now['throughput']:.1f} req/s")
+        if now["errors"] > before.get("errors", 0):
+            out.append(f"{name}: errors {before.get('errors', 0)} -> {now['errors']}")
+    return out
+
+
+def _run(args) -> int:
+    print(f"{'scenario':14} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'MB':>8}")
+    results = asyncio.run(_run_scenarios(args))
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        failed = _regressions(results, json.loads(pathlib.Path(args.baseline).read_text()), args.max_regression)
+        for line in failed:
+            print(f"REGRESSION {line}")
+        return 1 if failed else 0
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.loadtest")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="generate and COPY the synthetic dataset")
+    seed.add_argument("--dsn")
+    seed.add_argument("--scale", type=float, default=1.0, help="population multiplier (1.0 = 4000 students)")
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--reset", action="store_true", help="truncate non-empty benchmark tables")
+
+    run = sub.add_parser("run", help="run load scenarios against a running API")
+    run.add_argument("--dsn")
+    run.add_argument("--base-url", default="http://localhost:8000")
+    run.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    run.add_argument("--requests", type=int, help="override each scenario's request count")
+    run.add_argument("--concurrency", type=int, help="override each scenario's concurrency")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--timeout", type=float, default=120.0)
+    run.add_argument("--json", help="write the summary to this file")
+    run.add_argument("--baseline", help="compare against a previous --json summary")
+    run.add_argument("--max-regression", type=float, default=0.2)
+
+    args = parser.parse_args()
+    args.dsn = args.dsn or _default_dsn()
+    if args.command == "seed":
+        _seed(args)
+        return 0
+    return _run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
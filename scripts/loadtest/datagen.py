@@ -0,0 +1,247 @@
+"""Seeded synthetic dataset for load tests.
+
+`generate(scale, seed)` yields `(table, columns, rows)` in foreign-key order.
+Datetimes are UTC-aware; the loader adapts them to each column's type.
+Ids are not emitted: the loader truncates with RESTART IDENTITY and COPYs
+each table in row order, so row n gets id n and foreign keys are computed
+from positions. The same scale and seed always produce the same rows.
+
+The timetable never double-books: within a term, offering j runs in weekly
+slot j % SLOTS (weekday x time of day) in room j // SLOTS taught by
+instructor j // SLOTS, which satisfies the room/instructor exclusion
+constraints of db/sql/005_session_exclusion.sql.
+"""
+import random
+import uuid
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, List, Sequence, Tuple
+
+# weekly slots: Monday..Friday x four two-hour blocks
+SLOT_TIMES = (time(8, 0), time(10, 0), time(13, 0), time(15, 0))
+SLOTS = 5 * len(SLOT_TIMES)
+SESSION_MINUTES = 110
+
+BENCH_PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.uams"
+
+Table = Tuple[str, Sequence[str], Iterator[tuple]]
+
+
+@dataclass
+class Scale:
+    """Row counts at scale 1.0; `scaled()` multiplies the population, not the timetable shape."""
+
+    departments: int = 4
+    specializations_per_department: int = 2
+    subjects: int = 48
+    generations: int = 4
+    groups: int = 40
+    students_per_group: int = 100
+    terms: int = 2
+    offerings_per_group_term: int = 6
+    weeks: int = 15
+    # weeks of each term that already have attendance; later sessions are left for check-in runs
+    past_weeks: int = 9
+    start_date: date = date(2025, 1, 6)
+
+    def scaled(self, factor: float) -> "Scale":
+        return replace(
+            self,
+            groups=max(1, round(self.groups * factor)),
+            subjects=max(self.offerings_per_group_term, round(self.subjects * factor)),
+            generations=max(1, round(self.generations * min(factor, 4))),
+        )
+
+    @property
+    def students(self) -> int:
+        return self.groups * self.students_per_group
+
+    @property
+    def offerings_per_term(self) -> int:
+        return self.groups * self.offerings_per_group_term
+
+    @property
+    def rooms(self) -> int:
+        return -(-self.offerings_per_term // SLOTS)
+
+    @property
+    def instructors(self) -> int:
+        # one more than rooms so every offering's assistant differs from its instructor
+        return self.rooms + 1
+
+    def term_start(self, term: int) -> date:
+        # two weeks' break between terms
+        return self.start_date + timedelta(weeks=term * (self.weeks + 2))
+
+
+def student_email(n: int) -> str:
+    return f"student{n}@bench.uams"
+
+
+def instructor_email(n: int) -> str:
+    return f"instructor{n}@bench.uams"
+
+
+class _Ids:
+    def __init__(self, seed: int) -> None:
+        self.rnd = random.Random(seed)
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rnd.getrandbits(128), version=4))
+
+
+def _offering_index(scale: Scale, term: int, group: int, k: int) -> int:
+    """0-based position of (term, group, k-th offering) in course_offerings."""
+    return term * scale.offerings_per_term + group * scale.offerings_per_group_term + k
+
+
+def _slot_start(scale: Scale, term: int, week: int, slot: int) -> datetime:
+    day = scale.term_start(term) + timedelta(weeks=week, days=slot // len(SLOT_TIMES))
+    return datetime.combine(day, SLOT_TIMES[slot % len(SLOT_TIMES)], timezone.utc)
+
+
+def generate(scale: Scale, seed: int, password_hash: str) -> Iterator[Table]:
+    ids = _Ids(seed)
+    rnd = ids.rnd
+    now = datetime.combine(scale.start_date, time(0, 0), timezone.utc)
+
+    yield "admins", ("global_id", "email", "password", "role", "first_name", "last_name", "active"), iter(
+        [(ids.uuid(), ADMIN_EMAIL, password_hash, "admin", "Bench", "Admin", 1)]
+    )
+    yield "departments", ("global_id", "name", "active"), iter(
+        [(ids.uuid(), f"Department {d + 1}", 1) for d in range(scale.departments)]
+    )
+    n_spec = scale.departments * scale.specializations_per_department
+    yield "specializations", ("global_id", "name", "department_id", "active"), iter(
+        [(ids.uuid(), f"Specialization {s + 1}", s // scale.specializations_per_department + 1, 1) for s in range(n_spec)]
+    )
+    yield "subjects", ("global_id", "code", "name", "credits", "lecture_hours", "lab_hours", "specialization_id", "active"), iter(
+        [(ids.uuid(), f"SUB{s + 1:04d}", f"Subject {s + 1}", rnd.choice((2, 3, 4)), 30, 15, s % n_spec + 1, 1) for s in range(scale.subjects)]
+    )
+    yield "generations", ("global_id", "generation", "start_year", "end_year", "active"), iter(
+        [(ids.uuid(), f"Batch {2021 + g}", 2021 + g, 2025 + g, 1) for g in range(scale.generations)]
+    )
+    yield "groups", ("global_id", "group_name", "active"), iter(
+        [(ids.uuid(), f"G{g + 1:03d}", 1) for g in range(scale.groups)]
+    )
+    yield "terms", ("global_id", "term", "active"), iter(
+        [(ids.uuid(), f"Term {t + 1}", 1) for t in range(scale.terms)]
+    )
+    yield "rooms", ("global_id", "room", "capacity", "active"), iter(
+        [(ids.uuid(), f"R{r + 1:03d}", scale.students_per_group + 20, 1) for r in range(scale.rooms)]
+    )
+    yield "instructors", ("global_id", "first_name", "last_name", "email", "password", "position", "active"), iter(
+        [
+            (ids.uuid(), "Instructor", str(i + 1), instructor_email(i + 1), password_hash, "professor" if i % 3 == 0 else "lecturer", 1)
+            for i in range(scale.instructors)
+        ]
+    )
+
+    # student n (1-based) belongs to group (n - 1) % groups
+    def students():
+        for n in range(1, scale.students + 1):
+            yield (
+                ids.uuid(),
+                f"S{n:07d}",
+                "Student",
+                str(n),
+                rnd.choice(("male", "female")),
+                date(2000 + n % 6, 1 + n % 12, 1 + n % 28),
+                student_email(n),
+                password_hash,
+                (n - 1) % scale.generations + 1,
+                1,
+            )
+
+    yield "students", (
+        "global_id", "student_code", "first_name", "last_name", "gender", "dob", "email", "password", "generation_id", "active",
+    ), students()
+
+    def offerings():
+        for t in range(scale.terms):
+            for g in range(scale.groups):
+                for k in range(scale.offerings_per_group_term):
+                    j = g * scale.offerings_per_group_term + k
+                    slot, unit = j % SLOTS, j // SLOTS
+                    start = _slot_start(scale, t, 0, slot)
+                    yield (
+                        ids.uuid(),
+                        g + 1,
+                        (g * scale.offerings_per_group_term + k + t) % scale.subjects + 1,
+                        t + 1,
+                        unit + 1,
+                        (unit + 1) % scale.instructors + 1,
+                        unit + 1,
+                        g % scale.generations + 1,
+                        2,
+                        start,
+                        start + timedelta(minutes=SESSION_MINUTES),
+                        1,
+                    )
+
+    yield "course_offerings", (
+        "global_id", "group_id", "subject_id", "term_id", "instructor_id", "assistant_id", "room_id", "generation_id",
+        "status", "start_time", "end_time", "active",
+    ), offerings()
+
+    def group_students(g: int) -> List[int]:
+        return list(range(g + 1, scale.students + 1, scale.groups))
+
+    def enrollments():
+        for t in range(scale.terms):
+            for g in range(scale.groups):
+                members = group_students(g)
+                for k in range(scale.offerings_per_group_term):
+                    offering_id = _offering_index(scale, t, g, k) + 1
+                    for s in members:
+                        yield ids.uuid(), s, offering_id, 1, 1, now
+
+    yield "enrollments", ("global_id", "student_id", "offering_id", "status", "active", "enrolled_at"), enrollments()
+
+    # sessions are emitted offering by offering, week by week; attendance follows the same order
+    def sessions():
+        for t in range(scale.terms):
+            for g in range(scale.groups):
+                for k in range(scale.offerings_per_group_term):
+                    j = g * scale.offerings_per_group_term + k
+                    slot, unit = j % SLOTS, j // SLOTS
+                    for w in range(scale.weeks):
+                        start = _slot_start(scale, t, w, slot)
+                        status = "completed" if w < scale.past_weeks else "planned"
+                        yield ids.uuid(), _offering_index(scale, t, g, k) + 1, unit + 1, start, start + timedelta(minutes=SESSION_MINUTES), status, 1
+
+    yield "sessions", ("global_id", "offering_id", "room_id", "start_datetime", "end_datetime", "status", "active"), sessions()
+
+    def attendance():
+        session_id = 0
+        for t in range(scale.terms):
+            for g in range(scale.groups):
+                members = group_students(g)
+                for k in range(scale.offerings_per_group_term):
+                    slot = (g * scale.offerings_per_group_term + k) % SLOTS
+                    for w in range(scale.weeks):
+                        session_id += 1
+                        if w >= scale.past_weeks:
+                            continue
+                        start = _slot_start(scale, t, w, slot)
+                        for s in members:
+                            roll = rnd.random()
+                            if roll < 0.8:
+                                status, checkin = "present", start + timedelta(minutes=rnd.randint(-10, 5))
+                            elif roll < 0.9:
+                                status, checkin = "late", start + timedelta(minutes=rnd.randint(6, 40))
+                            elif roll < 0.98:
+                                status, checkin = "absent", None
+                            else:
+                                status, checkin = "excused", None
+                            yield ids.uuid(), session_id, s, status, checkin, "face" if checkin else "manual", 1
+
+    yield "attendance", ("global_id", "session_id", "student_id", "status", "checkin_time", "method", "active"), attendance()
+
+
+def table_names() -> List[str]:
+    return [
+        "admins", "departments", "specializations", "subjects", "generations", "groups", "terms", "rooms",
+        "instructors", "students", "course_offerings", "enrollments", "sessions", "attendance",
+    ]
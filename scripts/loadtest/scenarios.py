@@ -0,0 +1,216 @@
+"""Load-test scenarios against a running API seeded by `seed.load`.
+
+Each scenario fires `requests` calls with at most `concurrency` in flight
+and returns a `Result` (latency samples, errors, wall time):
+
+- login_storm: distinct students logging in at once (the 8am rush).
+- checkin_burst: face check-ins for every enrolled student of sessions that
+  have no attendance yet, as when several classes start together.
+- admin_paging: admins paging through students, attendance, sessions and
+  enrollments at random pages.
+- term_export: full CSV attendance export of a term, streamed to the end.
+
+The scenarios need the DSN only to pick targets (sessions without
+attendance, page counts); all measured work goes through HTTP.
+"""
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .datagen import ADMIN_EMAIL, BENCH_PASSWORD, instructor_email, student_email
+
+API = "/api/v1"
+
+
+@dataclass
+class Result:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+    bytes: int = 0
+    error_samples: List[str] = field(default_factory=list)
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of the successful requests, in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+    def summary(self) -> Dict[str, Any]:
+        done = len(self.latencies) + self.errors
+        return {
+            "requests": done,
+            "errors": self.errors,
+            "throughput": done / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": max(self.latencies, default=0.0) * 1e3,
+            "mb": self.bytes / 1e6,
+        }
+
+
+async def _drive(name: str, calls: List[Callable[[], Awaitable[int]]], concurrency: int) -> Result:
+    """Run `calls` with bounded concurrency; each returns the response size or raises."""
+    result = Result(name)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(call):
+        async with sem:
+            started = time.perf_counter()
+            try:
+                result.bytes += await call()
+            except Exception as exc:
+                result.errors += 1
+                if len(result.error_samples) < 5:
+                    result.error_samples.append(str(exc)[:200])
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(call) for call in calls))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _check(response) -> int:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path} -> {response.status_code}: {response.text[:120]}")
+    return len(response.content)
+
+
+async def login(client, path: str, email: str) -> str:
+    response = await client.post(path, json={"email": email, "password": BENCH_PASSWORD})
+    _check(response)
+    return response.json()["data"]["token"]
+
+
+class Context:
+    def __init__(self, client, db, rnd: random.Random) -> None:
+        self.client = client
+        self.db = db
+        self.rnd = rnd
+        self._tokens: Dict[str, str] = {}
+
+    async def headers(self, role: str) -> Dict[str, str]:
+        if role not in self._tokens:
+            if role == "admin":
+                self._tokens[role] = await login(self.client, f"{API}/admin/login", ADMIN_EMAIL)
+            else:
+                # instructor 2 has position "lecturer" (see datagen)
+                self._tokens[role] = await login(self.client, f"{API}/user/login", instructor_email(2))
+        return {"Authorization": f"Bearer {self._tokens[role]}"}
+
+
+async def login_storm(ctx: Context, requests: int, concurrency: int) -> Result:
+    students = await ctx.db.fetchval("SELECT count(*) FROM students")
+
+    def call(n: int):
+        async def run():
+            response = await ctx.client.post(f"{API}/user/login", json={"email": student_email(n), "password": BENCH_PASSWORD})
+            return _check(response)
+
+        return run
+
+    picks = ctx.rnd.sample(range(1, students + 1), min(requests, students))
+    return await _drive("login_storm", [call(n) for n in picks], concurrency)
+
+
+async def checkin_burst(ctx: Context, requests: int, concurrency: int) -> Result:
+    headers = await ctx.headers("lecturer")
+    targets = []
+    sessions = await ctx.db.fetch(
+        """
+        SELECT s.id, s.offering_id, s.start_datetime FROM sessions s
+        WHERE s.active = 1 AND NOT EXISTS (SELECT 1 FROM attendance a WHERE a.session_id = s.id)
+        ORDER BY s.start_datetime, s.id
+        LIMIT 200
+        """
+    )
+    for session in sessions:
+        students = await ctx.db.fetch(
+            "SELECT student_id FROM enrollments WHERE offering_id = $1 AND active = 1 ORDER BY student_id", session["offering_id"]
+        )
+        targets.extend((session, row["student_id"]) for row in students)
+        if len(targets) >= requests:
+            break
+    if len(targets) < requests:
+        print(f"checkin_burst: only {len(targets)} open check-ins left; re-seed for a full run")
+    ctx.rnd.shuffle(targets)
+
+    def call(session, student_id: int):
+        body = {
+            "session_id": session["id"],
+            "student_id": student_id,
+            "status": "present",
+            "method": "face",
+            "checkin_time": session["start_datetime"].isoformat(),
+        }
+
+        async def run():
+            return _check(await ctx.client.post(f"{API}/lecturer/auth/attendance/", json=body, headers=headers))
+
+        return run
+
+    return await _drive("checkin_burst", [call(s, sid) for s, sid in targets[:requests]], concurrency)
+
+
+PAGED = {"students": "students", "attendance": "attendance", "sessions": "sessions", "enrollments": "enrollments"}
+
+
+async def admin_paging(ctx: Context, requests: int, concurrency: int, limit: int = 50) -> Result:
+    headers = await ctx.headers("admin")
+    pages = {}
+    for resource, table in PAGED.items():
+        rows = await ctx.db.fetchval(f"SELECT count(*) FROM {table}")
+        pages[resource] = max(1, math.ceil(rows / limit))
+
+    def call(resource: str, page: int):
+        async def run():
+            params = {"page": page, "limit": limit}
+            return _check(await ctx.client.get(f"{API}/admin/auth/{resource}/", params=params, headers=headers))
+
+        return run
+
+    calls = []
+    for _ in range(requests):
+        resource = ctx.rnd.choice(list(PAGED))
+        # mostly the first pages, as people actually page, with a tail of deep pages
+        page = ctx.rnd.randint(1, 5) if ctx.rnd.random() < 0.8 else ctx.rnd.randint(1, pages[resource])
+        calls.append(call(resource, page))
+    return await _drive("admin_paging", calls, concurrency)
+
+
+async def term_export(ctx: Context, requests: int, concurrency: int, term_id: Optional[int] = None) -> Result:
+    headers = await ctx.headers("admin")
+    term_id = term_id or await ctx.db.fetchval("SELECT min(id) FROM terms")
+
+    def call():
+        async def run():
+            size = 0
+            params = {"term_id": term_id, "format": "csv"}
+            async with ctx.client.stream("GET", f"{API}/admin/auth/attendance/export", params=params, headers=headers) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    _check(response)
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+            return size
+
+        return run
+
+    return await _drive("term_export", [call() for _ in range(requests)], concurrency)
+
+
+# name -> (scenario, default requests, default concurrency)
+SCENARIOS = {
+    "login_storm": (login_storm, 500, 100),
+    "checkin_burst": (checkin_burst, 1000, 200),
+    "admin_paging": (admin_paging, 1000, 50),
+    "term_export": (term_export, 4, 2),
+}
@@ -0,0 +1,69 @@
+"""Load the synthetic dataset into Postgres with COPY.
+
+Target tables are truncated with RESTART IDENTITY first (so generated
+positions line up with ids); that is refused unless `reset` is set and any
+of them has rows. After loading, db/sql/004_attendance_summary.sql is
+re-run to rebuild the summary tables and everything is ANALYZEd.
+"""
+import pathlib
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, Sequence
+
+import asyncpg
+
+from .datagen import Scale, generate, table_names
+
+SUMMARY_SQL = pathlib.Path(__file__).resolve().parents[2] / "db" / "sql" / "004_attendance_summary.sql"
+
+
+def _adapter(data_type: str) -> Callable:
+    if data_type == "timestamp without time zone":
+        return lambda v: v.astimezone(timezone.utc).replace(tzinfo=None) if isinstance(v, datetime) else v
+    return lambda v: v
+
+
+async def _column_types(conn, table: str) -> Dict[str, str]:
+    rows = await conn.fetch(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = $1",
+        table,
+    )
+    return {r["column_name"]: r["data_type"] for r in rows}
+
+
+def _adapt(rows: Iterator[tuple], columns: Sequence[str], types: Dict[str, str], counter: Dict[str, int]) -> Iterator[tuple]:
+    keep = [i for i, c in enumerate(columns) if c in types]
+    adapters = [_adapter(types[columns[i]]) for i in keep]
+    for row in rows:
+        counter["rows"] += 1
+        yield tuple(adapt(row[i]) for i, adapt in zip(keep, adapters))
+
+
+async def load(dsn: str, scale: Scale, seed: int, password_hash: str, reset: bool = False, log=print) -> Dict[str, int]:
+    conn = await asyncpg.connect(dsn)
+    try:
+        tables = table_names()
+        for table in tables:
+            if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table})") and not reset:
+                raise SystemExit(f"table {table} is not empty; pass --reset to truncate the benchmark tables")
+        await conn.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE")
+
+        counts: Dict[str, int] = {}
+        for table, columns, rows in generate(scale, seed, password_hash):
+            types = await _column_types(conn, table)
+            counter = {"rows": 0}
+            started = time.perf_counter()
+            await conn.copy_records_to_table(
+                table, records=_adapt(rows, columns, types, counter), columns=[c for c in columns if c in types]
+            )
+            counts[table] = counter["rows"]
+            log(f"{table:18} {counter['rows']:>10} rows  {time.perf_counter() - started:6.1f}s")
+
+        if SUMMARY_SQL.exists():
+            started = time.perf_counter()
+            await conn.execute(SUMMARY_SQL.read_text())
+            log(f"{'summaries':18} {'rebuilt':>10}       {time.perf_counter() - started:6.1f}s")
+        await conn.execute("ANALYZE")
+        return counts
+    finally:
+        await conn.close()
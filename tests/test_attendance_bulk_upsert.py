@@ -0,0 +1,169 @@
+"""AttendanceService.bulk_upsert against a recording stand-in for the Postgres session.
+
+The upsert itself (ON CONFLICT, `xmax = 0`) needs Postgres; `_FakeDB`
+plays the database's part of it so the service's bookkeeping can be
+checked: last item wins, created/updated from the `inserted` column,
+deleted rows reported as errors and exact summary deltas, also when a
+concurrent request inserts the same key between the read and the insert.
+"""
+import asyncio
+from itertools import count
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.dml import Insert
+
+from app.models.attendance import Attendance
+from app.schemas.attendance import AttendanceCreate
+from app.services.attendance_summary_service import AttendanceState
+from app.services import attendance_service
+from app.services.attendance_service import AttendanceService
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+
+class _FakeDB:
+    def __init__(self, existing, racing=()):
+        self.rows = {(r.session_id, r.student_id): r for r in existing}
+        # rows another request commits right after the first locking read
+        self.racing = list(racing)
+        self.ids = count(100)
+        self.inserts = []
+        # rows passed to each pg_insert(...).values(), in statement order
+        self.sent = []
+        self.committed = False
+
+    def pg_insert(self, model):
+        stmt = pg_insert(model)
+        values = stmt.values
+
+        def recording(rows):
+            self.sent.append(rows)
+            return values(rows)
+
+        stmt.values = recording
+        return stmt
+
+    async def execute(self, stmt, params=None, execution_options=None):
+        if not isinstance(stmt, Insert):
+            # the FOR UPDATE read of existing rows
+            states = [AttendanceState.of(r) for r in self.rows.values()]
+            for r in self.racing:
+                self.rows[(r.session_id, r.student_id)] = r
+            self.racing = []
+            return _Result(states)
+        self.inserts.append(str(stmt.compile(dialect=postgresql.dialect())))
+        do_nothing = "DO NOTHING" in self.inserts[-1]
+        out = []
+        for values in self.sent[len(self.inserts) - 1]:
+            key = (values["session_id"], values["student_id"])
+            row = self.rows.get(key)
+            if row is None:
+                row = self.rows[key] = Attendance(id=next(self.ids), **{"active": 1, **values})
+                out.append(row if do_nothing else (row, True))  # xmax = 0: freshly inserted
+            elif do_nothing:
+                continue
+            elif row.active != 2:
+                for k, v in values.items():
+                    if k != "global_id":
+                        setattr(row, k, v)
+                out.append((row, False))
+            # conflicting deleted rows fail the DO UPDATE ... WHERE and return nothing
+        return _Result(out)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class _Summary:
+    def __init__(self):
+        self.changes = []
+
+    async def apply(self, changes):
+        self.changes.extend(changes)
+
+
+def _run(monkeypatch, existing, payloads, racing=()):
+    db = _FakeDB(existing, racing)
+    monkeypatch.setattr(attendance_service, "pg_insert", db.pg_insert)
+    svc = AttendanceService(db)
+    svc.summary = _Summary()
+    results = asyncio.run(svc.bulk_upsert([AttendanceCreate(**p) for p in payloads]))
+    return db, svc.summary, results
+
+
+def test_bulk_upsert_last_item_wins_and_reports_created_or_updated(monkeypatch):
+    existing = [
+        Attendance(id=1, session_id=1, student_id=2, status="absent", active=1),
+        Attendance(id=2, session_id=2, student_id=3, status="present", active=2),
+    ]
+    db, summary, results = _run(monkeypatch, existing, [
+        {"session_id": 1, "student_id": 1, "status": "present"},
+        {"session_id": 1, "student_id": 2, "status": "late"},
+        {"session_id": 1, "student_id": 1, "status": "late"},
+        {"session_id": 2, "student_id": 3, "status": "late"},
+        {"session_id": 1},
+        {"session_id": 1, "student_id": 4, "status": "bogus"},
+    ])
+
+    assert [(r, e) for _, r, e in results] == [
+        ("updated", None),  # superseded by item 2
+        ("updated", None),
+        ("created", None),
+        ("error", "attendance record was deleted"),
+        ("error", "session_id and student_id are required"),
+        ("error", "invalid status 'bogus'"),
+    ]
+    assert results[0][0] is results[2][0]
+    assert results[2][0].status == "late"
+    assert results[1][0].id == 1
+    assert db.committed
+
+    # one insert for the new key, one upsert for the existing ones
+    assert len(db.inserts) == 2
+    assert [len(rows) for rows in db.sent] == [1, 2]
+    assert db.rows[(1, 1)].status == "late"
+    assert db.rows[(2, 3)].status == "present"
+
+    assert sorted(summary.changes, key=lambda c: c[1].student_id) == [
+        (None, AttendanceState(1, 1, "late", 1)),
+        (AttendanceState(1, 2, "absent", 1), AttendanceState(1, 2, "late", 1)),
+    ]
+
+
+def test_bulk_upsert_concurrent_insert_of_same_key(monkeypatch):
+    winner = Attendance(id=9, session_id=1, student_id=1, status="absent", active=1)
+    db, summary, results = _run(
+        monkeypatch, [], [{"session_id": 1, "student_id": 1, "status": "present"}], racing=[winner]
+    )
+    assert [(r, e) for _, r, e in results] == [("updated", None)]
+    assert results[0][0] is winner and winner.status == "present"
+    # the winner's row is counted once: moved from absent to present, not added again
+    assert summary.changes == [(AttendanceState(1, 1, "absent", 1), AttendanceState(1, 1, "present", 1))]
+    assert len(db.inserts) == 2
+
+
+def test_bulk_upsert_statement_shape(monkeypatch):
+    existing = [Attendance(id=1, session_id=1, student_id=2, status="absent", active=1)]
+    db, _, _ = _run(monkeypatch, existing, [
+        {"session_id": 1, "student_id": 1, "status": "present"},
+        {"session_id": 1, "student_id": 2, "status": "present"},
+    ])
+    insert, upsert = (" ".join(sql.split()) for sql in db.inserts)
+    assert "ON CONFLICT (session_id, student_id) DO NOTHING" in insert
+    assert "ON CONFLICT (session_id, student_id) DO UPDATE SET status = excluded.status" in upsert
+    assert "WHERE attendance.active != %(active_1)s" in upsert
+    # xmax is 0 only for the row version this INSERT created, so it tells inserts from updates
+    assert upsert.endswith("xmax = 0 AS inserted")
@@ -0,0 +1,80 @@
+import asyncio
+
+from app.utils.blob_store import BlobReplicator, BlobStorage, BlobStore
+from app.utils.storage import StoredObject
+
+
+def test_deduplicated_blob_survives_until_last_reference(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest, created = store.put(b"capture")
+    assert created
+    assert store.put(b"capture") == (digest, False)
+
+    assert store.release(digest) == (True, 1)
+    assert store.exists(digest)
+    assert store.release(digest) == (True, 0)
+    assert not store.exists(digest)
+    assert store.release(digest) == (False, 0)
+
+    # stored again after removal, it starts over at one reference
+    store.put(b"capture")
+    assert store.release(digest) == (True, 0)
+
+
+def test_blob_without_reference_count_holds_one(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest, _ = store.put(b"legacy")
+    (tmp_path / digest[:2] / digest[2:4] / f"{digest}.refs").write_text("")
+    assert store.release(digest) == (True, 0)
+
+
+def test_claim_is_exclusive(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest, _ = store.put(b"capture")
+    first = store.claim(digest)
+    assert first is not None
+    assert store.claim(digest) is None
+    store.unclaim(digest, first)
+    again = store.claim(digest)
+    assert again is not None
+    store.unclaim(digest, again)
+
+
+class _Remote:
+    def __init__(self):
+        self.puts = 0
+
+    async def put(self, data, content_type):
+        self.puts += 1
+        return StoredObject("https://remote/x", "x", {})
+
+    async def delete(self, public_id):
+        pass
+
+
+def test_replicators_sharing_a_directory_upload_once(tmp_path):
+    async def main():
+        remote = _Remote()
+        stores = [BlobStore(str(tmp_path)) for _ in range(3)]
+        digest, _ = stores[0].put(b"capture")
+        await asyncio.gather(*(BlobReplicator(store, remote)._replicate(digest) for store in stores))
+        return remote.puts, stores[0].replica(digest)
+
+    puts, replica = asyncio.run(main())
+    assert puts == 1
+    assert replica == {"url": "https://remote/x", "public_id": "x"}
+
+
+def test_storage_delete_keeps_shared_blob(tmp_path):
+    async def main():
+        store = BlobStore(str(tmp_path))
+        storage = BlobStorage(store, BlobReplicator(store))
+        first = await storage.put(b"capture", "image/jpeg")
+        second = await storage.put(b"capture", "image/jpeg")
+        assert second.raw["deduplicated"]
+        assert await storage.delete(first.public_id) == {"result": "ok", "references": 1}
+        assert store.exists(first.public_id)
+        assert await storage.delete(second.public_id) == {"result": "ok", "references": 0}
+        assert not store.exists(first.public_id)
+
+    asyncio.run(main())
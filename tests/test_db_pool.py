@@ -0,0 +1,32 @@
+import asyncio
+import sqlite3
+import time
+
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.pool import InstrumentedQueuePool
+
+
+def _slow_connect():
+    time.sleep(0.05)
+    return sqlite3.connect(":memory:")
+
+
+def test_checkout_wait_excludes_opening_connections():
+    pool = InstrumentedQueuePool(_slow_connect, pool_size=1, max_overflow=1)
+
+    def checkouts():
+        first = pool.connect()
+        second = pool.connect()  # overflow connection, also opened inline
+        second.close()
+        first.close()
+        pool.connect().close()
+
+    asyncio.run(greenlet_spawn(checkouts))
+    stats = pool.stats
+    assert stats["checkouts"] == 3
+    assert stats["connects"] == 2
+    assert stats["connect_seconds_sum"] >= 0.1
+    # nobody queued for a free connection
+    assert stats["wait_seconds_max"] < 0.04
+    assert stats["wait_buckets"][-1] == 0
@@ -0,0 +1,139 @@
+import asyncio
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.errors import InvalidEmbedding
+from app.utils.embedding import HEADER, MAGIC, decode_embedding, embedding_view, encode_embedding, normalize_embedding
+
+
+def _vector(dimension: int = 128, seed: int = 3):
+    return np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+
+
+def _cosine(a, b) -> float:
+    return float(normalize_embedding(a) @ normalize_embedding(b))
+
+
+def test_float32_round_trip_is_exact():
+    vec = _vector()
+    raw = encode_embedding(vec, "float32")
+    assert raw[:4] == MAGIC
+    assert len(raw) == HEADER.size + 4 * vec.size
+    assert np.array_equal(decode_embedding(raw, vec.size), vec)
+
+
+@pytest.mark.parametrize("dtype, itemsize", [("float16", 2), ("int8", 1)])
+def test_compact_round_trip_keeps_cosine(dtype, itemsize):
+    vec = _vector()
+    raw = encode_embedding(vec, dtype)
+    assert len(raw) == HEADER.size + itemsize * vec.size
+    decoded = decode_embedding(raw, vec.size)
+    assert decoded.dtype == np.float32
+    assert _cosine(vec, decoded) > 0.999
+
+
+def test_view_is_zero_copy_and_aligned():
+    raw = encode_embedding(_vector(), "float16")
+    view, scale = embedding_view(raw)
+    assert scale == 1.0
+    assert not view.flags.owndata
+    assert HEADER.size % 16 == 0
+
+
+def test_legacy_float32_blob_still_decodes():
+    vec = _vector(64)
+    legacy = vec.astype("<f4").tobytes()
+    assert np.array_equal(decode_embedding(legacy, 64), vec)
+
+
+def test_legacy_blob_of_wrong_length_is_rejected():
+    with pytest.raises(InvalidEmbedding):
+        decode_embedding(b"\x00" * 10)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"",
+        None,
+        MAGIC + b"\x01",  # header truncated
+        HEADER.pack(MAGIC, 1, 0, 0, 8, 1.0) + b"\x00" * 16,  # payload truncated
+        HEADER.pack(MAGIC, 2, 0, 0, 1, 1.0) + b"\x00" * 4,  # unknown version
+        HEADER.pack(MAGIC, 1, 9, 0, 1, 1.0) + b"\x00" * 4,  # unknown dtype
+    ],
+)
+def test_malformed_blobs_are_rejected(raw):
+    with pytest.raises(InvalidEmbedding):
+        decode_embedding(raw)
+
+
+def test_dimension_mismatch_is_rejected():
+    with pytest.raises(InvalidEmbedding, match="expected 64"):
+        decode_embedding(encode_embedding(_vector(32), "float32"), 64)
+
+
+@pytest.mark.parametrize("vec", [[], [1.0, float("nan")], [float("inf")]])
+def test_encode_rejects_empty_or_non_finite(vec):
+    with pytest.raises(InvalidEmbedding):
+        encode_embedding(vec)
+
+
+def test_encode_rejects_unknown_dtype():
+    with pytest.raises(ValueError):
+        encode_embedding([1.0], "float64")
+
+
+def test_int8_zero_vector_keeps_unit_scale():
+    raw = encode_embedding([0.0, 0.0], "int8")
+    assert struct.unpack_from("<f", raw, 12)[0] == 1.0
+    with pytest.raises(InvalidEmbedding):
+        normalize_embedding(decode_embedding(raw))
+
+
+def test_get_then_put_round_trips_the_embedding():
+    pytest.importorskip("aiosqlite")
+    import json
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models.biometric_template import BiometricTemplate
+    from app.schemas.biometric_template import BiometricTemplateCreate, BiometricTemplateOut, BiometricTemplateUpdate
+    from app.services.biometric_template_service import BiometricTemplateService
+
+    vec = _vector(32)
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(BiometricTemplate.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                svc = BiometricTemplateService(db)
+                row = await svc.create(BiometricTemplateCreate(embedding=vec.tolist()))
+                stored = row.embedding
+                # what a client gets from GET and sends back unchanged with PUT
+                body = json.loads(BiometricTemplateOut.model_validate(row).model_dump_json())
+                payload = BiometricTemplateUpdate.model_validate({k: body[k] for k in ("embedding", "dimension")})
+                row = await svc.update_by_global_id(row.global_id, payload)
+                assert row.embedding == stored
+                assert row.dimension == 32
+
+                # valid base64 that is neither a UEMB blob nor float32 values
+                with pytest.raises(InvalidEmbedding):
+                    await svc.update_by_global_id(row.global_id, BiometricTemplateUpdate.model_validate({"embedding": "AAAA"}))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_embedding_that_is_not_base64_is_rejected():
+    from pydantic import ValidationError
+
+    from app.schemas.biometric_template import BiometricTemplateCreate
+
+    with pytest.raises(ValidationError, match="base64"):
+        BiometricTemplateCreate.model_validate({"embedding": "1.0, 2.0"})
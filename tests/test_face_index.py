@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.biometric_template import BiometricTemplate
+from app.utils.embedding import encode_embedding
+from app.utils.face_index import FaceIndex
+
+T0 = datetime(2025, 1, 6, 8, 0, 0)
+
+
+def _vec(i: int, dimension: int = 4):
+    return [1.0 if j == i else 0.0 for j in range(dimension)]
+
+
+def _template(id: int, at: datetime, active: int = 1) -> BiometricTemplate:
+    return BiometricTemplate(
+        id=id, global_id=f"t{id}", student_id=100 + id, embedding=encode_embedding(_vec(id), "float32"),
+        model="m", dimension=4, active=active, updated_at=at,
+    )
+
+
+def _run(monkeypatch, overlap: float, full_reload: float, steps):
+    monkeypatch.setattr(settings, "FACE_INDEX_SYNC_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "FACE_INDEX_SYNC_OVERLAP_SECONDS", overlap)
+    monkeypatch.setattr(settings, "FACE_INDEX_FULL_RELOAD_SECONDS", full_reload)
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(BiometricTemplate.__table__.create)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        index = FaceIndex()
+        try:
+            async with Session() as db:
+                await steps(db, index)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def _matched(index: FaceIndex, i: int) -> bool:
+    return any(m.template_id == i and m.similarity > 0.99 for m in index.search(_vec(i), k=5))
+
+
+async def _out_of_order(db, index):
+    db.add_all([_template(1, T0), _template(2, T0 + timedelta(seconds=1))])
+    await db.commit()
+    await index.ensure_current(db)
+    assert _matched(index, 1) and _matched(index, 2)
+
+    # this pull moves the watermark to T0+20s ...
+    db.add(_template(3, T0 + timedelta(seconds=20)))
+    await db.commit()
+    await index.ensure_current(db)
+    # ... before transactions that started at T0+10s commit
+    db.add(_template(0, T0 + timedelta(seconds=10)))
+    row = await db.get(BiometricTemplate, 1)
+    row.active, row.updated_at = 2, T0 + timedelta(seconds=10)
+    await db.commit()
+    return index
+
+
+def test_pull_rereads_overlap_behind_watermark(monkeypatch):
+    async def steps(db, index):
+        await _out_of_order(db, index)
+        await index.ensure_current(db)
+        assert _matched(index, 0)
+        assert not _matched(index, 1)
+        assert _matched(index, 2) and _matched(index, 3)
+
+    _run(monkeypatch, overlap=60.0, full_reload=3600.0, steps=steps)
+
+
+def test_full_reload_catches_rows_older_than_overlap(monkeypatch):
+    async def steps(db, index):
+        await _out_of_order(db, index)
+        await index.ensure_current(db)
+        # without overlap the incremental pull misses both late commits
+        assert not _matched(index, 0)
+        assert _matched(index, 1)
+
+        monkeypatch.setattr(settings, "FACE_INDEX_FULL_RELOAD_SECONDS", 0.0)
+        await index.ensure_current(db)
+        assert _matched(index, 0)
+        assert not _matched(index, 1)
+        assert _matched(index, 2) and _matched(index, 3)
+
+    _run(monkeypatch, overlap=0.0, full_reload=3600.0, steps=steps)
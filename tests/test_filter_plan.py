@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from app.models.session import Session
+from app.services.session_service import SessionService
+
+
+def test_relation_filter_binds_raw_value():
+    svc = SessionService(None)
+    plan, params = svc._filter_plan(filters={"room.room": "A101", "room.id": "1,2", "status": "plan"})
+    assert params == {"f_0": "A101", "f_1": [1, 2], "f_2": "%plan%"}
+    sql = str(plan.select_stmt)
+    assert "room.room = :f_0" in sql
+    assert "room.id IN (__[POSTCOMPILE_f_1])" in sql
+
+
+def test_relation_filter_matches_exact_value():
+    pytest.importorskip("aiosqlite")
+    from datetime import datetime, timezone
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Session.__table__.create)
+            # the EXISTS clause joins "{rel}.id = sessions.{rel}_id"
+            await conn.execute(text("CREATE TABLE room (id INTEGER PRIMARY KEY, room TEXT)"))
+            await conn.execute(text("INSERT INTO room VALUES (1, 'A101'), (2, 'A1010')"))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+                db.add_all(
+                    Session(id=i, offering_id=1, room_id=i, start_datetime=start, end_datetime=start, active=1) for i in (1, 2)
+                )
+                await db.commit()
+                rows = await SessionService(db).list(filters={"room.room": "A101"})
+                return [r.id for r in rows]
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(main()) == [1]
@@ -0,0 +1,9 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_health_exposes_no_internals():
+    response = TestClient(app).get("/health")
+    assert response.status_code == 200
+    assert response.json()["data"] == {"status": "ok"}
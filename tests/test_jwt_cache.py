@@ -0,0 +1,95 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils import jwt_utils
+from app.utils.jwt_utils import create_access_token, decode_access_token_cached, get_request_claims
+
+SECRET = "test-secret-0123456789abcdefghij"
+OTHER_SECRET = "test-secret-jihgfedcba9876543210"
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Count calls to jwt.decode and start from an empty verification cache."""
+    calls = []
+    real = jwt_utils.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_utils.jwt, "decode", counting)
+    jwt_utils._verified_tokens.clear()
+    yield calls
+    jwt_utils._verified_tokens.clear()
+
+
+def test_repeat_verification_is_served_from_cache(decodes):
+    token, _ = create_access_token({"user_id": 1, "role": "admin"}, SECRET, 60)
+    first = decode_access_token_cached(token, SECRET)
+    first["role"] = "superadmin"
+    second = decode_access_token_cached(token, SECRET)
+    assert second["role"] == "admin"
+    assert len(decodes) == 1
+
+
+def test_entry_is_dropped_once_exp_passes(decodes, monkeypatch):
+    token, exp = create_access_token({"user_id": 1}, SECRET, 60)
+    decode_access_token_cached(token, SECRET)
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: exp + 1)
+    decode_access_token_cached(token, SECRET)
+    assert len(decodes) == 2
+
+
+def test_cache_is_keyed_by_secret(decodes):
+    token, _ = create_access_token({"user_id": 1}, SECRET, 60)
+    decode_access_token_cached(token, SECRET)
+    with pytest.raises(HTTPException) as err:
+        decode_access_token_cached(token, OTHER_SECRET)
+    assert err.value.status_code == 401
+
+
+def test_failures_are_not_cached(decodes):
+    token, _ = create_access_token({"user_id": 1}, SECRET, 60)
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            decode_access_token_cached(token + "x", SECRET)
+    assert len(decodes) == 2
+
+
+def test_expired_token_is_rejected(decodes):
+    token, _ = create_access_token({"user_id": 1}, SECRET, -10)
+    with pytest.raises(HTTPException, match="expired"):
+        decode_access_token_cached(token, SECRET)
+    assert not jwt_utils._verified_tokens
+
+
+def test_cache_stays_under_cap(decodes, monkeypatch):
+    monkeypatch.setattr(jwt_utils, "_VERIFIED_TOKENS_MAX", 3)
+    for i in range(10):
+        decode_access_token_cached(create_access_token({"user_id": i}, SECRET, 60)[0], SECRET)
+    assert len(jwt_utils._verified_tokens) <= 3
+
+
+class _Request:
+    def __init__(self, authorization=None):
+        self.headers = {"Authorization": authorization} if authorization else {}
+        self.state = type("State", (), {})()
+
+
+def test_request_claims_are_memoized_per_request(decodes):
+    token, _ = create_access_token({"user_id": 7}, SECRET, 60)
+    request = _Request(f"Bearer {token}")
+    assert get_request_claims(request, SECRET)["user_id"] == 7
+    jwt_utils._verified_tokens.clear()
+    assert get_request_claims(request, SECRET)["user_id"] == 7
+    assert len(decodes) == 1
+
+
+def test_request_claims_failure_is_memoized(decodes):
+    request = _Request()
+    for _ in range(2):
+        with pytest.raises(HTTPException, match="Missing Authorization"):
+            get_request_claims(request, SECRET)
+    assert request.state.jwt_claims[SECRET].status_code == 401
+    assert decodes == []
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.errors import InvalidCursor
+from app.services.base_service import _decode_cursor, _encode_cursor
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, 7, 2.5, True, "Room 101", Decimal("12.50"), date(2025, 1, 6), datetime(2025, 1, 6, 8, 30, tzinfo=timezone.utc)],
+)
+def test_cursor_round_trip(value):
+    token = _encode_cursor("capacity", True, value, 42)
+    assert "=" not in token
+    assert _decode_cursor(token, "capacity", True) == (value, 42)
+
+
+def test_cursor_rejects_other_sort_key_or_direction():
+    token = _encode_cursor("created_at", False, datetime(2025, 1, 6, tzinfo=timezone.utc), 1)
+    with pytest.raises(InvalidCursor):
+        _decode_cursor(token, "room", False)
+    with pytest.raises(InvalidCursor):
+        _decode_cursor(token, "created_at", True)
+
+
+def test_cursor_rejects_value_of_wrong_type():
+    token = _encode_cursor("capacity", False, "not a number", 1)
+    with pytest.raises(InvalidCursor):
+        _decode_cursor(token, "capacity", False, int)
+
+
+@pytest.mark.parametrize("token", ["", "!!!", "e30", _encode_cursor("id", False, 1, 1)[:-3]])
+def test_cursor_rejects_garbage(token):
+    with pytest.raises(InvalidCursor):
+        _decode_cursor(token, "id", False)
+
+
+# capacity per room id; None sorts last ascending and first descending, as in Postgres
+CAPACITIES = {1: 30, 2: None, 3: 30, 4: 10, 5: None, 6: 50, 7: 20}
+
+
+def _expected(descending: bool):
+    present = sorted((c, i) for i, c in CAPACITIES.items() if c is not None)
+    nulls = sorted(i for i, c in CAPACITIES.items() if c is None)
+    if descending:
+        return list(reversed(nulls)) + [i for _, i in reversed(present)]
+    return [i for _, i in present] + nulls
+
+
+def _with_rooms(check):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models.room import Room
+    from app.services.room_service import RoomService
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Room.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add_all(Room(id=i, room=f"R{i}", capacity=c, active=1) for i, c in CAPACITIES.items())
+                await db.commit()
+                await check(RoomService(db))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+async def _walk(svc, **kwargs):
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = await svc.list(limit=2, cursor=cursor, **kwargs)
+        seen.extend(r.id for r in page["items"])
+        cursor = page["next_cursor"]
+    return seen
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_walk_with_null_sort_values(descending):
+    async def check(svc):
+        sort_dir = "desc" if descending else "asc"
+        assert await _walk(svc, sort_by="capacity", sort_dir=sort_dir) == _expected(descending)
+
+    _with_rooms(check)
+
+
+def test_keyset_walk_by_id_descending():
+    async def check(svc):
+        assert await _walk(svc, sort_by="id", sort_dir="desc") == sorted(CAPACITIES, reverse=True)
+        # without sort_by the order is id ascending, whatever sort_dir says
+        assert await _walk(svc, sort_dir="desc") == sorted(CAPACITIES)
+
+    _with_rooms(check)
+
+
+def test_keyset_rejects_cursor_from_other_sort():
+    async def check(svc):
+        page = await svc.list(limit=2, cursor="", sort_by="created_at")
+        with pytest.raises(InvalidCursor):
+            await svc.list(limit=2, cursor=page["next_cursor"], sort_by="room")
+
+    _with_rooms(check)
+
+
+def test_keyset_rejects_unencodable_sort_column():
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.services.biometric_template_service import BiometricTemplateService
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with engine.connect() as conn:
+                with pytest.raises(InvalidCursor):
+                    await BiometricTemplateService(AsyncSession(conn)).list(cursor="", sort_by="embedding")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,25 @@
+from app.db import session as db_session
+from app.db.session import replica_reads
+
+
+class _Session:
+    def __init__(self):
+        self.info = {}
+
+
+def test_replica_reads_is_a_no_op_without_replica(monkeypatch):
+    monkeypatch.setattr(db_session, "read_engine", None)
+    stub = object()  # benchmarks pass sessions that have no `info`
+    with replica_reads(stub) as db:
+        assert db is stub
+
+
+def test_replica_reads_sets_and_restores_the_flag(monkeypatch):
+    monkeypatch.setattr(db_session, "read_engine", object())
+    db = _Session()
+    with replica_reads(db):
+        assert db.info["replica"] is True
+        with replica_reads(db, False):
+            assert db.info["replica"] is False
+        assert db.info["replica"] is True
+    assert db.info["replica"] is False
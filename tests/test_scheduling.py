@@ -0,0 +1,128 @@
+import asyncio
+import random
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.core.errors import InvalidSchedule
+from app.schemas.session import RecurrenceRule, SessionGenerateRequest
+from app.utils.interval_tree import IntervalTree
+from app.utils.recurrence import DAILY, WEEKLY, expand_dates
+
+
+def test_interval_tree_half_open_boundaries():
+    tree = IntervalTree([(8, 10, "a"), (10, 12, "b"), (13, 15, "c")])
+    # touching intervals do not overlap
+    assert tree.overlapping(10, 12) == ["b"]
+    assert tree.overlapping(12, 13) == []
+    assert tree.overlapping(6, 8) == []
+    assert tree.overlapping(15, 16) == []
+    # one unit inside either edge does
+    assert tree.overlapping(9, 11) == ["a", "b"]
+    assert tree.overlapping(14, 20) == ["c"]
+    assert tree.first_overlap(0, 100) == "a"
+    assert tree.first_overlap(12, 13) is None
+
+
+def test_interval_tree_empty():
+    tree = IntervalTree([])
+    assert len(tree) == 0
+    assert tree.overlapping(0, 10) == []
+
+
+def test_interval_tree_matches_brute_force():
+    rnd = random.Random(7)
+    items = []
+    for i in range(300):
+        start = rnd.randint(0, 1000)
+        items.append((start, start + rnd.randint(1, 60), i))
+    tree = IntervalTree(items)
+    for _ in range(500):
+        lo = rnd.randint(-20, 1060)
+        hi = lo + rnd.randint(1, 80)
+        expected = [p for s, e, p in sorted(items, key=lambda it: it[0]) if s < hi and e > lo]
+        assert tree.overlapping(lo, hi) == expected
+
+
+def test_expand_weekly_every_other_week_keeps_days_together():
+    # 2025-01-08 is a Wednesday; weeks count from Monday 2025-01-06
+    got = expand_dates(date(2025, 1, 8), date(2025, 2, 2), WEEKLY, 2, [0, 3])
+    assert got == [date(2025, 1, 9), date(2025, 1, 20), date(2025, 1, 23)]
+
+
+def test_expand_weekly_defaults_to_start_weekday():
+    assert expand_dates(date(2025, 1, 8), date(2025, 1, 29)) == [date(2025, 1, 8), date(2025, 1, 15), date(2025, 1, 22), date(2025, 1, 29)]
+
+
+def test_expand_count_applies_before_exclusions():
+    got = expand_dates(date(2025, 1, 1), date(2025, 12, 31), DAILY, 3, count=4, exclude=[date(2025, 1, 4)])
+    assert got == [date(2025, 1, 1), date(2025, 1, 7), date(2025, 1, 10)]
+
+
+def test_expand_empty_and_invalid():
+    assert expand_dates(date(2025, 1, 2), date(2025, 1, 1)) == []
+    with pytest.raises(ValueError):
+        expand_dates(date(2025, 1, 1), date(2025, 1, 31), interval=0)
+    with pytest.raises(ValueError):
+        expand_dates(date(2025, 1, 1), date(2025, 1, 31), freq="monthly")
+    with pytest.raises(ValueError):
+        expand_dates(date(2025, 1, 1), date(2025, 1, 31), weekdays=[7])
+
+
+def _generate(req: SessionGenerateRequest):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models.course_offering import CourseOffering
+    from app.models.session import Session
+    from app.services.session_service import SessionService
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(CourseOffering.__table__.create)
+            await conn.run_sync(Session.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add(CourseOffering(
+                    id=1, group_id=1, subject_id=1, term_id=1, instructor_id=1, assistant_id=2, room_id=1, generation_id=1, active=1,
+                ))
+                await db.commit()
+                return await SessionService(db).generate(req)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def _weekly(start: date, end: date, tz: str, **rule) -> SessionGenerateRequest:
+    return SessionGenerateRequest(
+        offering_id=1, start_date=start, end_date=end, rule=RecurrenceRule(**rule),
+        start_time=time(9, 0), end_time=time(10, 50), timezone=tz, dry_run=True,
+    )
+
+
+def test_generate_keeps_wall_clock_across_dst_start():
+    # US clocks spring forward on 2025-03-09
+    planned, created, conflicts = _generate(_weekly(date(2025, 3, 3), date(2025, 3, 10), "America/New_York", weekdays=[0]))
+    assert planned == [
+        (datetime(2025, 3, 3, 14, 0, tzinfo=timezone.utc), datetime(2025, 3, 3, 15, 50, tzinfo=timezone.utc)),
+        (datetime(2025, 3, 10, 13, 0, tzinfo=timezone.utc), datetime(2025, 3, 10, 14, 50, tzinfo=timezone.utc)),
+    ]
+    assert created == [] and conflicts == []
+
+
+def test_generate_keeps_wall_clock_across_dst_end():
+    # EU clocks fall back on 2025-10-26
+    planned, _, _ = _generate(_weekly(date(2025, 10, 20), date(2025, 10, 27), "Europe/Berlin", weekdays=[0]))
+    assert [start.hour for start, _ in planned] == [7, 8]
+
+
+def test_generate_rejects_more_than_max_sessions(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULE_MAX_SESSIONS", 5)
+    req = _weekly(date(2025, 1, 6), date(2025, 1, 31), "UTC", freq="daily")
+    with pytest.raises(InvalidSchedule, match="at most 5"):
+        _generate(req)
+    planned, _, _ = _generate(_weekly(date(2025, 1, 6), date(2025, 1, 10), "UTC", freq="daily"))
+    assert len(planned) == 5